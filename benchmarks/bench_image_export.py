@@ -0,0 +1,70 @@
+"""
+Benchmark of page-to-image export: one page after another vs. the
+pipelined in-process export vs. worker processes.
+
+Usage:
+    python benchmarks/bench_image_export.py [page_count] [dpi] [max_workers]
+"""
+import os
+import sys
+import time
+import tempfile
+
+import pymupdf as fitz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_text_search import build_text_pdf
+from core.extractions import TextExtractor
+
+
+def export_sequential(doc, output_dir, zoom):
+    """Render and save every page in turn, without overlapping encoding.
+
+    Args:
+        doc: PyMuPDF Document object
+        output_dir (str): Output directory
+        zoom (float): Zoom factor
+    """
+    extractor = TextExtractor()
+    for page_num in range(len(doc)):
+        extractor.save_page_as_image(doc[page_num], os.path.join(output_dir, f"{page_num}.png"), zoom)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    zoom = dpi / 72
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "text.pdf")
+        build_text_pdf(path, page_count)
+        extractor = TextExtractor()
+
+        with fitz.open(path) as doc:
+            sequential_dir = os.path.join(temp_dir, "sequential")
+            os.makedirs(sequential_dir)
+            start = time.perf_counter()
+            export_sequential(doc, sequential_dir, zoom)
+            sequential_time = time.perf_counter() - start
+            print(f"{page_count} pages at {dpi} DPI, sequential: {sequential_time:.3f} s")
+
+            start = time.perf_counter()
+            extractor.save_pages_as_images(doc, os.path.join(temp_dir, "pipelined"), zoom=zoom)
+            elapsed = time.perf_counter() - start
+            print(f"  pipelined: {elapsed:8.3f} s  speedup {sequential_time / elapsed:5.2f}x")
+
+            workers = 2
+            while workers <= max_workers:
+                start = time.perf_counter()
+                extractor.save_pages_as_images(doc, os.path.join(temp_dir, f"workers{workers}"),
+                                               zoom=zoom, parallel=True, workers=workers)
+                elapsed = time.perf_counter() - start
+                print(f"{workers:>3} workers: {elapsed:8.3f} s  speedup {sequential_time / elapsed:5.2f}x")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of PDFManager save modes: incremental save vs. optimize and save.
+
+Builds a scan-like PDF (one incompressible image per page), rotates a
+single page and saves it with both modes, reporting time and file size.
+
+Usage:
+    python benchmarks/bench_save_modes.py [page_count] [image_size]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import pymupdf as fitz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pdf_manager import PDFManager
+
+
+def build_scan_pdf(path, page_count, image_size):
+    """Create a PDF whose pages each hold one noisy RGB image.
+
+    Args:
+        path (str): Output path
+        page_count (int): Number of pages
+        image_size (int): Width and height of each image in pixels
+    """
+    doc = fitz.open()
+    for _ in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        samples = os.urandom(image_size * image_size * 3)
+        pix = fitz.Pixmap(fitz.csRGB, image_size, image_size, samples, False)
+        page.insert_image(page.rect, pixmap=pix)
+    doc.save(path)
+    doc.close()
+
+
+def time_save(source, work_path, optimize):
+    """Rotate one page of a copy of source and save it.
+
+    Args:
+        source (str): Path of the benchmark PDF
+        work_path (str): Path of the working copy
+        optimize (bool): Use "optimize and save" instead of incremental save
+
+    Returns:
+        tuple: (seconds, resulting file size in bytes)
+    """
+    shutil.copyfile(source, work_path)
+    manager = PDFManager()
+    manager.open_pdf(work_path)
+    manager.rotate_page(0, 90)
+
+    start = time.perf_counter()
+    if not manager.save_pdf(optimize=optimize):
+        raise RuntimeError("save failed")
+    elapsed = time.perf_counter() - start
+
+    manager.close()
+    return elapsed, os.path.getsize(work_path)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    image_size = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = os.path.join(temp_dir, "scan.pdf")
+        build_scan_pdf(source, page_count, image_size)
+        original_size = os.path.getsize(source)
+        print(f"{page_count} pages, {original_size / 1e6:.1f} MB")
+
+        for label, optimize in (("incremental", False), ("optimize", True)):
+            elapsed, size = time_save(source, os.path.join(temp_dir, f"{label}.pdf"), optimize)
+            print(f"{label:>12}: {elapsed:8.3f} s  {size / 1e6:8.1f} MB "
+                  f"({size - original_size:+,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark of serial vs. parallel whole-document text extraction.
+
+Usage:
+    python benchmarks/bench_text_extraction.py [page_count] [max_workers]
+"""
+import os
+import sys
+import time
+import tempfile
+
+import pymupdf as fitz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_text_search import build_text_pdf
+from core.extractions import TextExtractor
+
+
+def main():
+    """Run the benchmark and print the results."""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "text.pdf")
+        build_text_pdf(path, page_count)
+        extractor = TextExtractor()
+
+        with fitz.open(path) as doc:
+            start = time.perf_counter()
+            expected = extractor.extract_text_from_document(doc)
+            serial_time = time.perf_counter() - start
+            print(f"{page_count} pages, serial: {serial_time:.3f} s")
+
+            workers = 2
+            while workers <= max_workers:
+                start = time.perf_counter()
+                texts = extractor.extract_text_from_document(doc, parallel=True, workers=workers)
+                elapsed = time.perf_counter() - start
+                print(f"{workers:>3} workers: {elapsed:8.3f} s  speedup {serial_time / elapsed:5.2f}x  "
+                      f"same text: {texts == expected}")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
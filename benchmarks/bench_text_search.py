@@ -0,0 +1,90 @@
+"""
+Benchmark of TextExtractor.search_text with and without the full-text index.
+
+Builds a text-heavy PDF, then runs the same queries as a linear scan over
+all pages and through the index of PDFManager.get_text_index(), checking
+that both return the same hits.
+
+Usage:
+    python benchmarks/bench_text_search.py [page_count]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+import pymupdf as fitz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.extractions import TextExtractor
+from core.pdf_manager import PDFManager
+from core.thumbnail_cache import ThumbnailCache
+
+WORDS = ("regulation article paragraph member state authority provision "
+         "annex directive procedure obligation requirement measure").split()
+
+
+def build_text_pdf(path, page_count):
+    """Create a PDF whose pages are filled with pseudo-random sentences.
+
+    Args:
+        path (str): Output path
+        page_count (int): Number of pages
+    """
+    rng = random.Random(0)
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=595, height=842)
+        lines = [" ".join(rng.choice(WORDS) for _ in range(9)) for _ in range(50)]
+        lines[page_num % 50] += f" Article {page_num + 1000}"
+        page.insert_text((40, 40), "\n".join(lines), fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def time_query(extractor, doc, query, text_index=None):
+    """Run a query and measure its time.
+
+    Args:
+        extractor (TextExtractor): Extractor to search with
+        doc: PyMuPDF Document object
+        query (str): Search string
+        text_index (TextIndex, optional): Index to search with
+
+    Returns:
+        tuple: (seconds, search results)
+    """
+    start = time.perf_counter()
+    results = extractor.search_text(doc, query, text_index=text_index)
+    return time.perf_counter() - start, results
+
+
+def main():
+    """Run the benchmark and print the results."""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    queries = ["Article 1500", "state authority annex", "provisio"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "text.pdf")
+        build_text_pdf(path, page_count)
+        manager = PDFManager(thumbnail_cache=ThumbnailCache(os.path.join(temp_dir, "cache")))
+        manager.open_pdf(path)
+        extractor = TextExtractor()
+
+        start = time.perf_counter()
+        text_index = manager.get_text_index()
+        print(f"{page_count} pages, index built in {time.perf_counter() - start:.3f} s")
+
+        for query in queries:
+            scan_time, scan_results = time_query(extractor, manager.doc, query)
+            index_time, index_results = time_query(extractor, manager.doc, query, text_index)
+            print(f"  {query!r:>24}: {len(scan_results):5} pages  scan {scan_time:7.3f} s  "
+                  f"index {index_time:7.3f} s  same hits: {scan_results == index_results}")
+        manager.close()
+        manager.render_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Memory-bounded rendering of very large pages.
+
+Rendering an A0 drawing at 300 DPI needs a single buffer of well over a
+gigabyte. Here such pages are rendered in horizontal bands, each a clip
+rectangle of at most max_pixels pixels, and the bands are streamed to the
+output one after another, so only one band is in memory at a time.
+"""
+import zlib
+import struct
+
+import pymupdf as fitz
+
+from .render_profiles import MONO, GRAY, RGBA, get_render_profile, pixmap_options
+
+# Largest number of pixels rendered in one piece (16 megapixels, 48 MB as RGB)
+DEFAULT_MAX_RENDER_PIXELS = 16 * 1024 * 1024
+
+# PNG (bit depth, color type) of every color mode
+PNG_LAYOUTS = {MONO: (1, 0), GRAY: (8, 0), RGBA: (8, 6)}
+
+
+def render_size(page, zoom, clip=None):
+    """Get the size in pixels of a page rendered at a zoom factor.
+
+    Args:
+        page: PyMuPDF Page object
+        zoom (float): Zoom factor
+        clip (fitz.Rect, optional): Part of the page to render
+
+    Returns:
+        tuple: (width, height) in pixels
+    """
+    rect = page.rect if clip is None else fitz.Rect(clip) & page.rect
+    irect = (rect * fitz.Matrix(zoom, zoom)).irect
+    return irect.width, irect.height
+
+
+def needs_banding(page, zoom, max_pixels=DEFAULT_MAX_RENDER_PIXELS):
+    """Check whether rendering a page in one piece exceeds the pixel budget.
+
+    Args:
+        page: PyMuPDF Page object
+        zoom (float): Zoom factor
+        max_pixels (int, optional): Pixel budget of one render
+
+    Returns:
+        bool: True if the page should be rendered in bands
+    """
+    width, height = render_size(page, zoom)
+    return width * height > max_pixels
+
+
+def band_clips(page, zoom, max_pixels=DEFAULT_MAX_RENDER_PIXELS):
+    """Split a page into full-width bands that fit the pixel budget.
+
+    Band borders fall on whole pixel rows of the full render, so the
+    bands put together have exactly the size of the full render.
+
+    Args:
+        page: PyMuPDF Page object
+        zoom (float): Zoom factor
+        max_pixels (int, optional): Pixel budget of one band
+
+    Returns:
+        list: fitz.Rect clip rectangles in page coordinates, top to bottom
+    """
+    width, height = render_size(page, zoom)
+    rows = max(1, max_pixels // max(1, width))
+    rect = page.rect
+    return [fitz.Rect(rect.x0, rect.y0 + top / zoom, rect.x1, rect.y0 + min(height, top + rows) / zoom)
+            for top in range(0, height, rows)]
+
+
+def iter_bands(page, zoom, max_pixels=DEFAULT_MAX_RENDER_PIXELS, mode=None):
+    """Render a page band by band.
+
+    Args:
+        page: PyMuPDF Page object
+        zoom (float): Zoom factor
+        max_pixels (int, optional): Pixel budget of one band
+        mode (str, optional): Color mode, see render_profiles. Defaults to RGB.
+
+    Yields:
+        tuple: (top pixel row, fitz.Pixmap of the band)
+    """
+    matrix = fitz.Matrix(zoom, zoom)
+    options = pixmap_options(mode) if mode else {}
+    top = 0
+    for clip in band_clips(page, zoom, max_pixels):
+        pix = page.get_pixmap(matrix=matrix, clip=clip, **options)
+        yield top, pix
+        top += pix.height
+
+
+def _png_chunk(kind, data):
+    """Build a PNG chunk.
+
+    Args:
+        kind (bytes): Chunk type, e.g. b"IDAT"
+        data (bytes): Chunk data
+
+    Returns:
+        bytes: Length, type, data and CRC of the chunk
+    """
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def save_png_banded(page, file_path, zoom=1.0, max_pixels=DEFAULT_MAX_RENDER_PIXELS,
+                    profile=None):
+    """Render a page to a PNG file without holding the whole image in memory.
+
+    Every band is compressed into the PNG data stream as soon as it is
+    rendered.
+
+    Args:
+        page: PyMuPDF Page object
+        file_path (str): Path of the PNG file
+        zoom (float, optional): Zoom factor. Defaults to 1.0.
+        max_pixels (int, optional): Pixel budget of one band
+        profile (RenderProfile or str, optional): Color mode of the image.
+            Defaults to RGB.
+    """
+    profile = get_render_profile(profile)
+    width, height = render_size(page, zoom)
+    bit_depth, color_type = PNG_LAYOUTS.get(profile.mode, (8, 2))
+    compressor = zlib.compressobj()
+    with open(file_path, 'wb') as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        # No interlacing
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth,
+                                                color_type, 0, 0, 0)))
+        for _, pix in iter_bands(page, zoom, max_pixels, profile.mode):
+            if profile.mode == MONO:
+                # PIL packs 1-bit rows MSB first, as PNG expects
+                samples = memoryview(profile.to_pil(pix).tobytes())
+                stride = (pix.width + 7) // 8
+            else:
+                samples = pix.samples_mv
+                stride = pix.stride
+            # Her satırın başına filtre türü 0 (None) eklenir
+            rows = b"".join(b"\x00" + samples[row * stride:(row + 1) * stride]
+                            for row in range(pix.height))
+            data = compressor.compress(rows)
+            if data:
+                f.write(_png_chunk(b"IDAT", data))
+        f.write(_png_chunk(b"IDAT", compressor.flush()))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def render_pil_banded(page, zoom=1.0, max_pixels=DEFAULT_MAX_RENDER_PIXELS, profile=None):
+    """Render a page into a PIL image band by band.
+
+    The image is allocated once and filled band by band, instead of a
+    full-size pixmap that is then copied into the image.
+
+    Args:
+        page: PyMuPDF Page object
+        zoom (float, optional): Zoom factor. Defaults to 1.0.
+        max_pixels (int, optional): Pixel budget of one band
+        profile (RenderProfile or str, optional): Color mode of the image.
+            Defaults to RGB.
+
+    Returns:
+        PIL.Image.Image: Image of the page in the profile's PIL mode
+    """
+    from PIL import Image
+    profile = get_render_profile(profile)
+    img = Image.new(profile.pil_mode, render_size(page, zoom))
+    for top, pix in iter_bands(page, zoom, max_pixels, profile.mode):
+        img.paste(profile.to_pil(pix), (0, top))
+    return img
+
+
+def save_image_banded(page, file_path, zoom=1.0, image_format="PNG",
+                      max_pixels=DEFAULT_MAX_RENDER_PIXELS, profile=None):
+    """Save a large page as an image file with bounded render buffers.
+
+    PNG files are written band by band. Other formats need the whole
+    image for encoding, which is then assembled from bands.
+
+    Args:
+        page: PyMuPDF Page object
+        file_path (str): Path of the image file
+        zoom (float, optional): Zoom factor. Defaults to 1.0.
+        image_format (str, optional): PIL format name. Defaults to "PNG".
+        max_pixels (int, optional): Pixel budget of one band
+        profile (RenderProfile or str, optional): Color mode of the image.
+            Defaults to RGB.
+    """
+    if image_format == "PNG":
+        save_png_banded(page, file_path, zoom, max_pixels, profile)
+    else:
+        render_pil_banded(page, zoom, max_pixels, profile).save(file_path, format=image_format)
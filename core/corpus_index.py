@@ -0,0 +1,310 @@
+"""
+Full-text index of all PDF files in a directory tree.
+
+The text of every page is extracted with TextExtractor in a pool of
+worker processes and stored in a local SQLite FTS5 database using the
+trigram tokenizer, like the per-document TextIndex. Files are only
+extracted again when their size or modification time changed.
+
+The index can be built and queried from the command line:
+
+    python -m core.corpus_index build /path/to/pdfs
+    python -m core.corpus_index search "query text"
+"""
+import os
+import sys
+import logging
+import sqlite3
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pymupdf as fitz
+
+from .text_index import MIN_QUERY_LENGTH, normalize_text
+from .thumbnail_cache import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Korpus index dosyasının adı (kullanıcı veri dizininde, önbellek temizliğinden uzak)
+CORPUS_INDEX_FILE_NAME = 'corpus_index.sqlite'
+
+# Length of result snippets in trigram tokens, roughly characters
+SNIPPET_TOKENS = 48
+
+# Default number of search results
+DEFAULT_RESULT_LIMIT = 50
+
+# Version of the database layout; older indexes are rebuilt
+SCHEMA_VERSION = 1
+
+
+def default_index_path():
+    """Get the default location of the corpus index.
+
+    Returns:
+        str: Path in the user data directory
+    """
+    return os.path.join(get_data_dir(), CORPUS_INDEX_FILE_NAME)
+
+
+def find_pdf_files(root):
+    """Find the PDF files in a directory tree.
+
+    Args:
+        root (str): Directory to crawl
+
+    Returns:
+        list: Absolute paths of the PDF files, sorted
+    """
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(os.path.abspath(root)):
+        dir_names.sort()
+        paths.extend(os.path.join(dir_path, name) for name in sorted(file_names)
+                     if name.lower().endswith('.pdf'))
+    return paths
+
+
+def _extract_file(path):
+    """Extract the text of every page of a file in a worker process.
+
+    Args:
+        path (str): Path of the PDF file
+
+    Returns:
+        tuple: (path, page texts), or (path, None) if the file cannot be read
+    """
+    from .extractions import TextExtractor
+
+    try:
+        with fitz.open(path) as doc:
+            if doc.needs_pass:
+                return path, None
+            return path, [normalize_text(text) for _, text in TextExtractor().iter_text(doc)]
+    except Exception:
+        return path, None
+
+
+class CorpusIndex:
+    """Full-text index of the pages of many PDF files."""
+
+    def __init__(self, db_path=None):
+        """Open or create the index.
+
+        Args:
+            db_path (str, optional): Path of the SQLite database.
+                Defaults to default_index_path().
+        """
+        self.db_path = db_path or default_index_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        with self.connection:
+            if self.connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Eski düzendeki index yeniden oluşturulur
+                self.connection.execute("DROP TABLE IF EXISTS files")
+                self.connection.execute("DROP TABLE IF EXISTS page_text")
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # The pages of a file have the consecutive page_text rowids
+            # first_rowid .. first_rowid + page_count - 1
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, "
+                "mtime REAL, page_count INTEGER, first_rowid INTEGER)")
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS page_text "
+                "USING fts5(text, file_id UNINDEXED, page UNINDEXED, tokenize='trigram')")
+
+    def _file_states(self, root):
+        """Get the indexed files below a directory.
+
+        Args:
+            root (str): Absolute directory path
+
+        Returns:
+            dict: path -> (file id, size, mtime)
+        """
+        prefix = os.path.join(root, '')
+        return {path: (file_id, size, mtime) for file_id, path, size, mtime in
+                self.connection.execute("SELECT id, path, size, mtime FROM files")
+                if path.startswith(prefix)}
+
+    def _remove_file(self, file_id):
+        """Delete a file and its pages from the index.
+
+        Pages are deleted by their rowid range; file_id is not indexed in
+        the FTS table, so deleting by it would scan every page.
+
+        Args:
+            file_id (int): Row id of the file
+        """
+        row = self.connection.execute(
+            "SELECT first_rowid, page_count FROM files WHERE id = ?", (file_id,)).fetchone()
+        if row and row[1]:
+            self.connection.execute("DELETE FROM page_text WHERE rowid BETWEEN ? AND ?",
+                                    (row[0], row[0] + row[1] - 1))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _store_file(self, path, stat, texts):
+        """Replace the pages of a file in the index.
+
+        Args:
+            path (str): Absolute path of the file
+            stat (os.stat_result): File status at the time it was listed
+            texts (list): Text of every page
+        """
+        with self.connection:
+            row = self.connection.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+            if row:
+                self._remove_file(row[0])
+            last = self.connection.execute(
+                "SELECT rowid FROM page_text ORDER BY rowid DESC LIMIT 1").fetchone()
+            first_rowid = (last[0] if last else 0) + 1
+            file_id = self.connection.execute(
+                "INSERT INTO files(path, size, mtime, page_count, first_rowid) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime, len(texts), first_rowid)).lastrowid
+            self.connection.executemany(
+                "INSERT INTO page_text(rowid, text, file_id, page) VALUES (?, ?, ?, ?)",
+                [(first_rowid + page_num, text, file_id, page_num)
+                 for page_num, text in enumerate(texts)])
+
+    def build(self, root, workers=None, progress_callback=None):
+        """Index the PDF files in a directory tree.
+
+        New files and files whose size or modification time changed are
+        extracted in worker processes; files that disappeared are removed
+        from the index. Unchanged files are not opened at all.
+
+        Args:
+            root (str): Directory to crawl
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (files_done, files_to_index)
+
+        Returns:
+            dict: Number of 'indexed', 'unchanged', 'removed' and 'failed' files
+        """
+        root = os.path.abspath(root)
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        known = self._file_states(root)
+
+        pending = {}  # path -> os.stat_result
+        for path in find_pdf_files(root):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            state = known.pop(path, None)
+            if state and state[1] == stat.st_size and state[2] == stat.st_mtime:
+                stats["unchanged"] += 1
+            else:
+                pending[path] = stat
+
+        # Silinen dosyaları indeksten çıkar
+        with self.connection:
+            for file_id, _, _ in known.values():
+                self._remove_file(file_id)
+        stats["removed"] = len(known)
+
+        if not pending:
+            return stats
+
+        # spawn: forking a process that runs Qt threads is not safe
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+        try:
+            tasks = [executor.submit(_extract_file, path) for path in pending]
+            for done, task in enumerate(as_completed(tasks), 1):
+                path, texts = task.result()
+                if texts is None:
+                    logger.warning(f"Could not index {path}")
+                    stats["failed"] += 1
+                else:
+                    self._store_file(path, pending[path], texts)
+                    stats["indexed"] += 1
+                if progress_callback:
+                    progress_callback(done, len(pending))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return stats
+
+    def search(self, query, limit=DEFAULT_RESULT_LIMIT):
+        """Search the indexed pages.
+
+        Args:
+            query (str): Text to search for, at least MIN_QUERY_LENGTH characters
+            limit (int, optional): Maximum number of results. Defaults to 50.
+
+        Returns:
+            list: (path, page_num, snippet) tuples, best matches first.
+                The match is marked with [ ] in the snippet.
+        """
+        query = normalize_text(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        try:
+            return self.connection.execute(
+                "SELECT files.path, page_text.page, "
+                "snippet(page_text, 0, '[', ']', '...', ?) "
+                "FROM page_text JOIN files ON files.id = page_text.file_id "
+                "WHERE page_text MATCH ? ORDER BY rank LIMIT ?",
+                (SNIPPET_TOKENS, '"' + query.replace('"', '""') + '"', limit)).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error querying corpus index: {e}")
+            return []
+
+    def file_count(self):
+        """Get the number of indexed files.
+
+        Returns:
+            int: Number of files
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def main(argv=None):
+    """Build or query a corpus index from the command line.
+
+    Args:
+        argv (list, optional): Command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m core.corpus_index",
+                                     description="Full-text index of a folder of PDF files")
+    parser.add_argument("--index", help="Index database (default: in the user data directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Index or re-index a directory tree")
+    build_parser.add_argument("root", help="Directory to crawl")
+    build_parser.add_argument("--workers", type=int, help="Number of worker processes")
+    search_parser = commands.add_parser("search", help="Search the indexed pages")
+    search_parser.add_argument("query", help="Text to search for")
+    search_parser.add_argument("--limit", type=int, default=DEFAULT_RESULT_LIMIT,
+                               help="Maximum number of results")
+    args = parser.parse_args(argv)
+
+    index = CorpusIndex(args.index)
+    try:
+        if args.command == "build":
+            stats = index.build(args.root, workers=args.workers)
+            print(f"{stats['indexed']} indexed, {stats['unchanged']} unchanged, "
+                  f"{stats['removed']} removed, {stats['failed']} failed "
+                  f"({index.file_count()} files in index)")
+        else:
+            for path, page_num, snippet in index.search(args.query, limit=args.limit):
+                print(f"{path}:{page_num + 1}: {snippet}")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,20 +3,351 @@ Text extraction and OCR operations for PDF files.
 """
 import fitz  # PyMuPDF
 import os
-from PIL import Image
+import json
+import hashlib
 from tkinter import messagebox
 import logging
+import bisect
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .banded_render import (DEFAULT_MAX_RENDER_PIXELS, needs_banding, render_pil_banded,
+                            save_image_banded)
+from .ocr import OCREngine, DEFAULT_OCR_DPI, DEFAULT_OCR_LANGUAGE
+from .parallel import iter_chunk_results, page_chunks, report_progress
+from .render_profiles import get_render_profile
+from .text_index import SEARCH_FLAGS
 
 # Logging ayarları
 logger = logging.getLogger(__name__)
 
+# Flags of layout extraction: like get_text("dict"), but without image blocks
+LAYOUT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Decimal places of coordinates and font sizes in compact layout records
+COMPACT_PRECISION = 2
+
+# Görüntü dışa aktarımında desteklenen biçimler: uzantı -> PIL biçimi
+IMAGE_FORMATS = {"png": "PNG", "jpg": "JPEG"}
+
+# Rendered pages waiting for the encoder thread; bounds memory at high DPI
+IMAGE_QUEUE_SIZE = 2
+
+# Pages per worker task in parallel image export, small for quick cancellation
+IMAGE_CHUNK_PAGES = 8
+
+
+def _extract_text_range(file_path, start_page, end_page):
+    """Extract the text of a range of pages in a worker process.
+
+    Args:
+        file_path (str): Path of the PDF file
+        start_page (int): First page index
+        end_page (int): Page index after the last page
+
+    Returns:
+        tuple: (start_page, list of page texts)
+    """
+    texts = []
+    with fitz.open(file_path) as doc:
+        for page_num in range(start_page, end_page):
+            texts.append(doc[page_num].get_text())
+            report_progress()
+    return start_page, texts
+
+
+def page_layout_record(page, compact=False, textpage=None):
+    """Build the layout record of a page from get_text("dict").
+
+    The full record keeps every field PyMuPDF reports. The compact one
+    keeps only bounding boxes, text, font and size of the spans, with
+    rounded numbers, which makes it several times smaller and faster to
+    serialize.
+
+    Args:
+        page: PyMuPDF Page object
+        compact (bool, optional): Drop fields most consumers don't need. Defaults to False.
+        textpage (fitz.TextPage, optional): Parsed page, extracted with LAYOUT_FLAGS
+
+    Returns:
+        dict: 'page', 'width', 'height' and 'blocks' of text blocks with their
+            lines and spans
+    """
+    if textpage is None:
+        textpage = page.get_textpage(flags=LAYOUT_FLAGS)
+    layout = textpage.extractDICT()
+    record = {"page": page.number, "width": layout["width"], "height": layout["height"]}
+    if not compact:
+        record["blocks"] = layout["blocks"]
+        return record
+
+    def box(bbox):
+        return [round(value, COMPACT_PRECISION) for value in bbox]
+
+    record["blocks"] = [
+        {"bbox": box(block["bbox"]),
+         "lines": [{"bbox": box(line["bbox"]),
+                    "spans": [{"bbox": box(span["bbox"]), "text": span["text"],
+                               "font": span["font"],
+                               "size": round(span["size"], COMPACT_PRECISION)}
+                              for span in line["spans"]]}
+                   for line in block["lines"]]}
+        for block in layout["blocks"] if block["type"] == 0]
+    return record
+
+
+def layout_json_line(record):
+    """Serialize a layout record as one line of JSONL.
+
+    Args:
+        record (dict): Layout record, see page_layout_record()
+
+    Returns:
+        str: JSON text ending with a newline
+    """
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _extract_layout_range(file_path, compact, start_page, end_page):
+    """Build the JSONL lines of a range of pages in a worker process.
+
+    Args:
+        file_path (str): Path of the PDF file
+        compact (bool): Build compact records
+        start_page (int): First page index
+        end_page (int): Page index after the last page
+
+    Returns:
+        tuple: (start_page, list of JSON lines)
+    """
+    lines = []
+    with fitz.open(file_path) as doc:
+        for page_num in range(start_page, end_page):
+            lines.append(layout_json_line(page_layout_record(doc[page_num], compact)))
+            report_progress()
+    return start_page, lines
+
+
+def page_image_path(output_dir, page_num, image_format="png"):
+    """Get the file an exported page image is written to.
+
+    Args:
+        output_dir (str): Output directory
+        page_num (int): Page index
+        image_format (str, optional): File extension, see IMAGE_FORMATS
+
+    Returns:
+        str: Path of the image file
+    """
+    return os.path.join(output_dir, f"sayfa_{page_num + 1}.{image_format}")
+
+
+def save_page_images(doc, page_nums, output_dir, zoom=1.0, image_format="png",
+                     progress_callback=None, cancel_callback=None,
+                     max_pixels=DEFAULT_MAX_RENDER_PIXELS, profile=None):
+    """Render pages and save them as images, encoding while the next page renders.
+
+    Pages are rendered in the calling thread and handed to an encoder
+    thread through a bounded queue. PIL releases the GIL while encoding,
+    so PNG/JPEG compression overlaps with rendering. Pages larger than
+    max_pixels are rendered and saved in bands right away, see
+    save_image_banded().
+
+    Args:
+        doc: PyMuPDF Document object
+        page_nums (list): Indices of the pages to save
+        output_dir (str): Existing output directory
+        zoom (float, optional): Zoom factor. Defaults to 1.0.
+        image_format (str, optional): "png" or "jpg". Defaults to "png".
+        progress_callback (callable, optional): Called with (pages_done, total_pages)
+        cancel_callback (callable, optional): Returns True to stop before the next page
+        max_pixels (int, optional): Pixel budget of one render
+        profile (RenderProfile or str, optional): Colorspace, and resolution
+            if the profile fixes one. Defaults to RGB at the given zoom.
+
+    Returns:
+        dict: Page index -> None if saved, or the error message; pages not
+            reached before cancellation are missing
+    """
+    profile = get_render_profile(profile)
+    results = {}
+    pending = queue.Queue(maxsize=IMAGE_QUEUE_SIZE)
+
+    def encode():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            page_num, pix = item
+            try:
+                profile.to_pil(pix).save(page_image_path(output_dir, page_num, image_format),
+                                         format=IMAGE_FORMATS[image_format])
+                results[page_num] = None
+            except Exception as e:
+                results[page_num] = str(e)
+
+    encoder = threading.Thread(target=encode, daemon=True)
+    encoder.start()
+    try:
+        for page_num in page_nums:
+            if cancel_callback and cancel_callback():
+                break
+            try:
+                page = doc[page_num]
+                page_zoom = profile.get_zoom(page, zoom)
+                if needs_banding(page, page_zoom, max_pixels):
+                    save_image_banded(page, page_image_path(output_dir, page_num, image_format),
+                                      page_zoom, IMAGE_FORMATS[image_format], max_pixels, profile)
+                    results[page_num] = None
+                else:
+                    pending.put((page_num, profile.get_pixmap(page, page_zoom)))
+            except Exception as e:
+                results[page_num] = str(e)
+            if progress_callback:
+                progress_callback(len(results), len(page_nums))
+    finally:
+        pending.put(None)
+        encoder.join()
+    if progress_callback:
+        progress_callback(len(results), len(page_nums))
+    return results
+
+
+def _save_image_range(file_path, output_dir, zoom, image_format, max_pixels, profile,
+                      start_page, end_page):
+    """Save a range of pages as images in a worker process.
+
+    Args:
+        file_path (str): Path of the PDF file
+        output_dir (str): Existing output directory
+        zoom (float): Zoom factor
+        image_format (str): "png" or "jpg"
+        max_pixels (int): Pixel budget of one render
+        profile (RenderProfile): Render profile
+        start_page (int): First page index
+        end_page (int): Page index after the last page
+
+    Returns:
+        dict: Page index -> None if saved, or the error message
+    """
+    with fitz.open(file_path) as doc:
+        return save_page_images(doc, range(start_page, end_page), output_dir, zoom, image_format,
+                                max_pixels=max_pixels, profile=profile)
+
+
+def collect_page_images(doc, start_page=0, end_page=None):
+    """Find the images used by a range of pages.
+
+    Args:
+        doc: PyMuPDF Document object
+        start_page (int, optional): First page index. Defaults to 0.
+        end_page (int, optional): Page index after the last page. Defaults to the page count.
+
+    Returns:
+        dict: Image xref -> sorted list of the pages using it, in order of
+            first use
+    """
+    if end_page is None:
+        end_page = len(doc)
+    images = {}
+    for page_num in range(start_page, end_page):
+        for image in doc[page_num].get_images(full=True):
+            pages = images.setdefault(image[0], [])
+            if not pages or pages[-1] != page_num:
+                pages.append(page_num)
+    return images
+
+
+def embedded_image_path(output_dir, page_num, xref, ext):
+    """Get the file an embedded image is written to.
+
+    Args:
+        output_dir (str): Output directory
+        page_num (int): Index of the first page using the image
+        xref (int): Image xref
+        ext (str): File extension reported by Document.extract_image()
+
+    Returns:
+        str: Path of the image file
+    """
+    return os.path.join(output_dir, f"sayfa_{page_num + 1}_resim_{xref}.{ext}")
+
+
+def save_embedded_images(doc, items, output_dir):
+    """Write embedded images to files without re-rendering them.
+
+    JPEG, JPEG 2000 and other stream formats image viewers understand
+    are written byte for byte; images stored with generic PDF
+    compression are converted to PNG losslessly.
+
+    Args:
+        doc: PyMuPDF Document object
+        items (list): (xref, first page index) tuples
+        output_dir (str): Existing output directory
+
+    Returns:
+        list: Dicts with 'xref', 'path', 'ext', 'width', 'height' and 'sha1'
+            of the image bytes, or 'xref' and 'error'
+    """
+    results = []
+    for xref, page_num in items:
+        try:
+            image = doc.extract_image(xref)
+            if not image:
+                raise ValueError("not an image")
+            path = embedded_image_path(output_dir, page_num, xref, image["ext"])
+            with open(path, 'wb') as f:
+                f.write(image["image"])
+            results.append({"xref": xref, "path": path, "ext": image["ext"],
+                            "width": image["width"], "height": image["height"],
+                            "sha1": hashlib.sha1(image["image"]).hexdigest()})
+        except Exception as e:
+            results.append({"xref": xref, "error": str(e)})
+    return results
+
+
+def _save_embedded_image_list(file_path, items, output_dir):
+    """Write embedded images to files in a worker process.
+
+    Args:
+        file_path (str): Path of the PDF file
+        items (list): (xref, first page index) tuples
+        output_dir (str): Existing output directory
+
+    Returns:
+        list: See save_embedded_images()
+    """
+    with fitz.open(file_path) as doc:
+        return save_embedded_images(doc, items, output_dir)
+
 
 class TextExtractor:
     """Class for extracting text and images from PDF files."""
 
-    def __init__(self):
-        """Initialize the text extractor."""
-        pass
+    def __init__(self, pdf_manager=None):
+        """Initialize the text extractor.
+
+        Args:
+            pdf_manager (PDFManager, optional): Manager whose TextPage cache is
+                used for pages of its open document
+        """
+        self.pdf_manager = pdf_manager
+
+    def get_textpage(self, page, flags=fitz.TEXTFLAGS_TEXT):
+        """Get the parsed text of a page, from the TextPage cache if possible.
+
+        Args:
+            page: PyMuPDF Page object
+            flags (int, optional): Text extraction flags. Defaults to fitz.TEXTFLAGS_TEXT.
+
+        Returns:
+            fitz.TextPage: Parsed text page
+        """
+        if self.pdf_manager and self.pdf_manager.doc is not None and page.parent is self.pdf_manager.doc:
+            return self.pdf_manager.get_textpage(page.number, flags)
+        return page.get_textpage(flags=flags)
 
     def extract_text_from_page(self, page):
         """Extract text from a PDF page.
@@ -28,14 +359,18 @@ class TextExtractor:
             str: Extracted text
         """
         if page:
-            return page.get_text()
+            return self.get_textpage(page).extractText()
         return ""
 
-    def extract_text_from_document(self, doc):
+    def extract_text_from_document(self, doc, parallel=False, workers=None, progress_callback=None):
         """Extract text from an entire PDF document.
 
         Args:
             doc: PyMuPDF Document object
+            parallel (bool, optional): Extract in worker processes, see
+                iter_text_parallel(). Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
 
         Returns:
             list: List of strings, one per page
@@ -43,12 +378,74 @@ class TextExtractor:
         if not doc:
             return []
 
-        text_by_page = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text_by_page.append(page.get_text())
+        return [text for _, text in self.iter_text(
+            doc, parallel=parallel, workers=workers, progress_callback=progress_callback)]
+
+    def iter_text(self, doc, start_page=0, end_page=None, parallel=False, workers=None,
+                  progress_callback=None):
+        """Extract text page by page without keeping earlier pages in memory.
+
+        Args:
+            doc: PyMuPDF Document object
+            start_page (int, optional): First page index. Defaults to 0.
+            end_page (int, optional): Page index after the last page. Defaults to the page count.
+            parallel (bool, optional): Extract in worker processes, see
+                iter_text_parallel(). Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+        Yields:
+            tuple: (page_num, text) in page order
+        """
+        if not doc:
+            return
+        if end_page is None:
+            end_page = len(doc)
+
+        if parallel:
+            yield from self.iter_text_parallel(doc, start_page, end_page, workers=workers,
+                                               progress_callback=progress_callback)
+            return
+
+        total = max(0, end_page - start_page)
+        for page_num in range(start_page, end_page):
+            yield page_num, self.get_textpage(doc[page_num]).extractText()
+            if progress_callback:
+                progress_callback(page_num - start_page + 1, total)
+
+    def iter_text_parallel(self, doc, start_page=0, end_page=None, workers=None,
+                           progress_callback=None):
+        """Extract the text of a page range in parallel worker processes.
+
+        The range is split into chunks that workers extract from their own
+        handle of the file. Pages are yielded in page order as soon as all
+        pages before them are done. Documents with unsaved changes, or too
+        few pages to be worth starting workers, are extracted in this
+        process.
+
+        Args:
+            doc: PyMuPDF Document object
+            start_page (int, optional): First page index. Defaults to 0.
+            end_page (int, optional): Page index after the last page. Defaults to the page count.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+                whenever a chunk is finished
+
+        Yields:
+            tuple: (page_num, text)
+        """
+        if end_page is None:
+            end_page = len(doc)
+        workers = max(1, workers or os.cpu_count() or 1)
+        chunks = page_chunks(start_page, end_page, workers)
+
+        file_path = doc.name
+        if workers == 1 or len(chunks) < 2 or doc.is_dirty or not file_path or not os.path.exists(file_path):
+            yield from self.iter_text(doc, start_page, end_page, progress_callback=progress_callback)
+            return
 
-        return text_by_page
+        yield from iter_chunk_results(chunks, workers, _extract_text_range, file_path,
+                                      progress_callback=progress_callback)
 
     def extract_text(self, doc, scope="all_pages", page_index=None):
         """Extract text based on scope.
@@ -70,21 +467,26 @@ class TextExtractor:
                 page = doc[page_index]
                 return self.extract_text_from_page(page)
             else:
-                # Extract text from all pages
-                text_by_page = self.extract_text_from_document(doc)
-
-                # Format the text with page numbers
-                formatted_text = ""
-                for i, page_text in enumerate(text_by_page):
-                    formatted_text += f"--- Page {i + 1} ---\n\n"
-                    formatted_text += page_text
-                    formatted_text += "\n\n"
-
-                return formatted_text
+                # Extract text from all pages, formatted with page numbers
+                return "".join(self.format_page_text(page_num, page_text)
+                               for page_num, page_text in self.iter_text(doc))
         except Exception as e:
             logger.error(f"Error extracting text: {e}")
             return f"Error extracting text: {e}"
 
+    @staticmethod
+    def format_page_text(page_num, text):
+        """Format the text of a page with its page separator.
+
+        Args:
+            page_num (int): Page index
+            text (str): Text of the page
+
+        Returns:
+            str: Text preceded by a "--- Page N ---" header
+        """
+        return f"--- Page {page_num + 1} ---\n\n{text}\n\n"
+
     def save_text_to_file(self, text, file_path):
         """Save extracted text to a file.
 
@@ -106,34 +508,186 @@ class TextExtractor:
             logger.error(f"Error saving text to file: {e}")
             return False
 
-    def search_text(self, doc, search_string):
+    def export_text(self, doc, file_path, start_page=0, end_page=None, parallel=False,
+                    workers=None, progress_callback=None):
+        """Write the text of a document to a file while it is extracted.
+
+        Every page is written, with its page separator, as soon as it is
+        extracted, so memory use does not grow with the document and the
+        file fills up from the start.
+
+        Args:
+            doc: PyMuPDF Document object
+            file_path (str): Path to save the text file
+            start_page (int, optional): First page index. Defaults to 0.
+            end_page (int, optional): Page index after the last page. Defaults to the page count.
+            parallel (bool, optional): Extract in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not doc or not file_path:
+            return False
+
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for page_num, page_text in self.iter_text(
+                        doc, start_page, end_page, parallel=parallel, workers=workers,
+                        progress_callback=progress_callback):
+                    f.write(self.format_page_text(page_num, page_text))
+                    f.flush()
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting text to file: {e}")
+            return False
+
+    def iter_layout(self, doc, start_page=0, end_page=None, compact=False, parallel=False,
+                    workers=None, progress_callback=None):
+        """Extract the layout of pages as JSONL lines, one page at a time.
+
+        In parallel mode the records are built and serialized in worker
+        processes that open the file themselves; documents with unsaved
+        changes or few pages are processed here.
+
+        Args:
+            doc: PyMuPDF Document object
+            start_page (int, optional): First page index. Defaults to 0.
+            end_page (int, optional): Page index after the last page. Defaults to the page count.
+            compact (bool, optional): Build compact records, see page_layout_record()
+            parallel (bool, optional): Extract in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode.
+                Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+        Yields:
+            tuple: (page_num, JSON line) in page order
+        """
+        if not doc:
+            return
+        if end_page is None:
+            end_page = len(doc)
+
+        if parallel:
+            workers = max(1, workers or os.cpu_count() or 1)
+            chunks = page_chunks(start_page, end_page, workers)
+            file_path = doc.name
+            if (workers > 1 and len(chunks) > 1 and not doc.is_dirty and file_path
+                    and os.path.exists(file_path)):
+                yield from iter_chunk_results(chunks, workers, _extract_layout_range, file_path,
+                                              compact, progress_callback=progress_callback)
+                return
+
+        total = max(0, end_page - start_page)
+        for page_num in range(start_page, end_page):
+            page = doc[page_num]
+            record = page_layout_record(page, compact, self.get_textpage(page, LAYOUT_FLAGS))
+            yield page_num, layout_json_line(record)
+            if progress_callback:
+                progress_callback(page_num - start_page + 1, total)
+
+    def export_layout(self, doc, file_path, start_page=0, end_page=None, compact=False,
+                      parallel=False, workers=None, progress_callback=None):
+        """Write the layout of a document to a JSONL file, one record per page.
+
+        Every record is written as soon as it is ready, so memory use does
+        not grow with the document.
+
+        Args:
+            doc: PyMuPDF Document object
+            file_path (str): Path of the JSONL file
+            start_page (int, optional): First page index. Defaults to 0.
+            end_page (int, optional): Page index after the last page. Defaults to the page count.
+            compact (bool, optional): Write compact records, see page_layout_record()
+            parallel (bool, optional): Extract in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not doc or not file_path:
+            return False
+
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for _, line in self.iter_layout(doc, start_page, end_page, compact=compact,
+                                                parallel=parallel, workers=workers,
+                                                progress_callback=progress_callback):
+                    f.write(line)
+                    f.flush()
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting layout to file: {e}")
+            return False
+
+    def search_text(self, doc, search_string, text_index=None):
         """Search for text in a PDF document.
 
+        With a text index, only the pages the index reports as possible
+        matches are searched for the exact hit rectangles.
+
         Args:
             doc: PyMuPDF Document object
             search_string (str): Text to search for
+            text_index (TextIndex, optional): Full-text index of the document,
+                e.g. from PDFManager.get_text_index()
 
         Returns:
             list: List of tuples (page_num, instances) where instances is a list of matches
         """
+        return [(page_num, instances)
+                for page_num, instances in self.iter_search(doc, search_string, text_index=text_index)
+                if instances]
+
+    def iter_search(self, doc, search_string, start_page=0, text_index=None, pages=None):
+        """Search a document page by page, starting at a given page.
+
+        Pages are searched from start_page to the end of the document and
+        then from the first page up to start_page. Every searched page is
+        yielded, also without hits, so callers can stop or pause the
+        search between any two pages.
+
+        Args:
+            doc: PyMuPDF Document object
+            search_string (str): Text to search for
+            start_page (int, optional): Page to start at. Defaults to 0.
+            text_index (TextIndex, optional): Full-text index used to skip
+                pages that cannot contain the text
+            pages (list, optional): Sorted pages to search, e.g. the candidate
+                pages already looked up by the caller. Takes precedence over
+                text_index.
+
+        Yields:
+            tuple: (page_num, instances), instances being an empty list for pages without hits
+        """
         if not doc or not search_string:
-            return []
+            return
 
-        results = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            instances = page.search_for(search_string)
-            if instances:
-                results.append((page_num, instances))
+        if pages is None and text_index:
+            pages = text_index.candidate_pages(search_string)
+        if pages is None:
+            pages = range(len(doc))
 
-        return results
+        # Sırayı başlangıç sayfasından itibaren döndür
+        first = bisect.bisect_left(pages, start_page)
+        for page_num in list(pages[first:]) + list(pages[:first]):
+            yield page_num, self.get_textpage(doc[page_num], SEARCH_FLAGS).search(search_string, quads=False)
 
-    def extract_page_as_image(self, page, zoom=1.0):
+    def extract_page_as_image(self, page, zoom=1.0, max_pixels=DEFAULT_MAX_RENDER_PIXELS,
+                              profile=None):
         """Extract a PDF page as an image.
 
+        Pages larger than max_pixels are rendered in bands, see
+        render_pil_banded().
+
         Args:
             page: PyMuPDF Page object
             zoom (float): Zoom factor for the image (default: 1.0)
+            max_pixels (int, optional): Pixel budget of one render
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one. Defaults to RGB at the given zoom.
 
         Returns:
             PIL.Image: Extracted image or None if failed
@@ -142,14 +696,17 @@ class TextExtractor:
             if not page:
                 return None
 
-            # Get the page's matrix for the specified zoom
-            mat = fitz.Matrix(zoom, zoom)
+            # Profilin çözünürlüğü varsa zoom yerine o kullanılır
+            profile = get_render_profile(profile)
+            zoom = profile.get_zoom(page, zoom)
+            if needs_banding(page, zoom, max_pixels):
+                return render_pil_banded(page, zoom, max_pixels, profile)
 
             # Get the pixmap
-            pix = page.get_pixmap(matrix=mat)
+            pix = profile.get_pixmap(page, zoom)
 
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            # Convert to PIL Image (straight from the pixmap buffer)
+            img = profile.to_pil(pix)
 
             return img
 
@@ -157,20 +714,35 @@ class TextExtractor:
             logger.error(f"Error extracting page as image: {e}")
             return None
 
-    def save_page_as_image(self, page, file_path, zoom=1.0):
+    def save_page_as_image(self, page, file_path, zoom=1.0, max_pixels=DEFAULT_MAX_RENDER_PIXELS,
+                           profile=None):
         """Save a PDF page as an image file.
 
+        Pages larger than max_pixels are rendered in bands; PNG files are
+        then written band by band, see save_image_banded().
+
         Args:
             page: PyMuPDF Page object
             file_path (str): Path to save the image
             zoom (float): Zoom factor for the image (default: 1.0)
+            max_pixels (int, optional): Pixel budget of one render
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one. Defaults to RGB at the given zoom.
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
+            profile = get_render_profile(profile)
+            page_zoom = profile.get_zoom(page, zoom) if page else zoom
+            if page and needs_banding(page, page_zoom, max_pixels):
+                extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+                save_image_banded(page, file_path, page_zoom, IMAGE_FORMATS.get(extension, "PNG"),
+                                  max_pixels, profile)
+                return True
+
             # Extract the image
-            img = self.extract_page_as_image(page, zoom)
+            img = self.extract_page_as_image(page, zoom, max_pixels, profile)
             if img is None:
                 return False
 
@@ -182,71 +754,231 @@ class TextExtractor:
             logger.error(f"Error saving page as image: {e}")
             return False
 
-    def save_pages_as_images(self, doc, output_dir, start_page=None, end_page=None, zoom=1.0):
+    def save_pages_as_images(self, doc, output_dir, start_page=None, end_page=None, zoom=1.0,
+                             image_format="png", parallel=False, workers=None,
+                             progress_callback=None, cancel_callback=None,
+                             max_pixels=DEFAULT_MAX_RENDER_PIXELS, profile=None):
         """Save multiple PDF pages as image files.
 
+        In parallel mode the pages are split into small chunks that worker
+        processes render and save from their own handle of the file.
+        Documents with unsaved changes are exported in this process.
+        Either way, encoding a page overlaps with rendering the next one,
+        see save_page_images().
+
         Args:
             doc: PyMuPDF Document object
             output_dir (str): Directory to save the images
             start_page (int, optional): Start page index (0-based)
             end_page (int, optional): End page index (exclusive)
             zoom (float): Zoom factor for the images (default: 1.0)
+            image_format (str, optional): "png" or "jpg". Defaults to "png".
+            parallel (bool, optional): Export in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode.
+                Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+            cancel_callback (callable, optional): Returns True to stop the export;
+                pages already being saved are finished
+            max_pixels (int, optional): Pixel budget of one render; larger pages
+                are rendered in bands
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one, e.g. "fax" for 1-bit images at 200 DPI.
+                Defaults to RGB at the given zoom.
 
         Returns:
             tuple: (success_count, total_count, error_messages)
         """
         if not doc or not output_dir:
             return 0, 0, ["Invalid document or output directory"]
+        if image_format not in IMAGE_FORMATS:
+            return 0, 0, [f"Desteklenmeyen görüntü biçimi: {image_format}"]
+        try:
+            profile = get_render_profile(profile)
+        except ValueError as e:
+            return 0, 0, [str(e)]
+        if profile.alpha and image_format == "jpg":
+            return 0, 0, ["JPEG does not support transparency"]
 
         # Sayfa aralığını ayarla
         if start_page is None:
             start_page = 0
         if end_page is None:
             end_page = len(doc)
-
-        success_count = 0
-        error_messages = []
-        total_count = end_page - start_page
+        total_count = max(0, end_page - start_page)
+        results = {}
 
         try:
             # Çıktı klasörünü oluştur (yoksa)
             os.makedirs(output_dir, exist_ok=True)
 
-            # Her sayfayı dışa aktar
-            for page_num in range(start_page, end_page):
+            workers = max(1, workers or os.cpu_count() or 1)
+            chunks = page_chunks(start_page, end_page, workers, max_chunk=IMAGE_CHUNK_PAGES)
+            file_path = doc.name
+            if (not parallel or workers == 1 or len(chunks) < 2 or doc.is_dirty
+                    or not file_path or not os.path.exists(file_path)):
+                results = save_page_images(doc, range(start_page, end_page), output_dir, zoom,
+                                           image_format, progress_callback, cancel_callback,
+                                           max_pixels, profile)
+            else:
+                # spawn: forking a process that runs Qt threads is not safe
+                executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                               mp_context=multiprocessing.get_context("spawn"))
+                tasks = []
                 try:
-                    page = doc[page_num]
-                    output_path = os.path.join(output_dir, f"sayfa_{page_num + 1}.png")
+                    tasks = [executor.submit(_save_image_range, file_path, output_dir, zoom,
+                                             image_format, max_pixels, profile, start, end)
+                             for start, end in chunks]
+                    for task in as_completed(tasks):
+                        results.update(task.result())
+                        if progress_callback:
+                            progress_callback(len(results), total_count)
+                        if cancel_callback and cancel_callback():
+                            break
+                finally:
+                    # Running chunks are finished, queued ones dropped
+                    executor.shutdown(wait=True, cancel_futures=True)
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception() is None:
+                        results.update(task.result())
+
+        except Exception as e:
+            logger.error(f"Error in batch image export: {e}")
+            return sum(1 for error in results.values() if error is None), total_count, [str(e)]
+
+        error_messages = [f"Sayfa {page_num + 1}: {error}"
+                          for page_num, error in sorted(results.items()) if error is not None]
+        success_count = len(results) - len(error_messages)
+        return success_count, total_count, error_messages
 
-                    if self.save_page_as_image(page, output_path, zoom):
-                        success_count += 1
-                    else:
-                        error_messages.append(f"Sayfa {page_num + 1} kaydedilemedi")
+    def extract_embedded_images(self, doc, output_dir, start_page=None, end_page=None,
+                                parallel=False, workers=None, progress_callback=None):
+        """Save the images embedded in pages as they are stored in the PDF.
 
-                except Exception as e:
-                    error_messages.append(f"Sayfa {page_num + 1}: {str(e)}")
+        Unlike extract_page_as_image(), nothing is rendered: the image
+        streams are written out directly, see save_embedded_images(). An
+        image used on several pages is written once, and images stored
+        more than once with the same content are written only once too.
+
+        Args:
+            doc: PyMuPDF Document object
+            output_dir (str): Directory to save the images
+            start_page (int, optional): Start page index (0-based)
+            end_page (int, optional): End page index (exclusive)
+            parallel (bool, optional): Extract in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes in parallel mode.
+                Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (images_done, total_images)
 
-            return success_count, total_count, error_messages
+        Returns:
+            list: One dict per distinct image in order of first use, with
+                'xref', 'pages', 'path', 'ext', 'width', 'height' and 'sha1';
+                'duplicates' lists the xrefs of identical copies. Empty if failed.
+        """
+        if not doc or not output_dir:
+            return []
 
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            images = collect_page_images(doc, start_page or 0, end_page)
+            items = [(xref, pages[0]) for xref, pages in images.items()]
+            workers = max(1, workers or os.cpu_count() or 1)
+            chunks = page_chunks(0, len(items), workers)
+            file_path = doc.name
+
+            results = {}
+            if (not parallel or workers == 1 or len(chunks) < 2 or doc.is_dirty
+                    or not file_path or not os.path.exists(file_path)):
+                for start, end in chunks:
+                    results.update((r["xref"], r) for r in
+                                   save_embedded_images(doc, items[start:end], output_dir))
+                    if progress_callback:
+                        progress_callback(len(results), len(items))
+            else:
+                # spawn: forking a process that runs Qt threads is not safe
+                executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                               mp_context=multiprocessing.get_context("spawn"))
+                try:
+                    tasks = [executor.submit(_save_embedded_image_list, file_path,
+                                             items[start:end], output_dir)
+                             for start, end in chunks]
+                    for task in as_completed(tasks):
+                        results.update((r["xref"], r) for r in task.result())
+                        if progress_callback:
+                            progress_callback(len(results), len(items))
+                finally:
+                    executor.shutdown(wait=False, cancel_futures=True)
         except Exception as e:
-            logger.error(f"Error in batch image export: {e}")
-            return success_count, total_count, [str(e)]
+            logger.error(f"Error extracting embedded images: {e}")
+            return []
 
-    # Note: For actual OCR functionality, you would need to integrate
-    # with a library like pytesseract or a cloud OCR service.
-    def perform_ocr(self, page):
-        """Placeholder for OCR functionality.
+        # Aynı içerikli kopyaları tek dosyada birleştir
+        manifest = []
+        by_hash = {}
+        for xref, pages in images.items():
+            result = results[xref]
+            if "error" in result:
+                logger.warning(f"Could not extract image {xref}: {result['error']}")
+                continue
+            first = by_hash.get(result["sha1"])
+            if first is None:
+                entry = dict(result, pages=list(pages), duplicates=[])
+                by_hash[result["sha1"]] = entry
+                manifest.append(entry)
+            else:
+                os.remove(result["path"])
+                first["duplicates"].append(xref)
+                first["pages"] = sorted(set(first["pages"]) | set(pages))
+        return manifest
 
-        This would require integration with an OCR library like pytesseract.
+    def perform_ocr(self, page, dpi=DEFAULT_OCR_DPI, language=DEFAULT_OCR_LANGUAGE,
+                    skip_text_layer=True, cache=None):
+        """Recognize the text of a scanned page with Tesseract.
 
         Args:
             page: PyMuPDF Page object
+            dpi (int, optional): Resolution the page is rendered at. Defaults to 300.
+            language (str, optional): Tesseract language(s). Defaults to "eng".
+            skip_text_layer (bool, optional): Return the existing text of pages
+                that have a text layer instead of OCRing them. Defaults to True.
+            cache (OCRCache, optional): Result cache, see ocr_document()
 
         Returns:
-            str: OCR extracted text (placeholder)
+            dict: OCR result with 'text' and 'words' (word tuples with
+                bounding boxes, see OCREngine.recognize_pages()), or None if failed
         """
-        # This is a placeholder. In a real implementation, you would:
-        # 1. Convert the page to an image
-        # 2. Use an OCR library to extract text
-        # 3. Return the extracted text
-        return "OCR functionality requires integration with an OCR library"
\ No newline at end of file
+        results = self.ocr_document(page.parent, [page.number], dpi, language,
+                                    skip_text_layer=skip_text_layer, workers=1, cache=cache)
+        return results[0] if results else None
+
+    def ocr_document(self, doc, page_indices=None, dpi=DEFAULT_OCR_DPI,
+                     language=DEFAULT_OCR_LANGUAGE, skip_text_layer=True, workers=None,
+                     progress_callback=None, cache=None):
+        """Recognize the text of several pages in parallel worker processes.
+
+        Args:
+            doc: PyMuPDF Document object
+            page_indices (list, optional): Pages to recognize. Defaults to all pages.
+            dpi (int, optional): Resolution pages are rendered at. Defaults to 300.
+            language (str, optional): Tesseract language(s). Defaults to "eng".
+            skip_text_layer (bool, optional): Skip pages that have a text layer. Defaults to True.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+            cache (OCRCache, optional): Result cache; False disables caching.
+                Defaults to the OCR cache of the PDF manager, or of the user
+                cache directory without one.
+
+        Returns:
+            list: OCR results in page order, or an empty list if failed
+        """
+        if not doc:
+            return []
+
+        try:
+            if cache is None and self.pdf_manager:
+                cache = self.pdf_manager.get_ocr_cache()
+            engine = OCREngine(dpi, language, max_workers=workers, cache=cache)
+            return engine.recognize_pages(doc, page_indices, skip_text_pages=skip_text_layer,
+                                          progress_callback=progress_callback)
+        except Exception as e:
+            logger.error(f"Error performing OCR: {e}")
+            return []
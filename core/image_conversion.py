@@ -0,0 +1,104 @@
+"""
+Conversion of PyMuPDF pixmaps to QImage and PIL images without copying.
+
+The images are built directly on the pixmap's sample buffer
+(Pixmap.samples_mv) instead of a bytes copy of it. Since that memory is
+owned by the pixmap, a reference to the pixmap is stored on the image and
+the pixmap lives as long as the image object does.
+"""
+import pymupdf as fitz
+
+
+def normalize_pixmap(pix):
+    """Convert a pixmap to a layout QImage and PIL can use directly.
+
+    Grayscale, RGB and RGBA pixmaps are returned unchanged. Other
+    colorspaces (CMYK, grayscale with alpha, ...) are converted to RGB,
+    keeping the alpha channel if there is one.
+
+    Args:
+        pix (fitz.Pixmap): Source pixmap
+
+    Returns:
+        fitz.Pixmap: Grayscale, RGB or RGBA pixmap
+    """
+    colorspace_n = pix.colorspace.n if pix.colorspace else 0
+    if (colorspace_n, bool(pix.alpha)) in ((1, False), (3, False), (3, True)):
+        return pix
+    return fitz.Pixmap(fitz.csRGB, pix)
+
+
+def _qimage_format(n, alpha):
+    """Get the QImage format matching a pixmap layout.
+
+    Args:
+        n (int): Components per pixel, including alpha
+        alpha (bool): Whether the last component is alpha
+
+    Returns:
+        QImage.Format: Matching image format
+    """
+    from PyQt6.QtGui import QImage
+    formats = {
+        (1, False): QImage.Format.Format_Grayscale8,
+        (3, False): QImage.Format.Format_RGB888,
+        (4, True): QImage.Format.Format_RGBA8888,
+    }
+    return formats[(n, bool(alpha))]
+
+
+def qimage_from_samples(samples, width, height, stride, n=3, alpha=False, owner=None):
+    """Build a QImage on top of an existing sample buffer.
+
+    Args:
+        samples: Buffer with the pixel data (bytes, memoryview, ...)
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        stride (int): Bytes per line
+        n (int, optional): Components per pixel, including alpha. Defaults to 3.
+        alpha (bool, optional): Whether the last component is alpha. Defaults to False.
+        owner (object, optional): Object owning the buffer memory, kept
+            alive together with the image
+
+    Returns:
+        QImage: Image sharing the buffer memory
+    """
+    from PyQt6.QtGui import QImage
+    img = QImage(samples, width, height, stride, _qimage_format(n, alpha))
+    img._buffer_owner = owner if owner is not None else samples
+    return img
+
+
+def pixmap_to_qimage(pix):
+    """Convert a pixmap to a QImage without copying the pixel data.
+
+    Args:
+        pix (fitz.Pixmap): Source pixmap
+
+    Returns:
+        QImage: Image sharing the pixmap's memory
+    """
+    pix = normalize_pixmap(pix)
+    return qimage_from_samples(pix.samples_mv, pix.width, pix.height, pix.stride,
+                               pix.n, pix.alpha, owner=pix)
+
+
+def pixmap_to_pil(pix):
+    """Convert a pixmap to a PIL image, sharing its memory where PIL allows.
+
+    Grayscale and RGBA images map the pixmap's memory directly; RGB is
+    unpacked by PIL in a single copy straight from the pixmap buffer.
+
+    Args:
+        pix (fitz.Pixmap): Source pixmap
+
+    Returns:
+        PIL.Image.Image: Image built on the pixmap samples
+    """
+    from PIL import Image
+    pix = normalize_pixmap(pix)
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[pix.n]
+    img = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                           "raw", mode, pix.stride, 1)
+    img._buffer_owner = pix
+    return img
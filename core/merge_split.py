@@ -3,6 +3,129 @@ Module for merging and splitting PDF files.
 """
 import fitz  # PyMuPDF
 import os
+import tempfile
+
+from .parallel import iter_chunk_results, page_chunks, report_progress
+
+# Birleştirmede diske yazmadan önce bellekte biriken en fazla sayfa sayısı
+MERGE_CHUNK_PAGES = 500
+
+# Output files per worker task in parallel splitting
+SPLIT_CHUNK_FILES = 64
+
+# Save options of compressed split output: deflated streams, objects in object streams
+SPLIT_COMPRESS_OPTIONS = {"garbage": 3, "deflate": True, "deflate_images": True,
+                          "deflate_fonts": True, "use_objstms": 1}
+
+
+def split_file_path(output_dir, pdf_path, file_num, file_count):
+    """Get the path of an output file of a split.
+
+    Args:
+        output_dir (str): Output directory
+        pdf_path (str): Path of the source PDF
+        file_num (int): 0-based index of the output file
+        file_count (int): Number of output files
+
+    Returns:
+        str: Path of the output file
+    """
+    return os.path.join(output_dir,
+                        f"split_{os.path.basename(pdf_path)}_{file_num + 1:03d}_of_{file_count:03d}.pdf")
+
+
+def write_split_file(doc, output_dir, file_num, file_count, pages_per_file, compress=False):
+    """Write one output file of a split.
+
+    Args:
+        doc (fitz.Document): Source document
+        output_dir (str): Output directory
+        file_num (int): 0-based index of the output file
+        file_count (int): Number of output files
+        pages_per_file (int): Number of pages per output file
+        compress (bool, optional): Save with SPLIT_COMPRESS_OPTIONS. Defaults to False.
+
+    Returns:
+        dict: Manifest entry with 'path', 'start_page', 'end_page' (exclusive),
+            'size' in bytes and 'error', the error message or None
+    """
+    start_page = file_num * pages_per_file
+    end_page = min(start_page + pages_per_file, len(doc))
+    output_path = split_file_path(output_dir, doc.name, file_num, file_count)
+    entry = {"path": output_path, "start_page": start_page, "end_page": end_page,
+             "size": 0, "error": None}
+    try:
+        with fitz.open() as new_doc:
+            new_doc.insert_pdf(doc, from_page=start_page, to_page=end_page - 1)
+            new_doc.save(output_path, **(SPLIT_COMPRESS_OPTIONS if compress else {}))
+        entry["size"] = os.path.getsize(output_path)
+    except Exception as e:
+        return split_error_entry(output_dir, doc.name, file_num, len(doc), pages_per_file, e)
+    return entry
+
+
+def split_error_entry(output_dir, pdf_path, file_num, page_count, pages_per_file, error):
+    """Build the manifest entry of an output file that could not be written.
+
+    A partially written output file is removed, so only the files of
+    successful entries are left on disk.
+
+    Args:
+        output_dir (str): Output directory
+        pdf_path (str): Path of the source PDF
+        file_num (int): 0-based index of the output file
+        page_count (int): Number of pages of the source PDF
+        pages_per_file (int): Number of pages per output file
+        error (Exception or str): Why the file could not be written
+
+    Returns:
+        dict: Manifest entry, see write_split_file()
+    """
+    file_count = (page_count + pages_per_file - 1) // pages_per_file
+    output_path = split_file_path(output_dir, pdf_path, file_num, file_count)
+    start_page = file_num * pages_per_file
+    if os.path.isfile(output_path):
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+    return {"path": output_path, "start_page": start_page,
+            "end_page": min(start_page + pages_per_file, page_count), "size": 0,
+            "error": str(error)}
+
+
+def _split_file_range(pdf_path, output_dir, page_count, pages_per_file, compress,
+                      start_file, end_file):
+    """Write a range of the output files of a split in a worker process.
+
+    Never raises; if the source cannot be read, every file of the range
+    gets an error entry.
+
+    Args:
+        pdf_path (str): Path of the source PDF
+        output_dir (str): Existing output directory
+        page_count (int): Number of pages of the source PDF
+        pages_per_file (int): Number of pages per output file
+        compress (bool): Save with SPLIT_COMPRESS_OPTIONS
+        start_file (int): Index of the first output file
+        end_file (int): Index after the last output file
+
+    Returns:
+        tuple: (start_file, list of manifest entries)
+    """
+    file_count = (page_count + pages_per_file - 1) // pages_per_file
+    entries = []
+    try:
+        with fitz.open(pdf_path) as doc:
+            for file_num in range(start_file, end_file):
+                entries.append(write_split_file(doc, output_dir, file_num, file_count,
+                                                pages_per_file, compress))
+                report_progress()
+    except Exception as e:
+        entries += [split_error_entry(output_dir, pdf_path, file_num, page_count,
+                                      pages_per_file, e)
+                    for file_num in range(start_file + len(entries), end_file)]
+    return start_file, entries
 
 
 class PDFMergeSplit:
@@ -12,47 +135,196 @@ class PDFMergeSplit:
         """Initialize the merge/split manager."""
         pass
 
-    def merge_pdfs(self, pdf_paths, output_path):
+    def merge_pdfs(self, pdf_paths, output_path, dedupe=False, progress_callback=None):
         """Merge multiple PDF files into one.
 
+        Inputs that cannot be read are skipped, see merge_pdfs_streaming().
+
         Args:
             pdf_paths (list): List of paths to PDF files to merge
             output_path (str): Path to save the merged PDF
+            dedupe (bool, optional): Merge identical fonts and images on save. Defaults to False.
+            progress_callback (callable, optional): Called with (inputs_done, total_inputs)
 
         Returns:
             bool: True if successful, False otherwise
         """
+        merged_count, _, errors = self.merge_pdfs_streaming(
+            pdf_paths, output_path, dedupe=dedupe, progress_callback=progress_callback)
+        for error in errors:
+            print(f"Error merging PDFs: {error}")
+        return merged_count > 0
+
+    def merge_pdfs_streaming(self, pdf_paths, output_path, chunk_pages=MERGE_CHUNK_PAGES,
+                             dedupe=False, progress_callback=None):
+        """Merge PDF files with bounded memory, reporting failed inputs.
+
+        Merged pages are collected in memory only until chunk_pages is
+        reached. They are then appended to a work file next to the output
+        with an incremental save, and the work file is reopened, which
+        drops the copied objects from memory. The final save rewrites the
+        work file into the output file.
+
+        An input that cannot be opened or copied is left out and reported;
+        the remaining inputs are still merged.
+
+        Args:
+            pdf_paths (list): List of paths to PDF files to merge
+            output_path (str): Path to save the merged PDF
+            chunk_pages (int, optional): Pages kept in memory between writes
+            dedupe (bool, optional): Merge identical objects on the final save,
+                so fonts and images shared by the inputs are stored once.
+                Slower, since every object is compared. Defaults to False.
+            progress_callback (callable, optional): Called with (inputs_done, total_inputs)
+
+        Returns:
+            tuple: (merged_count, total_count, error_messages). Nothing is
+                written if no input could be merged.
+        """
+        total_count = len(pdf_paths) if pdf_paths else 0
         if not pdf_paths or not output_path:
-            return False
+            return 0, total_count, ["No input files or output path"]
+
+        merged_count = 0
+        errors = []
+        merged_doc = None
+        pending_pages = 0
+        # Çalışma dosyası çıktıyla aynı dizinde, böylece ek diske sığar
+        fd, work_path = tempfile.mkstemp(suffix=".pdf",
+                                         dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
 
         try:
             merged_doc = fitz.open()
+            for done, pdf_path in enumerate(pdf_paths, 1):
+                try:
+                    pending_pages += self._append_pdf(merged_doc, pdf_path)
+                    merged_count += 1
+                except Exception as e:
+                    errors.append(f"{os.path.basename(pdf_path)}: {e}")
 
-            for pdf_path in pdf_paths:
-                if os.path.exists(pdf_path):
-                    doc = fitz.open(pdf_path)
-                    merged_doc.insert_pdf(doc)
-                    doc.close()
+                if pending_pages >= chunk_pages:
+                    merged_doc = self._write_merge_chunk(merged_doc, work_path)
+                    pending_pages = 0
+                if progress_callback:
+                    progress_callback(done, total_count)
 
-            merged_doc.save(output_path)
-            merged_doc.close()
-            return True
+            if merged_count:
+                if pending_pages and merged_doc.name:
+                    merged_doc = self._write_merge_chunk(merged_doc, work_path)
+                merged_doc.save(output_path, garbage=4 if dedupe else 1, deflate=dedupe)
         except Exception as e:
-            print(f"Error merging PDFs: {e}")
-            return False
+            errors.append(str(e))
+            merged_count = 0
+        finally:
+            if merged_doc is not None and not merged_doc.is_closed:
+                merged_doc.close()
+            for path in (work_path, work_path + ".tmp"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return merged_count, total_count, errors
+
+    @staticmethod
+    def _append_pdf(merged_doc, pdf_path):
+        """Append all pages of a PDF file to the merged document.
+
+        Args:
+            merged_doc (fitz.Document): Document being merged into
+            pdf_path (str): Path to the PDF file
+
+        Returns:
+            int: Number of pages appended
+
+        Raises:
+            Exception: If the file cannot be merged; no pages of it are left behind
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError("file not found")
+        with fitz.open(pdf_path) as doc:
+            if not doc.is_pdf:
+                raise ValueError("not a PDF file")
+            if doc.needs_pass:
+                raise ValueError("password protected")
+            page_count = len(merged_doc)
+            try:
+                merged_doc.insert_pdf(doc)
+            except Exception:
+                # Yarım kalan kopyayı geri al
+                if len(merged_doc) > page_count:
+                    merged_doc.delete_pages(page_count, len(merged_doc) - 1)
+                raise
+            return len(doc)
+
+    @staticmethod
+    def _write_merge_chunk(merged_doc, work_path):
+        """Write the merged pages to the work file and reopen it.
+
+        Args:
+            merged_doc (fitz.Document): Document being merged into
+            work_path (str): Path of the work file
+
+        Returns:
+            fitz.Document: The work file, opened again without the pages in memory
+        """
+        if merged_doc.name and merged_doc.can_save_incrementally():
+            # Yalnızca yeni nesneler dosyanın sonuna eklenir
+            merged_doc.save(work_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            merged_doc.close()
+        else:
+            # İlk parça bellekte: belge tamamen yazılır
+            temp_path = work_path + ".tmp"
+            merged_doc.save(temp_path)
+            merged_doc.close()
+            os.replace(temp_path, work_path)
+        return fitz.open(work_path)
 
-    def split_pdf(self, pdf_path, output_dir, pages_per_file=1):
+    def split_pdf(self, pdf_path, output_dir, pages_per_file=1, compress=False, parallel=False,
+                  workers=None, progress_callback=None):
         """Split a PDF into multiple files.
 
         Args:
             pdf_path (str): Path to the PDF file to split
             output_dir (str): Directory to save the split PDFs
             pages_per_file (int, optional): Number of pages per output file. Defaults to 1.
+            compress (bool, optional): Deflate streams and drop duplicate objects. Defaults to False.
+            parallel (bool, optional): Write the files in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (files_done, total_files)
 
         Returns:
             list: List of paths to the created PDF files or empty list if failed
         """
-        if not pdf_path or not output_dir or not os.path.exists(pdf_path):
+        manifest = self.split_pdf_manifest(pdf_path, output_dir, pages_per_file, compress,
+                                           parallel, workers, progress_callback)
+        for entry in manifest:
+            if entry["error"]:
+                print(f"Error splitting PDF: {entry['path']}: {entry['error']}")
+        return [entry["path"] for entry in manifest if not entry["error"]]
+
+    def split_pdf_manifest(self, pdf_path, output_dir, pages_per_file=1, compress=False,
+                           parallel=False, workers=None, progress_callback=None):
+        """Split a PDF into multiple files and describe the files written.
+
+        In parallel mode the output files are divided into ranges that
+        worker processes write, each opening the source file once.
+
+        Args:
+            pdf_path (str): Path to the PDF file to split
+            output_dir (str): Directory to save the split PDFs
+            pages_per_file (int, optional): Number of pages per output file. Defaults to 1.
+            compress (bool, optional): Deflate streams and drop duplicate objects. Defaults to False.
+            parallel (bool, optional): Write the files in worker processes. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (files_done, total_files)
+
+        Returns:
+            list: One manifest entry per output file in page order, see
+                write_split_file(), or empty list if the source cannot be read.
+                Files that could not be written have an error and are not
+                left on disk; the other files are kept.
+        """
+        if not pdf_path or not output_dir or not os.path.exists(pdf_path) or pages_per_file < 1:
             return []
 
         try:
@@ -60,40 +332,46 @@ class PDFMergeSplit:
             os.makedirs(output_dir, exist_ok=True)
 
             # Open the source PDF
-            doc = fitz.open(pdf_path)
-            total_pages = len(doc)
-
-            output_files = []
-            file_count = 0
-
-            # Calculate how many files we'll create
-            file_count_total = (total_pages + pages_per_file - 1) // pages_per_file
+            with fitz.open(pdf_path) as doc:
+                total_pages = len(doc)
 
-            for start_page in range(0, total_pages, pages_per_file):
-                # Create a new PDF for this chunk
-                new_doc = fitz.open()
+                # Calculate how many files we'll create
+                file_count_total = (total_pages + pages_per_file - 1) // pages_per_file
 
-                # Calculate end page for this chunk
-                end_page = min(start_page + pages_per_file - 1, total_pages - 1)
+                workers = max(1, workers or os.cpu_count() or 1)
+                chunks = page_chunks(0, file_count_total, workers, max_chunk=SPLIT_CHUNK_FILES)
+                if parallel and workers > 1 and len(chunks) > 1:
+                    finished = {}  # first file of a chunk -> entries, as soon as it is done
+                    error = None
+                    try:
+                        for _ in iter_chunk_results(
+                                chunks, workers, _split_file_range, pdf_path, output_dir,
+                                total_pages, pages_per_file, compress,
+                                progress_callback=progress_callback,
+                                chunk_callback=finished.__setitem__):
+                            pass
+                    except Exception as e:
+                        # Örneğin bir işçi süreci çöktü; sonucu gelmeyen parçalar başarısız sayılır
+                        print(f"Error splitting PDF: {e}")
+                        error = e
 
-                # Add pages to the new document
-                new_doc.insert_pdf(doc, from_page=start_page, to_page=end_page)
+                    manifest = []
+                    for start_file, end_file in chunks:
+                        if start_file in finished:
+                            manifest += finished[start_file]
+                        else:
+                            manifest += [split_error_entry(output_dir, pdf_path, file_num,
+                                                           total_pages, pages_per_file, error)
+                                         for file_num in range(start_file, end_file)]
+                    return manifest
 
-                # Generate output filename
-                file_count += 1
-                output_filename = os.path.join(
-                    output_dir,
-                    f"split_{os.path.basename(pdf_path)}_{file_count:03d}_of_{file_count_total:03d}.pdf"
-                )
-
-                # Save the new document
-                new_doc.save(output_filename)
-                new_doc.close()
-
-                output_files.append(output_filename)
-
-            doc.close()
-            return output_files
+                manifest = []
+                for file_num in range(file_count_total):
+                    manifest.append(write_split_file(doc, output_dir, file_num, file_count_total,
+                                                     pages_per_file, compress))
+                    if progress_callback:
+                        progress_callback(file_num + 1, file_count_total)
+                return manifest
         except Exception as e:
             print(f"Error splitting PDF: {e}")
             return []
@@ -0,0 +1,476 @@
+"""
+OCR of scanned PDF pages with Tesseract.
+
+Pages are rendered at a configurable resolution and recognized in a pool
+of worker processes. Results contain the recognized words with their
+bounding boxes in PDF coordinates. They are cached on disk under a
+fingerprint of the page content, so running OCR again on an unchanged
+scan costs nothing, even in another file.
+
+Recognized text can be written back into the PDF as an invisible text
+layer, after which the pages are searchable without OCR.
+"""
+import os
+import json
+import hashlib
+import logging
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pymupdf as fitz
+
+from .thumbnail_cache import get_cache_dir, remove_least_recently_used, write_file_atomic
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan OCR çözünürlüğü
+DEFAULT_OCR_DPI = 300
+
+# Varsayılan Tesseract dili
+DEFAULT_OCR_LANGUAGE = "eng"
+
+# Pages with at least this many characters of text are not OCRed
+MIN_TEXT_LAYER_CHARS = 10
+
+# Bump when the result format changes, so old cache entries are ignored
+OCR_CACHE_VERSION = 1
+
+# OCR önbelleğinin alt dizini (önbellek dizininde)
+OCR_CACHE_DIR_NAME = 'ocr'
+
+# Varsayılan OCR önbelleği boyutu (byte)
+DEFAULT_OCR_CACHE_BYTES = 64 * 1024 * 1024
+
+# Resource name of the font used for the invisible text layer
+OCR_FONT_NAME = "OCRText"
+
+# Pages submitted per worker at a time. Pages of documents with unsaved
+# changes are rendered before submitting, so this bounds their memory.
+MAX_PENDING_PER_WORKER = 2
+
+
+def is_ocr_available():
+    """Check whether pytesseract and the Tesseract program are installed.
+
+    Returns:
+        bool: True if OCR can be performed
+    """
+    if pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def has_text_layer(page, min_chars=MIN_TEXT_LAYER_CHARS):
+    """Check whether a page already has extractable text.
+
+    Args:
+        page: PyMuPDF Page object
+        min_chars (int, optional): Minimum number of non-space characters
+
+    Returns:
+        bool: True if the page has a text layer
+    """
+    return len("".join(page.get_text().split())) >= min_chars
+
+
+def page_fingerprint(page, dpi=DEFAULT_OCR_DPI, language=DEFAULT_OCR_LANGUAGE):
+    """Compute a fingerprint of everything OCR results of a page depend on.
+
+    The page content stream and the raw data of its images are hashed
+    together with the page geometry (rotation, mediabox and cropbox) and
+    the OCR settings. Image streams
+    are hashed undecoded, which is cheap even for large scans.
+
+    Args:
+        page: PyMuPDF Page object
+        dpi (int, optional): OCR resolution
+        language (str, optional): Tesseract language
+
+    Returns:
+        str: Hex fingerprint
+    """
+    doc = page.parent
+    digest = hashlib.sha1(
+        f"{OCR_CACHE_VERSION}:{dpi}:{language}:{page.rotation}:{tuple(page.mediabox)}:"
+        f"{tuple(page.cropbox)}".encode())
+    digest.update(page.read_contents())
+    for image in page.get_images(full=True):
+        digest.update(doc.xref_stream_raw(image[0]) or b"")
+    return digest.hexdigest()
+
+
+def words_from_tesseract_data(data, matrix):
+    """Convert Tesseract word data to PyMuPDF style word tuples.
+
+    Args:
+        data (dict): Output of pytesseract.image_to_data() as a dict
+        matrix (fitz.Matrix): Transformation from image pixels to page coordinates
+
+    Returns:
+        list: (x0, y0, x1, y1, word, block_no, line_no, word_no, confidence) tuples,
+            the same layout as Page.get_text("words") plus the confidence
+    """
+    words = []
+    lines = {}  # (block, paragraph, line) -> line number within the block
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        if not text or float(data["conf"][i]) < 0:
+            continue
+        block = data["block_num"][i]
+        line_key = (block, data["par_num"][i], data["line_num"][i])
+        if line_key not in lines:
+            lines[line_key] = sum(1 for key in lines if key[0] == block)
+        rect = fitz.Rect(data["left"][i], data["top"][i],
+                         data["left"][i] + data["width"][i],
+                         data["top"][i] + data["height"][i]) * matrix
+        words.append((rect.x0, rect.y0, rect.x1, rect.y1, text, block, lines[line_key],
+                      data["word_num"][i], float(data["conf"][i])))
+    return words
+
+
+def _init_ocr_worker():
+    """Limit Tesseract to one thread; the pool already uses every core."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_page(source, page_index, dpi, language):
+    """Render and recognize a page in a worker process.
+
+    Args:
+        source: Path of the PDF file, or (samples, width, height, derotation)
+            of a grayscale rendering of the page and its derotation matrix
+        page_index (int): Index of the page
+        dpi (int): OCR resolution
+        language (str): Tesseract language
+
+    Returns:
+        tuple: (page_index, text, words) with word boxes in page coordinates
+    """
+    from PIL import Image
+
+    if isinstance(source, str):
+        with fitz.open(source) as doc:
+            page = doc[page_index]
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+            derotation = page.derotation_matrix
+        samples, width, height = pix.samples, pix.width, pix.height
+    else:
+        samples, width, height, derotation = source
+
+    image = Image.frombytes("L", (width, height), samples)
+    data = pytesseract.image_to_data(image, lang=language, config=f"--dpi {dpi}",
+                                     output_type=pytesseract.Output.DICT)
+    words = words_from_tesseract_data(data, fitz.Matrix(72 / dpi, 72 / dpi) * fitz.Matrix(derotation))
+
+    # Satırları Tesseract sırasıyla birleştir
+    text = "\n".join(" ".join(word[4] for word in line) for line in _group_lines(words))
+    return page_index, text, words
+
+
+def _group_lines(words):
+    """Group word tuples into lines, keeping their order.
+
+    Args:
+        words (list): Word tuples, see words_from_tesseract_data()
+
+    Returns:
+        list: Lists of the word tuples of each line
+    """
+    lines = {}
+    for word in words:
+        lines.setdefault((word[5], word[6]), []).append(word)
+    return list(lines.values())
+
+
+def add_text_layer(page, words, font=None):
+    """Write recognized words onto a page as invisible text.
+
+    Every line is written as a single string stretched over the line's
+    bounding box, so text extraction and phrase search see the same lines
+    and spaces as in the OCR result. The text uses render mode 3 (neither
+    filled nor stroked) and changes nothing visible. All lines of a page
+    go into one content stream.
+
+    Args:
+        page: PyMuPDF Page object
+        words (list): Word tuples in unrotated page coordinates,
+            see words_from_tesseract_data()
+        font (fitz.Font, optional): Font to write with. Defaults to Helvetica.
+
+    Returns:
+        int: Number of lines written
+    """
+    font = font or fitz.Font("helv")
+    line_height = font.ascender - font.descender
+    page.insert_font(fontname=OCR_FONT_NAME, fontbuffer=font.buffer)
+
+    # Satırlar görünen sayfada yatay olmalı, döndürülmüş sayfalarda da
+    shape = page.new_shape()
+    count = 0
+    for line in _group_lines(words):
+        text = " ".join(word[4] for word in line)
+        rect = fitz.Rect()
+        for word in line:
+            rect |= fitz.Rect(word[:4]) * page.rotation_matrix
+        text_width = font.text_length(text, fontsize=1)
+        if rect.is_empty or not text_width:
+            continue
+        fontsize = min(rect.width / text_width, rect.height / line_height)
+        origin = fitz.Point(rect.x0, rect.y1 + font.descender * fontsize) * page.derotation_matrix
+        shape.insert_text(origin, text, fontsize=fontsize, fontname=OCR_FONT_NAME,
+                          rotate=page.rotation, render_mode=3)
+        count += 1
+    if count:
+        shape.commit()
+    return count
+
+
+def apply_text_layers(doc, results, progress_callback=None):
+    """Write the OCR results of several pages into a document.
+
+    Pages that were skipped because they already have a text layer, or on
+    which nothing was recognized, are left unchanged.
+
+    Args:
+        doc: PyMuPDF Document object
+        results (list): Result dicts of OCREngine.recognize_pages()
+        progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+    Returns:
+        list: Indices of the pages that received a text layer
+    """
+    font = fitz.Font("helv")
+    changed = []
+    for done, result in enumerate(results, 1):
+        if not result["skipped"] and result["words"]:
+            if add_text_layer(doc[result["page"]], result["words"], font):
+                changed.append(result["page"])
+        if progress_callback:
+            progress_callback(done, len(results))
+    return changed
+
+
+class OCRCache:
+    """Disk cache of OCR results keyed by page fingerprint, with a size cap
+    and LRU cleanup like ThumbnailCache."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_OCR_CACHE_BYTES):
+        """Initialize the OCR cache.
+
+        Args:
+            cache_dir (str, optional): Cache directory. Defaults to the
+                'ocr' directory in get_cache_dir().
+            max_bytes (int, optional): Maximum total size of the cache in bytes.
+        """
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), OCR_CACHE_DIR_NAME)
+        self.max_bytes = max_bytes
+        self._cleanup_thread = None
+
+    def entry_path(self, fingerprint):
+        """Get the path of a cache entry.
+
+        Args:
+            fingerprint (str): Page fingerprint
+
+        Returns:
+            str: Path of the JSON file
+        """
+        return os.path.join(self.cache_dir, fingerprint[:2], f"{fingerprint}.json")
+
+    def read(self, fingerprint):
+        """Read a cached OCR result.
+
+        Args:
+            fingerprint (str): Page fingerprint
+
+        Returns:
+            dict: Result with 'text' and 'words', or None if not cached
+        """
+        path = self.entry_path(fingerprint)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)  # LRU için son kullanım zamanını güncelle
+            result["words"] = [tuple(word) for word in result["words"]]
+            return result
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write(self, fingerprint, text, words):
+        """Store an OCR result.
+
+        Args:
+            fingerprint (str): Page fingerprint
+            text (str): Recognized text
+            words (list): Word tuples
+        """
+        data = json.dumps({"text": text, "words": words}, ensure_ascii=False)
+        try:
+            write_file_atomic(self.entry_path(fingerprint), data.encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry: {e}")
+
+    def cleanup(self):
+        """Remove least recently used results until they fit the size cap.
+
+        Returns:
+            int: Number of removed files
+        """
+        paths = [os.path.join(root, name)
+                 for root, _, files in os.walk(self.cache_dir)
+                 for name in files if name.endswith('.json')]
+        return remove_least_recently_used(paths, self.max_bytes)
+
+    def cleanup_in_background(self):
+        """Run cleanup() in a background thread unless one is running."""
+        if self._cleanup_thread and self._cleanup_thread.is_alive():
+            return
+        self._cleanup_thread = threading.Thread(target=self.cleanup, daemon=True)
+        self._cleanup_thread.start()
+
+
+class OCREngine:
+    """Runs Tesseract on PDF pages in a pool of worker processes."""
+
+    def __init__(self, dpi=DEFAULT_OCR_DPI, language=DEFAULT_OCR_LANGUAGE,
+                 max_workers=None, cache=None):
+        """Initialize the OCR engine.
+
+        Args:
+            dpi (int, optional): Resolution pages are rendered at for OCR
+            language (str, optional): Tesseract language(s), e.g. "eng+tur"
+            max_workers (int, optional): Number of worker processes.
+                Defaults to the CPU count.
+            cache (OCRCache, optional): Result cache. Defaults to an OCRCache
+                in the user cache directory; False disables caching.
+        """
+        self.dpi = dpi
+        self.language = language
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = OCRCache() if cache is None else cache or None
+
+    def _page_source(self, page):
+        """Get what a worker needs to render a page.
+
+        Workers open the file themselves unless the document has unsaved
+        changes; then the page is rendered here, just before it is
+        submitted.
+
+        Args:
+            page: PyMuPDF Page object
+
+        Returns:
+            Source argument for _ocr_page()
+        """
+        doc = page.parent
+        if not doc.is_dirty and doc.name and os.path.exists(doc.name):
+            return doc.name
+        pix = page.get_pixmap(dpi=self.dpi, colorspace=fitz.csGRAY)
+        return pix.samples, pix.width, pix.height, tuple(page.derotation_matrix)
+
+    def _result(self, page_index, text, words, skipped=False, cached=False):
+        """Build the result of a page.
+
+        Args:
+            page_index (int): Index of the page
+            text (str): Text of the page
+            words (list): Word tuples with bounding boxes
+            skipped (bool, optional): The page has a text layer and was not OCRed
+            cached (bool, optional): The result came from the OCR cache
+
+        Returns:
+            dict: 'page', 'text', 'words', 'skipped' and 'cached' entries
+        """
+        return {"page": page_index, "text": text, "words": words,
+                "skipped": skipped, "cached": cached}
+
+    def recognize_pages(self, doc, page_indices=None, skip_text_pages=True,
+                        progress_callback=None):
+        """Run OCR on pages of a document.
+
+        Pages with a text layer are skipped unless skip_text_pages is
+        False; their result holds the existing text and no words. Cached
+        results are returned without running Tesseract.
+
+        Args:
+            doc: PyMuPDF Document object
+            page_indices (list, optional): Pages to recognize. Defaults to all pages.
+            skip_text_pages (bool, optional): Skip pages that have a text layer. Defaults to True.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+
+        Returns:
+            list: Result dicts in page order, see _result()
+
+        Raises:
+            RuntimeError: If Tesseract is not installed and pages need OCR
+        """
+        if page_indices is None:
+            page_indices = range(len(doc))
+        page_indices = list(page_indices)
+        total = len(page_indices)
+        results = {}
+        pending = {}  # page_index -> fingerprint
+
+        for page_index in page_indices:
+            page = doc[page_index]
+            if skip_text_pages and has_text_layer(page):
+                results[page_index] = self._result(page_index, page.get_text(), [], skipped=True)
+                continue
+            fingerprint = page_fingerprint(page, self.dpi, self.language)
+            cached = self.cache.read(fingerprint) if self.cache else None
+            if cached is not None:
+                results[page_index] = self._result(page_index, cached["text"], cached["words"],
+                                                   cached=True)
+            else:
+                pending[page_index] = fingerprint
+
+        done = len(results)
+        if progress_callback and done:
+            progress_callback(done, total)
+
+        if pending:
+            if not is_ocr_available():
+                raise RuntimeError("OCR requires pytesseract and the Tesseract program")
+
+            workers = min(self.max_workers, len(pending))
+            # spawn: forking a process that runs Qt threads is not safe
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=_init_ocr_worker)
+            queue = iter(pending)
+            running = set()
+            try:
+                while True:
+                    # Sayfalar gönderilirken çizilir, hepsi birden değil
+                    for page_index in itertools.islice(
+                            queue, workers * MAX_PENDING_PER_WORKER - len(running)):
+                        running.add(executor.submit(_ocr_page, self._page_source(doc[page_index]),
+                                                    page_index, self.dpi, self.language))
+                    if not running:
+                        break
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for task in finished:
+                        page_index, text, words = task.result()
+                        if self.cache:
+                            self.cache.write(pending[page_index], text, words)
+                        results[page_index] = self._result(page_index, text, words)
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, total)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if self.cache:
+                self.cache.cleanup_in_background()
+
+        return [results[page_index] for page_index in page_indices]
@@ -0,0 +1,123 @@
+"""
+Page ranges processed in worker processes.
+
+PyMuPDF holds the GIL, so long jobs over many pages (text extraction,
+splitting) run in a pool of worker processes, each handling a chunk of
+the page range. This module has no GUI dependencies, so it can be used
+by the command line tools as well.
+"""
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Paralel çıkarımda bir işçiye tek seferde verilen en fazla sayfa sayısı
+MAX_CHUNK_PAGES = 64
+
+# Longest time between two progress updates while workers are busy (s)
+PROGRESS_INTERVAL = 0.1
+
+# Worker process state: queue finished pages are reported to
+_progress_queue = None
+
+
+def page_chunks(start_page, end_page, workers, max_chunk=MAX_CHUNK_PAGES):
+    """Split a page range into chunks for parallel processing.
+
+    Every worker gets several chunks, so that workers finishing early can
+    take over work and progress is reported regularly.
+
+    Args:
+        start_page (int): First page index
+        end_page (int): Page index after the last page
+        workers (int): Number of worker processes
+        max_chunk (int, optional): Maximum pages per chunk
+
+    Returns:
+        list: (start, end) tuples covering the range in order
+    """
+    page_count = end_page - start_page
+    chunk = max(1, min(max_chunk, page_count // (workers * 4) or 1))
+    return [(start, min(start + chunk, end_page)) for start in range(start_page, end_page, chunk)]
+
+
+def _init_worker(progress_queue):
+    """Remember where a worker process reports its progress.
+
+    Args:
+        progress_queue: Queue of finished page counts, or None
+    """
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def report_progress(count=1):
+    """Report finished pages from a function run by iter_chunk_results().
+
+    Does nothing outside the worker processes or if nobody follows the
+    progress.
+
+    Args:
+        count (int, optional): Number of pages finished. Defaults to 1.
+    """
+    if _progress_queue is not None:
+        _progress_queue.put(count)
+
+
+def iter_chunk_results(chunks, workers, function, *args, progress_callback=None,
+                       chunk_callback=None):
+    """Run a function on page chunks in worker processes and yield results in page order.
+
+    Args:
+        chunks (list): (start, end) page ranges, see page_chunks()
+        workers (int): Number of worker processes
+        function (callable): Picklable function called as function(*args, start, end)
+            and returning (start, list of per-page results). It should call
+            report_progress() after every page.
+        *args: Leading arguments of function
+        progress_callback (callable, optional): Called with (pages_done, total_pages)
+            at most every PROGRESS_INTERVAL seconds as pages are reported by the
+            workers, or per finished chunk if function does not report pages
+        chunk_callback (callable, optional): Called with (start, results) as soon as
+            a chunk is finished, in completion order. Unlike the yielded results,
+            this includes chunks waiting for earlier ones if iteration fails.
+
+    Yields:
+        tuple: (page_num, result)
+    """
+    total = sum(end - start for start, end in chunks)
+    # spawn: forking a process that runs Qt threads is not safe
+    context = multiprocessing.get_context("spawn")
+    progress_queue = context.SimpleQueue() if progress_callback else None
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context,
+                                   initializer=_init_worker, initargs=(progress_queue,))
+    try:
+        pending = {executor.submit(function, *args, start, end) for start, end in chunks}
+        finished = {}  # start page -> results of chunks that arrived early
+        next_page = chunks[0][0] if chunks else 0
+        reported = 0  # pages reported by the workers
+        completed = 0  # pages of finished chunks
+        done = 0
+        while pending:
+            finished_tasks, pending = wait(pending, timeout=PROGRESS_INTERVAL,
+                                           return_when=FIRST_COMPLETED)
+            for task in finished_tasks:
+                chunk_start, results = task.result()
+                finished[chunk_start] = results
+                completed += len(results)
+                if chunk_callback:
+                    chunk_callback(chunk_start, results)
+
+            if progress_callback:
+                while not progress_queue.empty():
+                    reported += progress_queue.get()
+                if max(reported, completed) > done:
+                    done = min(max(reported, completed), total)
+                    progress_callback(done, total)
+
+            while next_page in finished:
+                results = finished.pop(next_page)
+                for offset, result in enumerate(results):
+                    yield next_page + offset, result
+                next_page += len(results)
+    finally:
+        # Also stops the workers if the caller stops iterating early
+        executor.shutdown(wait=False, cancel_futures=True)
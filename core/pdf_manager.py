@@ -7,20 +7,262 @@ import tempfile
 import shutil
 import logging
 import time
-from contextlib import contextmanager
+import bisect
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+
+from .image_conversion import pixmap_to_qimage, qimage_from_samples
+from .ocr import (OCRCache, OCREngine, apply_text_layers, DEFAULT_OCR_DPI, DEFAULT_OCR_LANGUAGE,
+                  OCR_CACHE_DIR_NAME)
+from .render_pool import RenderPool
+from .render_profiles import get_render_profile, pixmap_options
+from .text_index import TextIndex, INDEX_FILE_NAME
+from .thumbnail_cache import ThumbnailCache, file_fingerprint
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Varsayılan render önbelleği boyutu (byte)
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Varsayılan TextPage önbelleği boyutu (byte)
+DEFAULT_TEXTPAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Estimated memory of a parsed TextPage: about 80 bytes per character of
+# a text-heavy page. Measuring the text would mean extracting it, which
+# costs as much as parsing the page.
+TEXTPAGE_ENTRY_BYTES = 256 * 1024
+
+
+class RenderCache:
+    """Thread-safe LRU cache for rendered page images with a byte budget.
+
+    It is also used for other per-page data, such as parsed text pages.
+
+    Keys are tuples whose first element is the page index, so that all
+    entries of a page can be dropped at once when the page is mutated.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        """Initialize the render cache.
+
+        Args:
+            max_bytes (int, optional): Maximum total size of cached entries in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Get a cached entry and mark it as recently used.
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            object: Cached value or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """Store an entry, evicting least recently used entries if needed.
+
+        Args:
+            key (tuple): Cache key
+            value (object): Value to cache
+            size (int): Size of the value in bytes
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def _evict(self):
+        """Evict least recently used entries until the budget is met."""
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        """Change the byte budget of the cache.
+
+        Args:
+            max_bytes (int): New maximum size in bytes
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def invalidate_page(self, page_index):
+        """Drop all entries of a page.
+
+        Args:
+            page_index (int): Index of the page
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == page_index]:
+                _, size = self._entries.pop(key)
+                self.current_bytes -= size
+
+    def remap_pages(self, page_map):
+        """Move entries to new page indices after pages were removed or moved.
+
+        Args:
+            page_map (callable): Function mapping an old page index to its new
+                index, or to None if the page no longer exists
+        """
+        with self._lock:
+            entries = OrderedDict()
+            for key, (value, size) in self._entries.items():
+                new_index = page_map(key[0])
+                if new_index is None:
+                    self.current_bytes -= size
+                else:
+                    entries[(new_index,) + key[1:]] = (value, size)
+            self._entries = entries
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: Hit, miss and eviction counters and current usage
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        """Get the number of cached entries."""
+        return len(self._entries)
+
+
+class DocumentChange:
+    """Description of a change to the open document, passed to change listeners.
+
+    Attributes:
+        kind (str): INSERTED, REMOVED, MOVED or MODIFIED
+        pages (list): Affected pages, sorted. New indices of inserted and
+            modified pages, old indices of removed pages, and
+            [old_index, new_index] of a moved page.
+        revision (int): Document revision after the change
+    """
+
+    INSERTED = "inserted"
+    REMOVED = "removed"
+    MOVED = "moved"
+    MODIFIED = "modified"
+
+    def __init__(self, kind, pages, revision):
+        """Initialize the change.
+
+        Args:
+            kind (str): Kind of the change
+            pages (list): Affected pages, see the class attributes
+            revision (int): Document revision after the change
+        """
+        self.kind = kind
+        self.pages = list(pages)
+        self.revision = revision
+
+    @property
+    def is_structural(self):
+        """bool: Whether page indices changed."""
+        return self.kind != self.MODIFIED
+
+    def map_page(self, page_index):
+        """Map a page index from before the change to after it.
+
+        Args:
+            page_index (int): Page index before the change
+
+        Returns:
+            int: Page index after the change, or None if the page was removed
+        """
+        if self.kind == self.INSERTED:
+            for inserted in self.pages:
+                if inserted <= page_index:
+                    page_index += 1
+            return page_index
+        if self.kind == self.REMOVED:
+            position = bisect.bisect_left(self.pages, page_index)
+            if position < len(self.pages) and self.pages[position] == page_index:
+                return None
+            return page_index - position
+        if self.kind == self.MOVED:
+            old_index, new_index = self.pages
+            if page_index == old_index:
+                return new_index
+            if old_index < page_index <= new_index:
+                return page_index - 1
+            if new_index <= page_index < old_index:
+                return page_index + 1
+        return page_index
+
+    def __repr__(self):
+        return f"DocumentChange({self.kind!r}, {self.pages!r}, revision={self.revision})"
+
+
 class PDFManager:
     """Class for managing PDF documents."""
 
-    def __init__(self):
-        """Initialize the PDF manager."""
+    def __init__(self, cache_bytes=DEFAULT_CACHE_BYTES, thumbnail_cache=None,
+                 thumbnail_profile="thumbnail"):
+        """Initialize the PDF manager.
+
+        Args:
+            cache_bytes (int, optional): Byte budget of the render cache.
+            thumbnail_cache (ThumbnailCache, optional): Disk cache for thumbnails.
+                Defaults to a cache in the user cache directory.
+            thumbnail_profile (RenderProfile or str, optional): Render profile of
+                thumbnails. Defaults to grayscale thumbnails of 120x160 pixels.
+        """
         self.doc = None
         self.file_path = None
         self.current_file = None
+        self.render_cache = RenderCache(cache_bytes)
+        self.textpage_cache = RenderCache(DEFAULT_TEXTPAGE_CACHE_BYTES)
+        self.revision = 0
+        self._page_revisions = {}
+        self._structure_revision = 0
+        self._change_listeners = []
+        self.render_pool = RenderPool()
+        self._source_generation = 0
+        self._page_sources = []  # Current page -> page in the file on disk, None if changed
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache()
+        self.thumbnail_profile = get_render_profile(thumbnail_profile)
+        self.fingerprint = None
+        self.text_index = None
 
     def open_pdf(self, file_path):
         """Open a PDF file.
@@ -35,8 +277,14 @@ class PDFManager:
             if self.doc:
                 self.close()
             self.doc = fitz.open(file_path)
+            self._reset_revisions()
             self.file_path = file_path
             self.current_file = file_path
+            self.fingerprint = file_fingerprint(file_path)
+            # Önceki oturumlarda oluşturulan index hemen kullanılabilir
+            if os.path.exists(self._text_index_path()):
+                self.get_text_index(build=False)
+            self.thumbnail_cache.cleanup_in_background()
             return True
         except Exception as e:
             logger.error(f"Error opening PDF: {e}")
@@ -65,6 +313,585 @@ class PDFManager:
             return self.doc[page_index]
         return None
 
+    def has_changes(self):
+        """Check whether the document has unsaved changes.
+
+        Returns:
+            bool: True if there are unsaved changes
+        """
+        return bool(self.doc) and self.doc.is_dirty
+
+    def add_change_listener(self, listener):
+        """Register a function called with a DocumentChange after every change.
+
+        Args:
+            listener (callable): Function taking a DocumentChange
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        """Unregister a change listener.
+
+        Args:
+            listener (callable): Function passed to add_change_listener()
+        """
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self, kind, pages):
+        """Inform the change listeners about a change.
+
+        Args:
+            kind (str): Kind of the change, see DocumentChange
+            pages (list): Affected pages, see DocumentChange
+        """
+        change = DocumentChange(kind, pages, self.revision)
+        self._update_page_sources(change)
+        if self.text_index:
+            self.text_index.apply_change(change)
+        for listener in list(self._change_listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                logger.error(f"Error in document change listener: {e}")
+
+    def _apply_structure_change(self, kind, pages):
+        """Move page revisions and cached renders after pages were inserted,
+        removed or moved, then inform the change listeners.
+
+        Args:
+            kind (str): Kind of the change, see DocumentChange
+            pages (list): Affected pages, see DocumentChange
+        """
+        change = DocumentChange(kind, pages, self.revision)
+        self.revision += 1
+        self._structure_revision += 1
+        self._page_revisions = {change.map_page(i): rev for i, rev in self._page_revisions.items()
+                                if change.map_page(i) is not None}
+        self.render_cache.remap_pages(change.map_page)
+        self.textpage_cache.remap_pages(change.map_page)
+        if kind == DocumentChange.INSERTED:
+            for page_index in pages:
+                self._page_revisions[page_index] = self.revision
+        self._notify_change(kind, pages)
+
+    def _reset_revisions(self):
+        """Forget all page revisions and cached renders."""
+        self.revision = 0
+        self._page_revisions = {}
+        self._structure_revision += 1
+        self.render_cache.clear()
+        self.textpage_cache.clear()
+        self._reset_render_source()
+        if self.text_index:
+            self.text_index.close()
+            self.text_index = None
+
+    def _text_index_path(self):
+        """Get the path of the text index of the open file.
+
+        Returns:
+            str: Path in the document's cache directory
+        """
+        return os.path.join(self.thumbnail_cache.document_dir(self.fingerprint), INDEX_FILE_NAME)
+
+    def get_text_index(self, build=True):
+        """Get the full-text index of the document, building it if needed.
+
+        The index is stored on disk under the file's fingerprint, so it is
+        only built the first time a file is searched. Pages changed since
+        opening the file are not indexed and are always searched directly.
+
+        Args:
+            build (bool, optional): Index all pages missing from the index.
+                With False the index is only opened, e.g. to be filled page
+                by page while searching. Defaults to True.
+
+        Returns:
+            TextIndex: Index of the document, or None if no file is open
+        """
+        if not self.doc or not self.fingerprint:
+            return None
+
+        try:
+            if self.text_index is None:
+                self.text_index = TextIndex(self._text_index_path(), len(self.doc))
+                if os.path.exists(self.text_index.db_path):
+                    os.utime(self.text_index.db_path)  # LRU temizliği için
+            if build:
+                self.text_index.update(self.doc)
+        except Exception as e:
+            logger.error(f"Error building text index: {e}")
+        return self.text_index
+
+    def _rebase_text_index(self, saved_path):
+        """Move the text index to the file that was just saved.
+
+        Args:
+            saved_path (str): Absolute path the document was saved to. The
+                index of the previous file is kept unless it was overwritten.
+        """
+        if self.text_index and self.fingerprint:
+            replaced = not self.file_path or os.path.abspath(self.file_path) == saved_path
+            try:
+                self.text_index = self.text_index.rebase(self._text_index_path(), self.doc,
+                                                         replaced)
+            except Exception as e:
+                logger.error(f"Error updating text index: {e}")
+                self.text_index = None
+
+    def get_page_revision(self, page_index):
+        """Get the revision of a page.
+
+        The revision changes every time the page is modified through the
+        manager, so it can be used as part of cache keys.
+
+        Args:
+            page_index (int): Index of the page
+
+        Returns:
+            int: Revision of the page
+        """
+        return self._page_revisions.get(page_index, 0)
+
+    def mark_page_modified(self, page_index):
+        """Record that a page was modified and drop its cached renders.
+
+        Call this after changing a page directly (e.g. adding annotations).
+
+        Args:
+            page_index (int): Index of the modified page
+        """
+        self.mark_pages_modified([page_index])
+
+    def mark_pages_modified(self, page_indices):
+        """Record that several pages were modified, as a single change.
+
+        Args:
+            page_indices (list): Indices of the modified pages
+        """
+        page_indices = sorted(page_indices)
+        if not page_indices:
+            return
+        self.revision += 1
+        for page_index in page_indices:
+            self._page_revisions[page_index] = self.revision
+            self.render_cache.invalidate_page(page_index)
+            self.textpage_cache.invalidate_page(page_index)
+        self._notify_change(DocumentChange.MODIFIED, page_indices)
+
+    def get_ocr_cache(self):
+        """Get the cache of OCR results, next to the thumbnail cache.
+
+        Returns:
+            OCRCache: Cache in the directory of thumbnail_cache
+        """
+        return OCRCache(os.path.join(self.thumbnail_cache.cache_dir, OCR_CACHE_DIR_NAME))
+
+    def add_ocr_text_layer(self, page_indices=None, dpi=DEFAULT_OCR_DPI,
+                           language=DEFAULT_OCR_LANGUAGE, workers=None, progress_callback=None):
+        """Run OCR on scanned pages and embed the text as an invisible layer.
+
+        All pages are recognized first and then written in one pass,
+        followed by a single change notification. Pages that already have
+        a text layer are skipped. Afterwards the pages are searchable and
+        extractable without OCR; save the document to keep the layer.
+        Results are cached in the directory of thumbnail_cache.
+
+        Args:
+            page_indices (list, optional): Pages to process. Defaults to all pages.
+            dpi (int, optional): Resolution pages are rendered at. Defaults to 300.
+            language (str, optional): Tesseract language(s). Defaults to "eng".
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            progress_callback (callable, optional): Called with (pages_done, total_pages)
+                while recognizing
+
+        Returns:
+            list: Indices of the pages that received a text layer,
+                or None if OCR failed
+        """
+        if not self.doc:
+            return None
+
+        try:
+            engine = OCREngine(dpi, language, max_workers=workers, cache=self.get_ocr_cache())
+            results = engine.recognize_pages(self.doc, page_indices,
+                                             progress_callback=progress_callback)
+            changed = apply_text_layers(self.doc, results)
+        except Exception as e:
+            logger.error(f"Error adding OCR text layer: {e}")
+            return None
+
+        self.mark_pages_modified(changed)
+        return changed
+
+    def rotate_page(self, page_index, angle):
+        """Rotate a page by the given angle.
+
+        Args:
+            page_index (int): Index of the page to rotate
+            angle (int): Rotation angle in degrees, a multiple of 90
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.doc or not (0 <= page_index < len(self.doc)) or angle % 90:
+            return False
+
+        try:
+            page = self.doc[page_index]
+            page.set_rotation((page.rotation + angle) % 360)
+            self.mark_page_modified(page_index)
+            return True
+        except Exception as e:
+            logger.error(f"Error rotating page {page_index}: {e}")
+            return False
+
+    def add_page(self, width=595, height=842):
+        """Append a blank page to the PDF.
+
+        Args:
+            width (float, optional): Page width in points. Defaults to A4 width.
+            height (float, optional): Page height in points. Defaults to A4 height.
+
+        Returns:
+            int: Index of the new page or -1 if failed
+        """
+        if not self.doc:
+            return -1
+
+        try:
+            self.doc.new_page(-1, width=width, height=height)
+            page_index = len(self.doc) - 1
+            self._apply_structure_change(DocumentChange.INSERTED, [page_index])
+            return page_index
+        except Exception as e:
+            logger.error(f"Error adding page: {e}")
+            return -1
+
+    def set_cache_limit(self, max_bytes):
+        """Set the byte budget of the render cache.
+
+        Args:
+            max_bytes (int): Maximum size of the render cache in bytes
+        """
+        self.render_cache.set_max_bytes(max_bytes)
+
+    def get_cache_stats(self):
+        """Get render cache statistics.
+
+        Returns:
+            dict: Hit, miss and eviction counters and current usage
+        """
+        return self.render_cache.stats()
+
+    def get_textpage(self, page_index, flags=fitz.TEXTFLAGS_TEXT):
+        """Get the parsed text of a page, using the TextPage cache.
+
+        Text extraction, search and text selection all work on a
+        TextPage; sharing them avoids parsing the page content again for
+        every call. Entries are dropped when the page is modified.
+
+        Args:
+            page_index (int): Index of the page
+            flags (int, optional): Text extraction flags, e.g.
+                fitz.TEXTFLAGS_SEARCH for search. Defaults to fitz.TEXTFLAGS_TEXT.
+
+        Returns:
+            fitz.TextPage: Parsed text page or None if invalid
+        """
+        if not self.doc or not (0 <= page_index < len(self.doc)):
+            return None
+
+        key = (page_index, flags, self.get_page_revision(page_index))
+        textpage = self.textpage_cache.get(key)
+        if textpage is None:
+            textpage = self.doc[page_index].get_textpage(flags=flags)
+            self.textpage_cache.put(key, textpage, TEXTPAGE_ENTRY_BYTES)
+        return textpage
+
+    @staticmethod
+    def _zoom_bucket(zoom):
+        """Round a zoom factor to the nearest percent used for caching.
+
+        Args:
+            zoom (float): Zoom factor
+
+        Returns:
+            int: Zoom bucket in percent
+        """
+        return max(1, round(zoom * 100))
+
+    def _render_key(self, page_index, zoom, clip=None, profile=None):
+        """Build the render cache key of a page at a zoom factor.
+
+        Args:
+            page_index (int): Index of the page
+            zoom (float): Zoom factor, replaced by the profile's resolution if it fixes one
+            clip (tuple, optional): Rendered part of the page, in page coordinates
+            profile (RenderProfile or str, optional): Render profile. Defaults to RGB.
+
+        Returns:
+            tuple: (page_index, zoom_bucket, rotation, revision, clip, color_mode)
+        """
+        page = self.doc[page_index]
+        profile = get_render_profile(profile)
+        if clip is not None:
+            clip = tuple(round(value, 1) for value in clip)
+        return (page_index, self._zoom_bucket(profile.get_zoom(page, zoom)), page.rotation,
+                self.get_page_revision(page_index), clip, profile.mode)
+
+    def get_page_image(self, page_index, zoom=1.0, clip=None, profile=None):
+        """Get a rendered image of a page, using the render cache.
+
+        The page is rendered at the zoom factor rounded to the nearest
+        percent, so that nearby zoom levels share cache entries.
+
+        Args:
+            page_index (int): Index of the page to render
+            zoom (float, optional): Zoom factor for rendering. Defaults to 1.0.
+            clip (tuple, optional): Only render this part of the page, given in
+                page coordinates. Keeps the render small for large pages at high zoom.
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one. Defaults to RGB at the given zoom.
+
+        Returns:
+            QImage: Rendered page or None if invalid
+        """
+        if not self.doc or not (0 <= page_index < len(self.doc)):
+            return None
+
+        try:
+            key = self._render_key(page_index, zoom, clip, profile)
+            img = self.render_cache.get(key)
+            if img is not None:
+                return img
+
+            # Render page to pixmap
+            bucket = key[1]
+            matrix = fitz.Matrix(bucket / 100, bucket / 100)
+            pix = self.doc[page_index].get_pixmap(matrix=matrix, clip=key[4],
+                                                  **pixmap_options(key[5]))
+            img = pixmap_to_qimage(pix)
+            self.render_cache.put(key, img, img.sizeInBytes())
+            return img
+        except Exception as e:
+            logger.error(f"Error rendering page {page_index}: {e}")
+            return None
+
+    def get_thumbnail_zoom(self, page_index):
+        """Get the zoom factor that fits a page into the thumbnail size.
+
+        Args:
+            page_index (int): Index of the page
+
+        Returns:
+            float: Zoom factor of the thumbnail profile, 120x160 by default
+        """
+        return self.thumbnail_profile.get_zoom(self.doc[page_index])
+
+    def _reset_render_source(self):
+        """Make render workers open the document file again, e.g. after saving."""
+        self._source_generation += 1
+        self._page_sources = list(range(len(self.doc))) if self.doc else []
+
+    def _update_page_sources(self, change):
+        """Follow a change in the map of current pages to pages on disk.
+
+        Args:
+            change: DocumentChange describing the affected pages
+        """
+        if change.kind == DocumentChange.MODIFIED:
+            for page_index in change.pages:
+                if page_index < len(self._page_sources):
+                    self._page_sources[page_index] = None
+            return
+
+        sources = [None] * (len(self.doc) if self.doc else 0)
+        for page_index, source in enumerate(self._page_sources):
+            new_index = change.map_page(page_index)
+            if new_index is not None and new_index < len(sources):
+                sources[new_index] = source
+        self._page_sources = sources
+
+    def _get_render_source(self, page_index):
+        """Get where render workers can find a page of the open document.
+
+        Workers open the file on disk. Pages that are unchanged since the
+        last save are rendered from there even while the document has
+        unsaved changes, at their page index in the file.
+
+        Args:
+            page_index (int): Index of the page in the open document
+
+        Returns:
+            tuple: ((path, generation), page index in the file), or None if
+                the page only exists in memory and must be rendered in-process
+        """
+        path = self.doc.name
+        if not path or not os.path.exists(path) or len(self._page_sources) != len(self.doc):
+            return None
+        if not self.doc.is_dirty:
+            return (path, self._source_generation), page_index
+        source = self._page_sources[page_index]
+        if source is None:
+            return None
+        return (path, self._source_generation), source
+
+    def render_page_async(self, page_index, zoom=1.0, clip=None, profile=None):
+        """Render a page in a background worker process.
+
+        Cached renders are returned as an already completed future. The
+        result is stored in the render cache when it arrives.
+
+        Args:
+            page_index (int): Index of the page to render
+            zoom (float, optional): Zoom factor for rendering. Defaults to 1.0.
+            clip (tuple, optional): Only render this part of the page, given in
+                page coordinates
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one. Defaults to RGB at the given zoom.
+
+        Returns:
+            Future: Future resolving to a QImage, or None if the page is invalid.
+                Cancel it with cancel_render() when the result is no longer needed.
+        """
+        if not self.doc or not (0 <= page_index < len(self.doc)):
+            return None
+        return self._render_async(page_index, zoom, clip=clip, profile=profile)
+
+    def _thumbnail_cache_path(self, key):
+        """Get the disk cache path of a render, if it can be cached on disk.
+
+        Only renders of the document as saved on disk are cached, since
+        entries are keyed by the fingerprint of the file.
+
+        Args:
+            key (tuple): Render cache key
+
+        Returns:
+            str: Entry path or None if the render must not be cached on disk
+        """
+        if (not self.fingerprint or self.doc.is_dirty or not self.file_path
+                or os.path.abspath(self.doc.name) != os.path.abspath(self.file_path)):
+            return None
+        page_index, zoom_bucket, rotation, _, clip, mode = key
+        if clip is not None:
+            return None
+        return self.thumbnail_cache.entry_path(self.fingerprint, page_index, zoom_bucket,
+                                               rotation, mode)
+
+    def _render_async(self, page_index, zoom, use_disk_cache=False, clip=None, profile=None):
+        """Render a page in the background, consulting the caches first.
+
+        Args:
+            page_index (int): Index of the page to render
+            zoom (float): Zoom factor for rendering
+            use_disk_cache (bool, optional): Read and write the thumbnail disk cache
+            clip (tuple, optional): Part of the page to render, in page coordinates
+            profile (RenderProfile or str, optional): Render profile. Defaults to RGB.
+
+        Returns:
+            Future: Future resolving to a QImage
+        """
+        result = Future()
+        key = self._render_key(page_index, zoom, clip, profile)
+        structure_revision = self._structure_revision
+        img = self.render_cache.get(key)
+        if img is not None:
+            result.set_result(img)
+            return result
+
+        cache_path = self._thumbnail_cache_path(key) if use_disk_cache else None
+        if cache_path:
+            data = self.thumbnail_cache.read(cache_path)
+            if data:
+                from PyQt6.QtGui import QImage
+                img = QImage.fromData(data, "PNG")
+                if not img.isNull():
+                    self.render_cache.put(key, img, img.sizeInBytes())
+                    result.set_result(img)
+                    return result
+
+        render_source = self._get_render_source(page_index)
+        if render_source is None:
+            # Değişen sayfalar bir sonraki kaydetmeye kadar süreç içinde çizilir
+            img = self.get_page_image(page_index, zoom, clip, profile)
+            if img is not None:
+                result.set_result(img)
+            else:
+                result.set_exception(RuntimeError(f"Page {page_index} could not be rendered"))
+            return result
+
+        try:
+            source, source_page = render_source
+            task = self.render_pool.submit(source, source_page, key[1] / 100, cache_path,
+                                           key[4], key[5])
+        except Exception as e:
+            logger.error(f"Error starting render of page {page_index}: {e}")
+            result.set_exception(e)
+            return result
+
+        def on_task_done(task):
+            if result.cancelled():
+                return
+            try:
+                if task.cancelled():
+                    result.cancel()
+                    return
+                img = qimage_from_samples(*task.result())
+                # Page indices in the key are outdated if pages moved meanwhile
+                if structure_revision == self._structure_revision:
+                    self.render_cache.put(key, img, img.sizeInBytes())
+                result.set_result(img)
+            except InvalidStateError:
+                pass  # Cancelled while converting
+            except Exception as e:
+                logger.error(f"Error rendering page {page_index}: {e}")
+                try:
+                    result.set_exception(e)
+                except InvalidStateError:
+                    pass
+
+        def on_result_done(result):
+            if result.cancelled():
+                task.cancel()
+
+        result.add_done_callback(on_result_done)
+        task.add_done_callback(on_task_done)
+        return result
+
+    def render_thumbnail_async(self, page_index):
+        """Render a page thumbnail in a background worker process.
+
+        Thumbnails are rendered with thumbnail_profile. Thumbnails of
+        unmodified documents are read from and written to the persistent
+        thumbnail cache, so reopening a file is cheap.
+
+        Args:
+            page_index (int): Index of the page
+
+        Returns:
+            Future: Future resolving to a QImage, or None if the page is invalid
+        """
+        if not self.doc or not (0 <= page_index < len(self.doc)):
+            return None
+        return self._render_async(page_index, 1.0, use_disk_cache=True,
+                                  profile=self.thumbnail_profile)
+
+    def cancel_render(self, future):
+        """Cancel a pending background render.
+
+        Renders that already started in a worker finish, but their result
+        is discarded.
+
+        Args:
+            future (Future): Future returned by render_page_async()
+        """
+        if future is not None:
+            future.cancel()
+
     def get_page_thumbnail(self, page_index):
         """Get a thumbnail of a specific page.
 
@@ -78,27 +905,23 @@ class PDFManager:
             return None
 
         try:
-            from PyQt6.QtGui import QPixmap, QImage
-            page = self.doc[page_index]
-            # Set zoom matrix for thumbnail size (120x160 target size)
-            zoom = min(120 / page.rect.width, 160 / page.rect.height)
-            matrix = fitz.Matrix(zoom, zoom)
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=matrix)
-            # Convert to QImage then QPixmap
-            img = QImage(pix.samples, pix.width, pix.height,
-                        pix.stride, QImage.Format.Format_RGB888)
-            return QPixmap.fromImage(img)
+            from PyQt6.QtGui import QPixmap
+            img = self.get_page_image(page_index, profile=self.thumbnail_profile)
+            return QPixmap.fromImage(img) if img is not None else None
         except Exception as e:
             logger.error(f"Error generating thumbnail for page {page_index}: {e}")
             return None
 
-    def get_page_pixmap(self, page_index, zoom=1.0):
+    def get_page_pixmap(self, page_index, zoom=1.0, clip=None, profile=None):
         """Get a full resolution pixmap of a specific page.
 
         Args:
             page_index (int): Index of the page to get pixmap for
             zoom (float, optional): Zoom factor for rendering. Defaults to 1.0.
+            clip (tuple, optional): Only render this part of the page, given in
+                page coordinates
+            profile (RenderProfile or str, optional): Colorspace, and resolution
+                if the profile fixes one. Defaults to RGB at the given zoom.
 
         Returns:
             QPixmap: Full resolution pixmap of the page or None if invalid
@@ -107,34 +930,13 @@ class PDFManager:
             return None
 
         try:
-            from PyQt6.QtGui import QPixmap, QImage
-            page = self.doc[page_index]
-            # Create matrix with zoom factor
-            matrix = fitz.Matrix(zoom, zoom)
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=matrix)
-            # Convert to QImage then QPixmap
-            img = QImage(pix.samples, pix.width, pix.height,
-                        pix.stride, QImage.Format.Format_RGB888)
-            return QPixmap.fromImage(img)
+            from PyQt6.QtGui import QPixmap
+            img = self.get_page_image(page_index, zoom, clip, profile)
+            return QPixmap.fromImage(img) if img is not None else None
         except Exception as e:
             logger.error(f"Error generating pixmap for page {page_index}: {e}")
             return None
 
-    @contextmanager
-    def _create_temp_doc(self):
-        """Context manager to create a temporary document and handle cleanup.
-
-        Yields:
-            fitz.Document: A new temporary PDF document
-        """
-        temp_doc = fitz.open()
-        try:
-            yield temp_doc
-        finally:
-            if temp_doc:
-                temp_doc.close()
-
     def delete_page(self, page_index):
         """Delete a page from the PDF.
 
@@ -144,40 +946,109 @@ class PDFManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.doc or not (0 <= page_index < len(self.doc)):
+        return self.delete_pages([page_index])
+
+    def delete_pages(self, page_indices):
+        """Delete several pages from the PDF in place.
+
+        The open document is modified directly, so unsaved changes are
+        kept. Cached renders of the remaining pages are moved to their new
+        page indices instead of being discarded.
+
+        Args:
+            page_indices (list): Indices of the pages to delete
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.doc:
+            return False
+
+        indices = sorted(set(page_indices))
+        if not indices or indices[0] < 0 or indices[-1] >= len(self.doc):
+            return False
+        if len(indices) == len(self.doc):
+            logger.error("Error deleting pages: a PDF must keep at least one page")
             return False
 
         try:
-            # Create a new document without the specified page
-            with self._create_temp_doc() as new_doc:
-                for i in range(len(self.doc)):
-                    if i != page_index:
-                        new_doc.insert_pdf(self.doc, from_page=i, to_page=i)
-
-                # Save to a temporary file
-                temp_fd, temp_path = tempfile.mkstemp(suffix=".pdf")
-                os.close(temp_fd)
-                new_doc.save(temp_path)
-
-            # Close the current document
-            self.doc.close()
+            self.doc.delete_pages(indices)
+        except Exception as e:
+            logger.error(f"Error deleting pages: {e}")
+            return False
+
+        self._apply_structure_change(DocumentChange.REMOVED, indices)
+        return True
 
-            # Open the new document
-            self.doc = fitz.open(temp_path)
+    def move_page(self, page_index, to_index):
+        """Move a page to a new position.
 
-            # Clean up the temporary file
-            os.unlink(temp_path)
+        Args:
+            page_index (int): Index of the page to move
+            to_index (int): Index the page has after the move
 
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.doc:
+            return False
+
+        page_count = len(self.doc)
+        if not (0 <= page_index < page_count and 0 <= to_index < page_count):
+            return False
+        if page_index == to_index:
             return True
+
+        try:
+            # fitz inserts the page in front of 'to'; -1 appends it
+            if to_index < page_index:
+                self.doc.move_page(page_index, to_index)
+            else:
+                self.doc.move_page(page_index, to_index + 1 if to_index + 1 < page_count else -1)
         except Exception as e:
-            logger.error(f"Error deleting page: {e}")
+            logger.error(f"Error moving page {page_index}: {e}")
+            return False
+
+        self._apply_structure_change(DocumentChange.MOVED, [page_index, to_index])
+        return True
+
+    def _save_incremental(self, path):
+        """Append the changed objects to the file the document was opened from.
+
+        Args:
+            path (str): Absolute target path
+
+        Returns:
+            bool: True if the document was saved, False if a full save is needed
+        """
+        if os.path.abspath(self.doc.name) != path or not self.doc.can_save_incrementally():
             return False
 
-    def save_pdf(self, save_path=None):
+        try:
+            self.doc.save(path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        except Exception as e:
+            logger.warning(f"Artımlı kaydetme başarısız, tam kaydetme deneniyor: {e}")
+            return False
+
+        # Dosya değişti, render işçileri belgeyi yeniden açmalı
+        self._reset_render_source()
+        self.fingerprint = file_fingerprint(path)
+        self._rebase_text_index(path)
+        return True
+
+    def save_pdf(self, save_path=None, optimize=False):
         """Save the PDF to a file.
 
+        When saving over the original file, only the changed objects are
+        appended to it (incremental save), which is fast even for very
+        large files. Saving to another path, or with optimize=True, writes
+        the whole file again.
+
         Args:
             save_path (str, optional): Path to save the PDF. If None, uses the original path.
+            optimize (bool, optional): Rewrite the whole file with garbage
+                collection, compression and content cleanup ("Optimize and
+                save"). Defaults to False.
 
         Returns:
             bool: True if successful, False otherwise
@@ -189,19 +1060,26 @@ class PDFManager:
             path = save_path if save_path else self.file_path
             current_path = os.path.abspath(path)
 
+            if not optimize and self._save_incremental(current_path):
+                if save_path:
+                    self.file_path = save_path
+                return True
+
+            if optimize:
+                # garbage=4: agresif PDF temizleme (xref tablosunu yeniden oluşturur)
+                # deflate=True: içeriği sıkıştırır ve dosya boyutunu küçültür
+                save_options = {'garbage': 4, 'deflate': True, 'clean': True}
+            else:
+                # garbage=1: yalnızca kullanılmayan nesneleri kaldır (hızlı)
+                save_options = {'garbage': 1}
+
             # Create a temporary file
             fd, temp_path = tempfile.mkstemp(suffix=".pdf")
             os.close(fd)
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> feature/v2-pyqt
             try:
-                # Save to the temporary file with cleanup options
-                # garbage=4: agresif PDF temizleme (xref tablosunu yeniden oluşturur)
-                # deflate=True: içeriği sıkıştırır ve dosya boyutunu küçültür
-                self.doc.save(temp_path, garbage=4, deflate=True, clean=True)
+                # Save to the temporary file
+                self.doc.save(temp_path, **save_options)
             except Exception as e:
                 logger.warning(f"PDF kaydetme hatası, onarım deneniyor: {e}")
                 # Onarım için yeni bir belge oluşturup sayfaları kopyalama
@@ -219,21 +1097,13 @@ class PDFManager:
                     if os.path.exists(temp_path):
                         os.unlink(temp_path)
                     raise repair_error
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> feature/v2-pyqt
             # Hedef dosya yolunu kontrol et
             if os.path.exists(current_path):
                 # Dosya zaten varsa, yedek oluştur
                 backup_fd, backup_path = tempfile.mkstemp(suffix=".pdf.bak")
                 os.close(backup_fd)
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> feature/v2-pyqt
                 # Yedekleme işlemi - dosya kullanımda hatası için yeniden deneme
                 max_attempts = 3
                 for attempt in range(max_attempts):
@@ -253,25 +1123,15 @@ class PDFManager:
                             return False
             else:
                 backup_path = None
-<<<<<<< HEAD
-            
-            try:
-                # Belgeyi kapatmadan önce referansını saklayalım
-                doc_path = self.doc.name
-                
-                # Belgeyi şimdi kapatıyoruz
-                self.doc.close()
-                
-=======
 
             try:
                 # Belgeyi kapatmadan önce referansını saklayalım
                 doc_path = self.doc.name
 
-                # Belgeyi şimdi kapatıyoruz
+                # Belgeyi şimdi kapatıyoruz (metin sayfaları belgeye ait)
+                self.textpage_cache.clear()
                 self.doc.close()
 
->>>>>>> feature/v2-pyqt
                 # Hedef dosyaya taşıma - dosya kullanımda hatası için yeniden deneme
                 max_attempts = 3
                 for attempt in range(max_attempts):
@@ -288,11 +1148,7 @@ class PDFManager:
                                 temp_path = alt_path
                                 # Dosya kullanımda uyarısı
                                 logger.warning(f"Hedef dosya kullanımda, alternatif kaydetme: {alt_path}")
-<<<<<<< HEAD
-                        
-=======
 
->>>>>>> feature/v2-pyqt
                         # Geçici dosyayı hedefe taşı
                         shutil.move(temp_path, current_path)
                         break
@@ -305,31 +1161,24 @@ class PDFManager:
                             # Yedek varsa geri yükle
                             if backup_path and os.path.exists(backup_path):
                                 self.doc = fitz.open(backup_path)
+                                self._reset_revisions()
                                 if os.path.exists(temp_path):
                                     os.unlink(temp_path)
                             return False
-<<<<<<< HEAD
-                
-                # Belgeyi yeniden aç
-                self.doc = fitz.open(current_path)
-                
-=======
 
                 # Belgeyi yeniden aç
                 self.doc = fitz.open(current_path)
+                self._reset_render_source()
+                self.fingerprint = file_fingerprint(current_path)
+                self._rebase_text_index(current_path)
 
->>>>>>> feature/v2-pyqt
                 # İşlem başarılıysa yedeği sil
                 if backup_path and os.path.exists(backup_path):
                     try:
                         os.unlink(backup_path)
                     except:
                         pass  # Yedek silinmezse önemli değil
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> feature/v2-pyqt
                 if save_path:  # Update file path if saving to a new location
                     self.file_path = save_path
 
@@ -343,22 +1192,15 @@ class PDFManager:
                         shutil.move(backup_path, current_path)
                     except:
                         logger.error(f"Yedek geri yükleme hatası: {e}")
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> feature/v2-pyqt
                 # Orijinal belgeyi yeniden açmayı dene
                 if self.file_path:
                     try:
                         self.doc = fitz.open(self.file_path)
+                        self._reset_revisions()
                     except Exception as reopen_error:
                         logger.error(f"Orijinal belgeyi yeniden açma hatası: {reopen_error}")
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> feature/v2-pyqt
                 # Geçici dosyaları temizle
                 for path in [temp_path, backup_path]:
                     if path and os.path.exists(path):
@@ -366,11 +1208,7 @@ class PDFManager:
                             os.unlink(path)
                         except:
                             pass
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> feature/v2-pyqt
                 raise e
 
         except Exception as e:
@@ -380,7 +1218,10 @@ class PDFManager:
     def close(self):
         """Close the current PDF document."""
         if self.doc:
+            self.textpage_cache.clear()
             self.doc.close()
             self.doc = None
             self.file_path = None
-            self.current_file = None
\ No newline at end of file
+            self.current_file = None
+            self.fingerprint = None
+            self._reset_revisions()
\ No newline at end of file
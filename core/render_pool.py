@@ -0,0 +1,144 @@
+"""
+Background page rendering in worker processes.
+
+PyMuPDF holds the GIL while rendering, so rendering in a thread would
+still freeze the Qt event loop. Pages are therefore rendered in a pool of
+worker processes, each keeping its own fitz.Document handle open.
+"""
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf as fitz
+
+from .render_profiles import RGB, pixmap_options
+from .thumbnail_cache import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# Worker process state: the currently open document and its source key
+_worker_doc = None
+_worker_source = None
+
+
+def _get_worker_doc(source):
+    """Get the document for a source, reopening it if the source changed.
+
+    Args:
+        source (tuple): (path, generation) identifying the document state
+
+    Returns:
+        fitz.Document: Document opened in this worker process
+    """
+    global _worker_doc, _worker_source
+    if _worker_source != source:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc = fitz.open(source[0])
+        _worker_source = source
+    return _worker_doc
+
+
+def _render_page(source, page_index, zoom, cache_path=None, clip=None, mode=RGB):
+    """Render a page in a worker process.
+
+    Args:
+        source (tuple): (path, generation) identifying the document state
+        page_index (int): Index of the page to render
+        zoom (float): Zoom factor for rendering
+        cache_path (str, optional): If given, the render is also stored there as PNG
+        clip (tuple, optional): Part of the page to render, in page coordinates
+        mode (str, optional): Color mode, see render_profiles. Defaults to RGB.
+
+    Returns:
+        tuple: (samples, width, height, stride, n, alpha) of the rendered pixmap
+    """
+    doc = _get_worker_doc(source)
+    pix = doc[page_index].get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip,
+                                     **pixmap_options(mode))
+    if cache_path:
+        try:
+            write_file_atomic(cache_path, pix.tobytes("png"))
+        except OSError as e:
+            logger.warning(f"Could not write thumbnail cache entry: {e}")
+    return pix.samples, pix.width, pix.height, pix.stride, pix.n, pix.alpha
+
+
+def _noop():
+    """Do nothing; used to start worker processes ahead of time."""
+    return None
+
+
+def default_worker_count():
+    """Get the default number of render workers for this machine.
+
+    Returns:
+        int: Number of worker processes
+    """
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class RenderPool:
+    """Pool of worker processes that render PDF pages."""
+
+    def __init__(self, max_workers=None):
+        """Initialize the render pool.
+
+        Args:
+            max_workers (int, optional): Number of worker processes.
+                Defaults to default_worker_count().
+        """
+        self.max_workers = max_workers or default_worker_count()
+        self._executor = None
+
+    def submit(self, source, page_index, zoom, cache_path=None, clip=None, mode=RGB):
+        """Submit a page render to the pool.
+
+        Args:
+            source (tuple): (path, generation) identifying the document state
+            page_index (int): Index of the page to render
+            zoom (float): Zoom factor for rendering
+            cache_path (str, optional): If given, the render is also stored there as PNG
+            clip (tuple, optional): Part of the page to render, in page coordinates
+            mode (str, optional): Color mode, see render_profiles. Defaults to RGB.
+
+        Returns:
+            concurrent.futures.Future: Future resolving to
+                (samples, width, height, stride, n, alpha)
+        """
+        return self._get_executor().submit(_render_page, source, page_index, zoom, cache_path,
+                                           clip, mode)
+
+    def _get_executor(self):
+        """Get the process pool, creating it on first use.
+
+        Returns:
+            ProcessPoolExecutor: The worker process pool
+        """
+        if self._executor is None:
+            # spawn: forking a process that runs Qt threads is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def warm_up(self):
+        """Start the worker processes ahead of the first render.
+
+        Starting a worker takes a few hundred milliseconds, which would
+        otherwise delay the first page shown after opening a file.
+        """
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(_noop)
+
+    def shutdown(self, wait=False):
+        """Stop the worker processes and drop pending renders.
+
+        Args:
+            wait (bool, optional): Wait for running renders to finish. Defaults to False.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,170 @@
+"""
+Named render profiles: colorspace and resolution of page renders.
+
+A profile bundles what a render is used for into one object instead of
+an ad hoc zoom matrix and RGB everywhere. Thumbnails and text-only scans
+do not need color, so grayscale renders take a third of the memory of
+RGB; fax-style exports are encoded with one bit per pixel.
+
+The resolution is either fixed by the profile (DPI, or a box the page is
+fitted into) or left to the caller's zoom factor.
+"""
+import pymupdf as fitz
+
+from .image_conversion import pixmap_to_pil
+
+# Renk modları
+GRAY = "gray"
+MONO = "mono"
+RGB = "rgb"
+RGBA = "rgba"
+
+# Bytes per pixel of the rendered pixmap; 1-bit images are rendered as
+# grayscale and only packed when encoded
+BYTES_PER_PIXEL = {GRAY: 1, MONO: 1, RGB: 3, RGBA: 4}
+
+# PIL image mode of every color mode
+PIL_MODES = {GRAY: "L", MONO: "1", RGB: "RGB", RGBA: "RGBA"}
+
+# Thumbnail box of the sidebar in pixels
+THUMBNAIL_SIZE = (120, 160)
+
+
+def pixmap_options(mode):
+    """Get the Page.get_pixmap() arguments of a color mode.
+
+    Args:
+        mode (str): GRAY, MONO, RGB or RGBA
+
+    Returns:
+        dict: colorspace and alpha arguments
+    """
+    colorspace = fitz.csGRAY if mode in (GRAY, MONO) else fitz.csRGB
+    return {"colorspace": colorspace, "alpha": mode == RGBA}
+
+
+class RenderProfile:
+    """Colorspace and resolution of a kind of page render.
+
+    Attributes:
+        name (str): Profile name
+        mode (str): GRAY, MONO, RGB or RGBA
+        dpi (float): Fixed resolution, or None
+        size (tuple): (width, height) box pages are fitted into, or None
+    """
+
+    def __init__(self, name, mode=RGB, dpi=None, size=None):
+        """Initialize the profile.
+
+        Args:
+            name (str): Profile name
+            mode (str, optional): GRAY, MONO, RGB or RGBA. Defaults to RGB.
+            dpi (float, optional): Render at this resolution
+            size (tuple, optional): Fit pages into this (width, height) in pixels.
+                Takes precedence over dpi.
+        """
+        if mode not in BYTES_PER_PIXEL:
+            raise ValueError(f"Unknown color mode: {mode}")
+        self.name = name
+        self.mode = mode
+        self.dpi = dpi
+        self.size = size
+
+    def __repr__(self):
+        """Get a readable description of the profile."""
+        return f"RenderProfile({self.name!r}, {self.mode!r}, dpi={self.dpi!r}, size={self.size!r})"
+
+    @property
+    def alpha(self):
+        """bool: Whether renders have a transparent background."""
+        return self.mode == RGBA
+
+    @property
+    def pil_mode(self):
+        """str: PIL image mode of encoded renders."""
+        return PIL_MODES[self.mode]
+
+    def get_zoom(self, page, zoom=1.0):
+        """Get the zoom factor of a page render.
+
+        Args:
+            page: PyMuPDF Page object
+            zoom (float, optional): Zoom factor used if the profile does not
+                fix the resolution. Defaults to 1.0.
+
+        Returns:
+            float: Zoom factor
+        """
+        if self.size:
+            rect = page.rect
+            return min(self.size[0] / rect.width, self.size[1] / rect.height)
+        if self.dpi:
+            return self.dpi / 72
+        return zoom
+
+    def get_pixmap(self, page, zoom=1.0, clip=None):
+        """Render a page with this profile.
+
+        Args:
+            page: PyMuPDF Page object
+            zoom (float, optional): Zoom factor if the profile does not fix
+                the resolution. Defaults to 1.0.
+            clip (fitz.Rect, optional): Part of the page to render
+
+        Returns:
+            fitz.Pixmap: Rendered pixmap; grayscale for 1-bit profiles
+        """
+        zoom = self.get_zoom(page, zoom)
+        return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip,
+                               **pixmap_options(self.mode))
+
+    def to_pil(self, pix):
+        """Convert a render of this profile to a PIL image for encoding.
+
+        Args:
+            pix (fitz.Pixmap): Pixmap from get_pixmap()
+
+        Returns:
+            PIL.Image.Image: Image in pil_mode; 1-bit images are thresholded
+                at mid gray without dithering, which keeps text edges sharp
+        """
+        img = pixmap_to_pil(pix)
+        if self.mode == MONO:
+            from PIL import Image
+            return img.convert("1", dither=Image.Dither.NONE)
+        return img
+
+
+# Yerleşik profiller
+RENDER_PROFILES = {profile.name: profile for profile in (
+    RenderProfile("screen", RGB),
+    RenderProfile("thumbnail", GRAY, size=THUMBNAIL_SIZE),
+    RenderProfile("thumbnail_color", RGB, size=THUMBNAIL_SIZE),
+    RenderProfile("scan", GRAY, dpi=300),
+    RenderProfile("fax", MONO, dpi=200),
+    RenderProfile("print", RGB, dpi=300),
+    RenderProfile("transparent", RGBA),
+)}
+
+# Profile of renders that do not ask for one
+DEFAULT_PROFILE = RENDER_PROFILES["screen"]
+
+
+def get_render_profile(profile=None):
+    """Look up a render profile.
+
+    Args:
+        profile (RenderProfile or str, optional): Profile or the name of a
+            built-in profile. Defaults to DEFAULT_PROFILE.
+
+    Returns:
+        RenderProfile: The profile
+    """
+    if profile is None:
+        return DEFAULT_PROFILE
+    if isinstance(profile, RenderProfile):
+        return profile
+    try:
+        return RENDER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown render profile: {profile}") from None
@@ -0,0 +1,229 @@
+"""
+Persistent full-text index of PDF pages for fast search.
+
+The text of every page is stored in an SQLite FTS5 table using the
+trigram tokenizer, which matches arbitrary substrings case-insensitively
+like Page.search_for() does. A search asks the index for the pages that
+can contain the query and only runs search_for() on those.
+
+The index describes the document as saved on disk and is stored next to
+the thumbnail cache under the file's fingerprint. Pages changed since the
+last save are not in the index; they are always searched directly.
+"""
+import os
+import logging
+import sqlite3
+
+import pymupdf as fitz
+
+logger = logging.getLogger(__name__)
+
+# Index dosyasının adı (belge önbellek dizininde)
+INDEX_FILE_NAME = 'text_index.sqlite'
+
+# The trigram tokenizer needs queries of at least three characters
+MIN_QUERY_LENGTH = 3
+
+# Text flags Page.search_for() parses pages with
+SEARCH_FLAGS = (fitz.TEXT_DEHYPHENATE | fitz.TEXT_PRESERVE_WHITESPACE
+                | fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP)
+
+
+def normalize_text(text):
+    """Collapse whitespace the way Page.search_for() treats it.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Text with every whitespace run replaced by a single space
+    """
+    return " ".join(text.split())
+
+
+def extract_search_text(page):
+    """Extract the text of a page as seen by Page.search_for().
+
+    Args:
+        page: PyMuPDF Page object
+
+    Returns:
+        str: Normalized page text
+    """
+    return normalize_text(page.get_text("text", flags=SEARCH_FLAGS))
+
+
+class TextIndex:
+    """Full-text index of the pages of an open document.
+
+    page_sources maps every current page to the page it had in the saved
+    file, or to None for pages inserted or modified since, so the index
+    stays usable while the document is edited.
+    """
+
+    def __init__(self, db_path, page_count):
+        """Open or create the index.
+
+        Args:
+            db_path (str): Path of the SQLite database
+            page_count (int): Number of pages of the document
+        """
+        self.db_path = db_path
+        self.page_sources = list(range(page_count))
+        self.connection = None
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.connection = sqlite3.connect(db_path)
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS page_text "
+                "USING fts5(text, tokenize='trigram')")
+        except sqlite3.Error as e:
+            # FTS5 or the trigram tokenizer is missing in old SQLite builds
+            logger.warning(f"Text index not available: {e}")
+            self.close()
+
+    @property
+    def available(self):
+        """bool: Whether the index can be used."""
+        return self.connection is not None
+
+    def indexed_pages(self):
+        """Get the saved pages stored in the index.
+
+        Returns:
+            set: Page indices of the saved file
+        """
+        if not self.available:
+            return set()
+        return {row[0] for row in self.connection.execute("SELECT rowid FROM page_text")}
+
+    def missing_pages(self):
+        """Get the current pages that still have to be indexed.
+
+        Returns:
+            list: Current page indices
+        """
+        indexed = self.indexed_pages()
+        return [page_index for page_index, source in enumerate(self.page_sources)
+                if source is not None and source not in indexed]
+
+    def add_texts(self, texts):
+        """Store the text of current pages.
+
+        Args:
+            texts (dict): Current page index -> page text
+        """
+        if not self.available:
+            return
+        rows = [(self.page_sources[page_index], normalize_text(text))
+                for page_index, text in texts.items()
+                if self.page_sources[page_index] is not None]
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO page_text(rowid, text) VALUES (?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error updating text index: {e}")
+
+    def update(self, doc):
+        """Index the pages that are not in the index yet.
+
+        Args:
+            doc: PyMuPDF Document object the index belongs to
+
+        Returns:
+            int: Number of pages indexed
+        """
+        pages = self.missing_pages()
+        self.add_texts({page_index: extract_search_text(doc[page_index])
+                        for page_index in pages})
+        return len(pages)
+
+    def apply_change(self, change):
+        """Follow a change of the open document.
+
+        Args:
+            change: DocumentChange describing the affected pages
+        """
+        if change.kind == change.MODIFIED:
+            for page_index in change.pages:
+                self.page_sources[page_index] = None
+            return
+
+        sources = [None] * (len(self.page_sources) + (
+            len(change.pages) if change.kind == change.INSERTED else
+            -len(change.pages) if change.kind == change.REMOVED else 0))
+        for page_index, source in enumerate(self.page_sources):
+            new_index = change.map_page(page_index)
+            if new_index is not None:
+                sources[new_index] = source
+        self.page_sources = sources
+
+    def candidate_pages(self, search_string):
+        """Get the current pages that may contain a search string.
+
+        Args:
+            search_string (str): Text to search for
+
+        Returns:
+            list: Sorted page indices, or None if the index cannot narrow
+                down the search (index unavailable, query too short)
+        """
+        query = normalize_text(search_string)
+        if not self.available or len(query) < MIN_QUERY_LENGTH:
+            return None
+
+        try:
+            matches = {row[0] for row in self.connection.execute(
+                "SELECT rowid FROM page_text WHERE page_text MATCH ?",
+                ('"' + query.replace('"', '""') + '"',))}
+        except sqlite3.Error as e:
+            logger.error(f"Error querying text index: {e}")
+            return None
+
+        indexed = self.indexed_pages()
+        return [page_index for page_index, source in enumerate(self.page_sources)
+                if source is None or source not in indexed or source in matches]
+
+    def rebase(self, db_path, doc, replaced=True):
+        """Move the index to a newly saved version of the document.
+
+        The text of unchanged pages is copied from this index; only pages
+        changed since the last save are extracted again.
+
+        Args:
+            db_path (str): Path of the index of the saved file
+            doc: PyMuPDF Document object as saved
+            replaced (bool, optional): The save overwrote the file this index
+                belongs to, so this index is deleted. False after Save As,
+                which leaves the original file and its index as they are.
+                Defaults to True.
+
+        Returns:
+            TextIndex: Index of the saved file
+        """
+        texts = {}
+        if self.available:
+            stored = dict(self.connection.execute("SELECT rowid, text FROM page_text"))
+            texts = {page_index: stored[source]
+                     for page_index, source in enumerate(self.page_sources)
+                     if source in stored}
+
+        self.close()
+        if replaced:
+            # The file changed, so the old index no longer matches any file
+            try:
+                os.unlink(self.db_path)
+            except OSError:
+                pass
+
+        new_index = TextIndex(db_path, len(doc))
+        new_index.add_texts(texts)
+        new_index.update(doc)
+        return new_index
+
+    def close(self):
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,239 @@
+"""
+Persistent on-disk cache for page thumbnails.
+
+Entries are grouped in one directory per document, named after a content
+fingerprint of the file, so renamed or copied files share their entries
+and modified files get new ones.
+"""
+import os
+import sys
+import hashlib
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan disk önbelleği boyutu (byte)
+DEFAULT_DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# Parmak izi için dosyanın başından ve sonundan okunan bayt sayısı
+FINGERPRINT_CHUNK = 64 * 1024
+
+# Belge dizini içinde küçük resimlerin alt dizini; temizlik yalnızca burada çalışır
+THUMBNAIL_DIR_NAME = 'thumbnails'
+
+
+def get_cache_dir():
+    """Get the user cache directory of the application.
+
+    Returns:
+        str: Platform specific cache directory for miniPDF
+    """
+    if sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    elif sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'miniPDF')
+
+
+def get_data_dir():
+    """Get the user data directory of the application.
+
+    Unlike get_cache_dir(), nothing in it is removed automatically.
+
+    Returns:
+        str: Platform specific data directory for miniPDF
+    """
+    if sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    elif sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~\\AppData\\Roaming')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'miniPDF')
+
+
+def file_fingerprint(file_path):
+    """Compute a content fingerprint of a file.
+
+    The fingerprint combines size, modification time and a hash of the
+    first and last FINGERPRINT_CHUNK bytes, which is cheap even for very
+    large files.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex fingerprint or None if the file cannot be read
+    """
+    try:
+        stat = os.stat(file_path)
+        digest = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_CHUNK))
+            if stat.st_size > FINGERPRINT_CHUNK:
+                f.seek(max(FINGERPRINT_CHUNK, stat.st_size - FINGERPRINT_CHUNK))
+                digest.update(f.read(FINGERPRINT_CHUNK))
+        return digest.hexdigest()
+    except OSError as e:
+        logger.warning(f"Could not fingerprint {file_path}: {e}")
+        return None
+
+
+def write_file_atomic(path, data):
+    """Write a file so that readers never see a partial entry.
+
+    Args:
+        path (str): Destination path
+        data (bytes): File contents
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def remove_least_recently_used(paths, max_bytes):
+    """Remove the least recently used files until the rest fit a size cap.
+
+    Cache entries have their modification time updated when read, so it
+    tells when they were last used.
+
+    Args:
+        paths (iterable): Paths of the cache entries
+        max_bytes (int): Maximum total size of the entries in bytes
+
+    Returns:
+        int: Number of removed files
+    """
+    entries = []
+    total = 0
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class ThumbnailCache:
+    """Disk cache of PNG thumbnails with a size cap and LRU cleanup.
+
+    The modification time of an entry is updated whenever it is read, so
+    cleanup removes the least recently used entries first.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_DISK_CACHE_BYTES):
+        """Initialize the thumbnail cache.
+
+        Args:
+            cache_dir (str, optional): Cache directory. Defaults to get_cache_dir().
+            max_bytes (int, optional): Maximum total size of the cache in bytes.
+        """
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.max_bytes = max_bytes
+        self._cleanup_thread = None
+
+    def document_dir(self, fingerprint):
+        """Get the directory holding the entries of a document.
+
+        Args:
+            fingerprint (str): File fingerprint
+
+        Returns:
+            str: Directory path
+        """
+        return os.path.join(self.cache_dir, fingerprint)
+
+    def entry_path(self, fingerprint, page_index, zoom_bucket, rotation, mode="rgb"):
+        """Get the path of a thumbnail entry.
+
+        Args:
+            fingerprint (str): File fingerprint
+            page_index (int): Index of the page
+            zoom_bucket (int): Zoom factor in percent
+            rotation (int): Page rotation in degrees
+            mode (str, optional): Color mode of the render. Defaults to "rgb".
+
+        Returns:
+            str: Path of the PNG file
+        """
+        return os.path.join(self.document_dir(fingerprint), THUMBNAIL_DIR_NAME,
+                            f"p{page_index}_z{zoom_bucket}_r{rotation}_{mode}.png")
+
+    def read(self, path):
+        """Read a cached thumbnail.
+
+        Args:
+            path (str): Entry path from entry_path()
+
+        Returns:
+            bytes: PNG data or None if not cached
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # LRU için son kullanım zamanını güncelle
+            return data
+        except OSError:
+            return None
+
+    def write(self, path, data):
+        """Store a thumbnail.
+
+        Args:
+            path (str): Entry path from entry_path()
+            data (bytes): PNG data
+        """
+        try:
+            write_file_atomic(path, data)
+        except OSError as e:
+            logger.warning(f"Could not write thumbnail cache entry: {e}")
+
+    def cleanup(self):
+        """Remove least recently used thumbnails until they fit the size cap.
+
+        Only PNG files in the 'thumbnails' directories of the documents are
+        evicted. Text indexes, OCR results and other data in the cache
+        directory are never touched, since they may be open or expensive
+        to rebuild.
+
+        Returns:
+            int: Number of removed files
+        """
+        paths = [os.path.join(root, name)
+                 for root, _, files in os.walk(self.cache_dir)
+                 if os.path.basename(root) == THUMBNAIL_DIR_NAME
+                 for name in files if name.endswith('.png')]
+        return remove_least_recently_used(paths, self.max_bytes)
+
+    def cleanup_in_background(self):
+        """Run cleanup() in a background thread unless one is running."""
+        if self._cleanup_thread and self._cleanup_thread.is_alive():
+            return
+        self._cleanup_thread = threading.Thread(target=self.cleanup, daemon=True)
+        self._cleanup_thread.start()
@@ -51,7 +51,11 @@ class App(QMainWindow):
         super().__init__()
 
         # Initialize PDF manager
-        self.pdf_manager = PDFManager()
+        try:
+            self.pdf_manager = PDFManager(thumbnail_profile=get_setting('thumbnail_profile'))
+        except ValueError as e:
+            logger.error(f"Invalid thumbnail profile setting: {e}")
+            self.pdf_manager = PDFManager()
 
         # Initialize theme-related attributes
         self.current_theme = ""
@@ -63,6 +67,9 @@ class App(QMainWindow):
         # Apply all saved settings (theme, zoom, sidebar width, etc.)
         initialize_app_settings(self)
 
+        # Start render workers so the first opened page shows up quickly
+        self.pdf_manager.render_pool.warm_up()
+
     # Bu metod artık kullanılmıyor, tüm ayarlar settings_utils üzerinden yönetiliyor
 
     def setup_ui(self):
@@ -104,6 +111,18 @@ class App(QMainWindow):
         # Connect sidebar signals
         self.sidebar.page_selected.connect(self.preview.show_page)
 
+        # Refresh only the pages affected by document changes
+        self.pdf_manager.add_change_listener(self.on_document_changed)
+
+    def on_document_changed(self, change):
+        """Update the views after the document changed.
+
+        Args:
+            change: DocumentChange describing the affected pages
+        """
+        self.preview.on_document_changed(change)
+        self.sidebar.on_document_changed(change)
+
     def create_menu_toolbar(self):
         """Create the menu toolbar with action groups (title above, buttons below)."""
         # Create container widget for the toolbar content
@@ -119,7 +138,8 @@ class App(QMainWindow):
             ("Save", "save", self.save_pdf, 0, 1),
             ("Save As", "save_as", self.save_pdf_as, 0, 2),
             ("Close", "exit", self.close_pdf, 1, 0),
-            ("Print", "print", self.print_pdf, 1, 1)
+            ("Print", "print", self.print_pdf, 1, 1),
+            ("Optimize and Save", "save", self.optimize_pdf, 1, 2)
         ]
         page_actions = [
             ("Add Page", "add", self.add_page, 0, 0),
@@ -418,6 +438,20 @@ class App(QMainWindow):
         else:
             self.save_pdf_as()
 
+    def optimize_pdf(self):
+        """Rewrite the current PDF file with full cleanup and compression."""
+        if not self.pdf_manager.doc:
+            return
+
+        if not self.pdf_manager.file_path:
+            self.save_pdf_as()
+            return
+
+        if self.pdf_manager.save_pdf(optimize=True):
+            self.status_bar.showMessage("PDF optimized and saved successfully")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to optimize PDF file.")
+
     def save_pdf_as(self):
         """Save the PDF file with a new name."""
         if not self.pdf_manager.doc:
@@ -494,12 +528,10 @@ class App(QMainWindow):
             return
 
         try:
-            # Create a blank page with PyMuPDF
-            page = self.pdf_manager.doc.new_page(-1, width=595, height=842)  # A4 size in points
+            # Create a blank A4 page
+            new_page_num = self.pdf_manager.add_page()
             
-            if page:
-                self.sidebar.update_pages()
-                new_page_num = self.pdf_manager.get_page_count() - 1
+            if new_page_num >= 0:
                 self.preview.show_page(new_page_num)
                 self.status_bar.showMessage("Blank page added")
             else:
@@ -513,11 +545,6 @@ class App(QMainWindow):
             return
 
         if self.pdf_manager.delete_page(self.preview.current_page):
-            self.sidebar.update_pages()
-            if self.preview.current_page >= self.pdf_manager.get_page_count():
-                self.preview.show_page(self.pdf_manager.get_page_count() - 1)
-            else:
-                self.preview.show_page(self.preview.current_page)
             self.status_bar.showMessage("Page deleted")
         else:
             QMessageBox.critical(self, "Error", "Failed to delete page.")
@@ -561,15 +588,8 @@ class App(QMainWindow):
             return
 
         try:
-            # Get the current page
-            page = self.pdf_manager.get_page(self.preview.current_page)
-            if page:
-                # Rotate the page
-                page.set_rotation(page.rotation + angle)
-                
-                # Update the view
-                self.preview.show_page(self.preview.current_page)
-                self.sidebar.update_thumbnail(self.preview.current_page)
+            # Rotate the current page
+            if self.pdf_manager.rotate_page(self.preview.current_page, angle):
                 self.status_bar.showMessage(f"Page rotated by {angle} degrees")
             else:
                 QMessageBox.critical(self, "Error", "Failed to rotate page.")
@@ -637,7 +657,7 @@ class App(QMainWindow):
                 # Add the text annotation
                 if annotator.create_note_at_position(page, position, text):
                     # Update the view
-                    self.preview.show_page(self.preview.current_page)
+                    self.pdf_manager.mark_page_modified(self.preview.current_page)
                     self.status_bar.showMessage("Text annotation added")
                 else:
                     QMessageBox.critical(self, "Error", "Failed to add text annotation.")
@@ -674,7 +694,7 @@ class App(QMainWindow):
             # Add the line annotation
             if annotator.add_line(page, start_point, end_point, width=2.0):
                 # Update the view
-                self.preview.show_page(self.preview.current_page)
+                self.pdf_manager.mark_page_modified(self.preview.current_page)
                 self.status_bar.showMessage("Line annotation added")
             else:
                 QMessageBox.critical(self, "Error", "Failed to add line annotation.")
@@ -719,7 +739,7 @@ class App(QMainWindow):
             # Add the rectangle annotation (PyMuPDF doesn't have a direct circle annotation)
             if annotator.add_rectangle(page, circle_rect, width=2.0):
                 # Update the view
-                self.preview.show_page(self.preview.current_page)
+                self.pdf_manager.mark_page_modified(self.preview.current_page)
                 self.status_bar.showMessage("Circle annotation added")
             else:
                 QMessageBox.critical(self, "Error", "Failed to add circle annotation.")
@@ -760,7 +780,7 @@ class App(QMainWindow):
             # Add the highlight annotation
             if annotator.add_highlight(page, highlight_rect, color=(1, 1, 0)):
                 # Update the view
-                self.preview.show_page(self.preview.current_page)
+                self.pdf_manager.mark_page_modified(self.preview.current_page)
                 self.status_bar.showMessage("Highlight annotation added")
             else:
                 QMessageBox.critical(self, "Error", "Failed to add highlight annotation.")
@@ -786,7 +806,7 @@ class App(QMainWindow):
                 # Delete the last annotation
                 if annotator.delete_annotation(page, len(annotations) - 1):
                     # Update the view
-                    self.preview.show_page(self.preview.current_page)
+                    self.pdf_manager.mark_page_modified(self.preview.current_page)
                     self.status_bar.showMessage("Last annotation erased")
                 else:
                     QMessageBox.critical(self, "Error", "Failed to erase annotation.")
@@ -818,7 +838,7 @@ class App(QMainWindow):
                         success = False
                 
                 # Update the view
-                self.preview.show_page(self.preview.current_page)
+                self.pdf_manager.mark_page_modified(self.preview.current_page)
                 
                 if success:
                     self.status_bar.showMessage("All annotations cleared")
@@ -828,3 +848,13 @@ class App(QMainWindow):
                 QMessageBox.information(self, "No Annotations", "No annotations found on this page.")
         else:
             QMessageBox.critical(self, "Error", "Failed to get page.")
+
+    def closeEvent(self, event):
+        """Stop the render workers when the window is closed.
+
+        Args:
+            event: QCloseEvent
+        """
+        # İşçi süreçleri arayüzden sonra yaşamamalı ve çıkışı bekletmemeli
+        self.pdf_manager.render_pool.shutdown()
+        super().closeEvent(event)
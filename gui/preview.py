@@ -1,23 +1,107 @@
 """
 PDF preview widget for miniPDF.
 """
+import math
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QScrollArea, QToolButton, QFrame)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QRectF, QPoint
+from PyQt6.QtCore import Qt, QSize, QSizeF, pyqtSignal, QRectF, QPoint, QPointF, QTimer
 from PyQt6.QtGui import QPixmap, QPainter, QColor, QPen, QImage
 from .utils.icon_utils import IconProvider
 from .utils.settings_utils import (
     apply_theme_to_widget, apply_button_styles, 
-    save_zoom_level, load_zoom_level
+    save_zoom_level, load_zoom_level, get_setting
 )
 from .settings import Settings
 
+class PageLabel(QLabel):
+    """Label painting a page render scaled to the display size of the page.
+    
+    The render is painted scaled instead of being replaced by a scaled
+    copy, and a sharper tile of the visible region can be painted over
+    it, so large pages at high zoom never need a full-size pixmap.
+    """
+    
+    def __init__(self, parent=None):
+        """Initialize the label."""
+        super().__init__(parent)
+        self.page_pixmap = None
+        self.page_size = QSize()
+        self.tile = None
+        self.tile_rect = QRectF()
+        
+    def set_page(self, pixmap, size, tile=None, tile_rect=None):
+        """Show a page render.
+        
+        Args:
+            pixmap: Render of the whole page, at any resolution
+            size: Display size of the page in logical pixels
+            tile: Optional sharper render of a part of the page
+            tile_rect: Display rectangle of the tile relative to the page
+        """
+        self.page_pixmap = pixmap
+        self.page_size = size
+        self.tile = tile
+        self.tile_rect = tile_rect or QRectF()
+        self.setMinimumSize(size.expandedTo(QSize(400, 400)))
+        self.updateGeometry()
+        self.update()
+        
+    def clear(self):
+        """Remove the page."""
+        self.page_pixmap = None
+        self.page_size = QSize()
+        self.tile = None
+        self.setMinimumSize(QSize(400, 400))
+        super().clear()
+        
+    def sizeHint(self):
+        """Size of the page, but at least the minimum size."""
+        if self.page_pixmap is None:
+            return super().sizeHint()
+        return self.minimumSize()
+        
+    def page_origin(self):
+        """Get the top left corner of the page, which is centered in the label.
+        
+        Returns:
+            QPointF: Position in label coordinates
+        """
+        return QPointF(max(0, (self.width() - self.page_size.width()) / 2),
+                       max(0, (self.height() - self.page_size.height()) / 2))
+        
+    def paintEvent(self, event):
+        """Paint the page render and the tile over it."""
+        if self.page_pixmap is None:
+            super().paintEvent(event)
+            return
+            
+        painter = QPainter(self)
+        origin = self.page_origin()
+        painter.drawPixmap(QRectF(origin, QSizeF(self.page_size)), self.page_pixmap,
+                           QRectF(self.page_pixmap.rect()))
+        if self.tile is not None:
+            painter.drawPixmap(self.tile_rect.translated(origin), self.tile, QRectF(self.tile.rect()))
+        painter.end()
+
+
 class PDFPreview(QWidget):
     """Widget for displaying PDF pages."""
     
     # Signals for annotation events
     annotation_added = pyqtSignal(int, object)  # page_num, annotation
     
+    # Emitted from render worker threads, delivered on the GUI thread
+    page_rendered = pyqtSignal(object, object)  # render future, QImage
+    prefetch_finished = pyqtSignal(object)  # prefetch future
+    
+    # Delay before re-rendering at a new zoom level (ms)
+    RENDER_DELAY_MS = 150
+    
+    # Extra area rendered around the visible region of large pages,
+    # as a fraction of the viewport size on each side
+    TILE_MARGIN = 0.5
+    
     def __init__(self, parent=None):
         """Initialize preview widget."""
         super().__init__(parent)
@@ -42,6 +126,22 @@ class PDFPreview(QWidget):
         self.current_page = None
         self.current_zoom = load_zoom_level() / 100.0  # Kaydedilen zoom oranını yükle (settings_utils kullanarak)
         self.current_pixmap = None
+        self.rendered_zoom = None  # Zoom at which current_pixmap was rendered
+        self.pending_render = None  # Background render in progress
+        self.pending_render_zoom = None
+        self.prefetch_futures = {}  # page_num -> background prefetch render
+        self.prefetch_state = None  # (zoom, document revision) of the prefetches
+        self.navigation_direction = 1  # 1 forward, -1 backward
+        self.prefetch_ahead = max(0, int(get_setting('prefetch_ahead')))
+        self.prefetch_behind = max(0, int(get_setting('prefetch_behind')))
+        # Larger renders show the visible region only, see update_tile()
+        self.max_render_pixels = int(float(get_setting('max_render_megapixels')) * 1024 * 1024)
+        self.current_tile = None  # Sharp render of the visible region of a large page
+        self.tile_clip = None  # Page rectangle (points) of current_tile
+        self.tile_zoom = None
+        self.pending_tile = None
+        self.pending_tile_clip = None
+        self.pending_tile_zoom = None
         self.drawing = False
         self.last_point = None
         self.annotation_mode = None
@@ -49,6 +149,18 @@ class PDFPreview(QWidget):
         self.annotation_text = None
         self.annotation_width = None
         
+        # Debounce timer for high-resolution re-rendering after zoom changes
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(self.RENDER_DELAY_MS)
+        self.render_timer.timeout.connect(self.render_current_page)
+        self.page_rendered.connect(self.on_page_rendered)
+        self.prefetch_finished.connect(self.on_prefetch_finished)
+        
+        # Large pages: render the newly visible region after scrolling
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.on_scrolled)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+        
         # Tema değişikliklerini dinle
         if parent:
             parent.theme_changed.connect(self.apply_theme)
@@ -151,7 +263,7 @@ class PDFPreview(QWidget):
         self.page_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Create label for displaying page
-        self.page_label = QLabel()
+        self.page_label = PageLabel()
         self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.page_label.setMinimumSize(QSize(400, 400))
         self.page_layout.addWidget(self.page_label)
@@ -250,7 +362,8 @@ class PDFPreview(QWidget):
         """Fit page to window width."""
         if self.current_pixmap:
             available_width = self.scroll_area.width() - 40  # Account for margins
-            zoom = available_width / self.current_pixmap.width()
+            page_width, _ = self.get_page_size()
+            zoom = available_width / page_width
             self.set_zoom(zoom)
             self.app.status_bar.showMessage("Fit to width")
             
@@ -259,33 +372,403 @@ class PDFPreview(QWidget):
         if self.current_pixmap:
             available_width = self.scroll_area.width() - 40  # Account for margins
             available_height = self.scroll_area.height() - 40  # Account for margins
-            zoom_width = available_width / self.current_pixmap.width()
-            zoom_height = available_height / self.current_pixmap.height()
+            page_width, page_height = self.get_page_size()
+            zoom_width = available_width / page_width
+            zoom_height = available_height / page_height
             self.set_zoom(min(zoom_width, zoom_height))
             self.app.status_bar.showMessage("Fit to page")
             
+    def get_page_size(self):
+        """Get the size of the current page at 100% zoom.
+        
+        Returns:
+            tuple: (width, height) in points
+        """
+        page = None
+        if self.current_page is not None:
+            page = self.app.pdf_manager.get_page(self.current_page)
+        if page:
+            # Sayfa dikdörtgeni piksel yuvarlamasından etkilenmez
+            return page.rect.width, page.rect.height
+        pixmap = self.current_pixmap
+        scale = self.rendered_zoom * pixmap.devicePixelRatio()
+        return pixmap.width() / scale, pixmap.height() / scale
+            
     def update_display(self):
-        """Update the display with current zoom level."""
-        if self.current_pixmap:
-            scaled_pixmap = self.current_pixmap.scaled(
-                int(self.current_pixmap.width() * self.current_zoom),
-                int(self.current_pixmap.height() * self.current_zoom),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.page_label.setPixmap(scaled_pixmap)
-            
-            # Update page indicator
-            if self.app.pdf_manager.doc:
-                page_count = self.app.pdf_manager.get_page_count()
-                if page_count > 0 and self.current_page is not None:
-                    self.page_indicator.setText(f"Page {self.current_page + 1} of {page_count}")
-            
-    def show_page(self, page_num):
+        """Update the display with current zoom level.
+        
+        If the current pixmap was rendered at a different zoom level, it
+        is shown scaled as a placeholder and a high-resolution render at
+        the target zoom is scheduled. Pages too large to render whole at
+        the current zoom get a sharp tile of their visible region instead.
+        """
+        if not self.current_pixmap:
+            return
+            
+        page_width, page_height = self.get_page_size()
+        size = QSize(int(page_width * self.current_zoom), int(page_height * self.current_zoom))
+        if self.current_tile is not None and self.tile_zoom == self.current_zoom:
+            self.page_label.set_page(self.current_pixmap, size, self.current_tile,
+                                     self.get_tile_rect(self.tile_clip))
+        else:
+            self.page_label.set_page(self.current_pixmap, size)
+            
+        if self.current_page is not None and not self.is_display_current():
+            # Restart the timer so a burst of zoom changes renders only once
+            self.render_timer.start()
+            
+        # Update page indicator
+        if self.app.pdf_manager.doc:
+            page_count = self.app.pdf_manager.get_page_count()
+            if page_count > 0 and self.current_page is not None:
+                self.page_indicator.setText(f"Page {self.current_page + 1} of {page_count}")
+                
+    def get_render_zoom(self, page_num, zoom):
+        """Get the zoom level a whole page is rendered at.
+        
+        This is the display zoom, unless the render would exceed the
+        max_render_megapixels setting; then the largest zoom within it.
+        
+        Args:
+            page_num: Page number
+            zoom: Display zoom level
+            
+        Returns:
+            float: Zoom level for rendering the whole page
+        """
+        page = self.app.pdf_manager.get_page(page_num)
+        if page is None:
+            return zoom
+        ratio = self.devicePixelRatioF()
+        pixels = page.rect.width * page.rect.height * (zoom * ratio) ** 2
+        if pixels <= self.max_render_pixels:
+            return zoom
+        return zoom * math.sqrt(self.max_render_pixels / pixels)
+        
+    def uses_tiles(self):
+        """Check whether the current page is too large to render whole.
+        
+        Returns:
+            bool: True if the visible region is rendered separately
+        """
+        return (self.current_page is not None
+                and self.get_render_zoom(self.current_page, self.current_zoom) < self.current_zoom)
+        
+    def is_display_current(self):
+        """Check whether the display is sharp at the current zoom level.
+        
+        Returns:
+            bool: True if nothing needs to be rendered
+        """
+        if self.rendered_zoom != self.get_render_zoom(self.current_page, self.current_zoom):
+            return False
+        if not self.uses_tiles():
+            return True
+        visible = self.get_visible_page_rect()
+        return (self.tile_zoom == self.current_zoom and self.tile_clip is not None
+                and (visible.isEmpty() or self.tile_clip.contains(visible)))
+        
+    def get_visible_page_rect(self):
+        """Get the part of the page visible in the scroll area.
+        
+        Returns:
+            QRectF: Visible rectangle in page coordinates (points)
+        """
+        viewport = self.scroll_area.viewport()
+        top_left = QPointF(self.page_label.mapFrom(viewport, QPoint(0, 0))) - self.page_label.page_origin()
+        zoom = self.current_zoom
+        page_width, page_height = self.get_page_size()
+        rect = QRectF(top_left.x() / zoom, top_left.y() / zoom,
+                      viewport.width() / zoom, viewport.height() / zoom)
+        return rect.intersected(QRectF(0, 0, page_width, page_height))
+        
+    def get_tile_rect(self, clip):
+        """Get the display rectangle of a page region.
+        
+        Args:
+            clip: Rectangle in page coordinates (points)
+            
+        Returns:
+            QRectF: Rectangle in logical pixels relative to the page
+        """
+        zoom = self.current_zoom
+        return QRectF(clip.x() * zoom, clip.y() * zoom, clip.width() * zoom, clip.height() * zoom)
+        
+    def update_tile(self):
+        """Render the visible region of a large page at the current zoom level.
+        
+        The region is extended by TILE_MARGIN of the viewport on every
+        side, as far as the pixel budget allows, so that short scrolls
+        stay sharp without a new render.
+        """
+        if not self.uses_tiles() or not self.current_pixmap:
+            self.clear_tile()
+            return
+            
+        visible = self.get_visible_page_rect()
+        if visible.isEmpty():
+            return
+        if self.tile_zoom == self.current_zoom and self.tile_clip is not None and self.tile_clip.contains(visible):
+            return
+        if (self.pending_tile is not None and self.pending_tile_zoom == self.current_zoom
+                and self.pending_tile_clip.contains(visible)):
+            return
+            
+        page_width, page_height = self.get_page_size()
+        scale = (self.current_zoom * self.devicePixelRatioF()) ** 2
+        margin = self.TILE_MARGIN
+        clip = visible
+        while margin > 0:
+            clip = visible.adjusted(-visible.width() * margin, -visible.height() * margin,
+                                    visible.width() * margin, visible.height() * margin)
+            clip = clip.intersected(QRectF(0, 0, page_width, page_height))
+            if clip.width() * clip.height() * scale <= self.max_render_pixels:
+                break
+            margin /= 2
+            clip = visible
+            
+        self.cancel_pending_tile()
+        future = self.app.pdf_manager.render_page_async(
+            self.current_page, zoom=self.current_zoom * self.devicePixelRatioF(),
+            clip=(clip.left(), clip.top(), clip.right(), clip.bottom()))
+        if future is None:
+            return
+        self.pending_tile = future
+        self.pending_tile_clip = clip
+        self.pending_tile_zoom = self.current_zoom
+        future.add_done_callback(self._emit_page_rendered)
+        
+    def cancel_pending_tile(self):
+        """Cancel the tile render in progress, if any."""
+        if self.pending_tile is not None:
+            self.app.pdf_manager.cancel_render(self.pending_tile)
+            self.pending_tile = None
+            
+    def clear_tile(self):
+        """Drop the tile of the visible region and any render of it."""
+        self.cancel_pending_tile()
+        self.current_tile = None
+        self.tile_clip = None
+        self.tile_zoom = None
+        
+    def on_scrolled(self):
+        """Schedule a render of the newly visible region of a large page."""
+        if self.uses_tiles() and not self.is_display_current():
+            self.render_timer.start()
+            
+    def request_render(self, page_num, zoom):
+        """Render a page in the background at the given zoom level.
+        
+        Any render still pending for a previous request is cancelled. The
+        page is rendered at the screen's device pixel ratio so that it
+        stays sharp on high-DPI displays. Cached renders are applied
+        immediately.
+        
+        Args:
+            page_num: Page number to render
+            zoom: Zoom level (1.0 = 100%)
+            
+        Returns:
+            bool: True if the render finished immediately
+        """
+        self.cancel_pending_render()
+        self.clear_tile()
+        ratio = self.devicePixelRatioF()
+        render_zoom = self.get_render_zoom(page_num, zoom)
+        
+        # Reuse a prefetch of this page that is still in progress
+        future = self.prefetch_futures.pop(page_num, None)
+        if future is not None and self.prefetch_state != self.get_prefetch_state(zoom):
+            self.app.pdf_manager.cancel_render(future)
+            future = None
+        if future is None:
+            future = self.app.pdf_manager.render_page_async(page_num, zoom=render_zoom * ratio)
+        if future is None:
+            return False
+            
+        self.pending_render = future
+        self.pending_render_zoom = render_zoom
+        future.add_done_callback(self._emit_page_rendered)
+        return self.pending_render is None
+        
+    def _emit_page_rendered(self, future):
+        """Forward a finished render to the GUI thread.
+        
+        Args:
+            future: Finished render future
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self.page_rendered.emit(future, future.result())
+        except RuntimeError:
+            pass  # Widget was deleted while rendering
+            
+    def cancel_pending_render(self):
+        """Cancel the background render in progress, if any."""
+        if self.pending_render is not None:
+            self.app.pdf_manager.cancel_render(self.pending_render)
+            self.pending_render = None
+            
+    def on_page_rendered(self, future, image):
+        """Show a finished background render.
+        
+        Args:
+            future: Render future the image belongs to
+            image: Rendered QImage
+        """
+        if future is self.pending_tile:
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+            self.pending_tile = None
+            self.current_tile = pixmap
+            self.tile_clip = self.pending_tile_clip
+            self.tile_zoom = self.pending_tile_zoom
+            self.update_display()
+            return
+            
+        if future is not self.pending_render:
+            return  # Outdated render
+            
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.pending_render = None
+        self.current_pixmap = pixmap
+        self.rendered_zoom = self.pending_render_zoom
+        self.update_tile()
+        self.update_display()
+        self.schedule_prefetch()
+        
+    def get_prefetch_state(self, zoom):
+        """Get the state prefetched renders must match to be reused.
+        
+        Args:
+            zoom: Zoom level (1.0 = 100%)
+            
+        Returns:
+            tuple: (zoom, document revision)
+        """
+        return (zoom, self.app.pdf_manager.revision)
+        
+    def get_prefetch_pages(self):
+        """Get the pages to prefetch around the current page.
+        
+        prefetch_ahead pages in the direction of navigation come first,
+        followed by prefetch_behind pages in the opposite direction.
+        
+        Returns:
+            list: Page numbers in the order they should be rendered
+        """
+        if self.current_page is None:
+            return []
+            
+        page_count = self.app.pdf_manager.get_page_count()
+        direction = self.navigation_direction
+        pages = [self.current_page + direction * i for i in range(1, self.prefetch_ahead + 1)]
+        pages += [self.current_page - direction * i for i in range(1, self.prefetch_behind + 1)]
+        return [page for page in pages if 0 <= page < page_count]
+        
+    def schedule_prefetch(self):
+        """Render the pages around the current page into the render cache.
+        
+        Prefetching only starts once the current page is shown, and at
+        most one prefetch per render worker runs at a time, so prefetches
+        never delay the page the user is waiting for.
+        """
+        if self.pending_render is not None or not self.app.pdf_manager.doc:
+            return
+            
+        state = self.get_prefetch_state(self.current_zoom)
+        if state != self.prefetch_state:
+            self.cancel_prefetch()
+            self.prefetch_state = state
+            
+        pages = self.get_prefetch_pages()
+        self.cancel_prefetch(keep=pages)
+        
+        max_running = self.app.pdf_manager.render_pool.max_workers
+        ratio = self.devicePixelRatioF()
+        for page in pages:
+            if len(self.prefetch_futures) >= max_running:
+                break
+            if page in self.prefetch_futures:
+                continue
+            future = self.app.pdf_manager.render_page_async(
+                page, zoom=self.get_render_zoom(page, self.current_zoom) * ratio)
+            if future is None or future.done():
+                continue  # Already in the render cache
+            self.prefetch_futures[page] = future
+            future.add_done_callback(self._emit_prefetch_finished)
+            
+    def _emit_prefetch_finished(self, future):
+        """Forward a finished prefetch to the GUI thread.
+        
+        Args:
+            future: Finished prefetch future
+        """
+        try:
+            self.prefetch_finished.emit(future)
+        except RuntimeError:
+            pass  # Widget was deleted while rendering
+            
+    def on_prefetch_finished(self, future):
+        """Start the next prefetch once a worker is free.
+        
+        Args:
+            future: Finished prefetch future
+        """
+        for page, prefetch in list(self.prefetch_futures.items()):
+            if prefetch is future:
+                del self.prefetch_futures[page]
+        if not future.cancelled() and future.exception() is None:
+            self.schedule_prefetch()
+            
+    def cancel_prefetch(self, keep=()):
+        """Cancel prefetch renders that are no longer needed.
+        
+        Args:
+            keep: Page numbers whose prefetches should continue
+        """
+        for page in list(self.prefetch_futures):
+            if page not in keep:
+                self.app.pdf_manager.cancel_render(self.prefetch_futures.pop(page))
+        
+    def show_placeholder(self, page_num):
+        """Show a blank page of the right size until the render arrives.
+        
+        Args:
+            page_num: Page number to show the placeholder for
+        """
+        page = self.app.pdf_manager.get_page(page_num)
+        ratio = self.devicePixelRatioF()
+        zoom = self.get_render_zoom(page_num, self.current_zoom)
+        pixmap = QPixmap(max(1, int(page.rect.width * zoom * ratio)),
+                         max(1, int(page.rect.height * zoom * ratio)))
+        pixmap.fill(Qt.GlobalColor.white)
+        pixmap.setDevicePixelRatio(ratio)
+        self.current_pixmap = pixmap
+        self.rendered_zoom = zoom
+        self.update_display()
+        
+    def render_current_page(self):
+        """Re-render the current page, or its visible region, at the current zoom level."""
+        if self.current_page is None:
+            return
+            
+        if self.rendered_zoom != self.get_render_zoom(self.current_page, self.current_zoom):
+            self.request_render(self.current_page, self.current_zoom)
+        else:
+            self.update_tile()
+            
+    def show_page(self, page_num, zoom=None):
         """Show the specified page.
         
+        The page is rendered in the background; a blank placeholder is
+        shown until the render is ready.
+        
         Args:
             page_num: Page number to display
+            zoom: Optional zoom level to show the page at
         """
         if not self.app.pdf_manager.doc:
             return
@@ -294,15 +777,25 @@ class PDFPreview(QWidget):
         if page_num < 0 or page_num >= self.app.pdf_manager.get_page_count():
             return
             
-        # Get page pixmap
+        if zoom is not None:
+            self.current_zoom = zoom
+            
+        # Prefetch in the direction of navigation; a large jump makes
+        # the pages prefetched around the previous position useless
+        if self.current_page is not None and page_num != self.current_page:
+            step = page_num - self.current_page
+            self.navigation_direction = 1 if step > 0 else -1
+            if abs(step) > max(self.prefetch_ahead, self.prefetch_behind):
+                self.cancel_prefetch()
+                
+        # Render page at the current zoom level
         self.current_page = page_num
-        pixmap = self.app.pdf_manager.get_page_pixmap(page_num)
-        if pixmap:
-            self.current_pixmap = pixmap
-            self.update_display()
+        self.render_timer.stop()
+        if not self.request_render(page_num, self.current_zoom):
+            self.show_placeholder(page_num)
             
-            # Update status bar
-            self.app.status_bar.showMessage(f"Showing page {page_num + 1} of {self.app.pdf_manager.get_page_count()}")
+        # Update status bar
+        self.app.status_bar.showMessage(f"Showing page {page_num + 1} of {self.app.pdf_manager.get_page_count()}")
             
     def prev_page(self):
         """Show the previous page."""
@@ -326,9 +819,8 @@ class PDFPreview(QWidget):
             return
             
         if self.current_page > 0:
-            # Implementation will be added later
-            # For now, just show a message in the status bar
-            self.app.status_bar.showMessage("Move page up functionality not implemented yet")
+            if self.app.pdf_manager.move_page(self.current_page, self.current_page - 1):
+                self.app.status_bar.showMessage("Page moved up")
             
     def move_page_down(self):
         """Move the current page down in the document."""
@@ -336,14 +828,48 @@ class PDFPreview(QWidget):
             return
             
         if self.current_page < self.app.pdf_manager.get_page_count() - 1:
-            # Implementation will be added later
-            # For now, just show a message in the status bar
-            self.app.status_bar.showMessage("Move page down functionality not implemented yet")
+            if self.app.pdf_manager.move_page(self.current_page, self.current_page + 1):
+                self.app.status_bar.showMessage("Page moved down")
+            
+    def on_document_changed(self, change):
+        """Refresh the display after the document changed.
+        
+        The current page is only re-rendered if it was modified or
+        removed; otherwise just its page number is updated.
+        
+        Args:
+            change: DocumentChange describing the affected pages
+        """
+        if self.current_page is None:
+            return
+            
+        if not change.is_structural:
+            if self.current_page in change.pages:
+                # Keep showing the old render until the new one arrives
+                self.request_render(self.current_page, self.current_zoom)
+            return
+            
+        # Prefetched pages refer to the old page numbers
+        self.cancel_prefetch()
+        new_page = change.map_page(self.current_page)
+        if new_page is None:
+            page_num = min(self.current_page, self.app.pdf_manager.get_page_count() - 1)
+            self.current_page = None
+            self.show_page(page_num)
+        else:
+            self.current_page = new_page
+            self.update_display()
             
     def clear(self):
         """Clear the current display."""
         self.current_page = None
         self.current_pixmap = None
+        self.rendered_zoom = None
+        self.render_timer.stop()
+        self.cancel_pending_render()
+        self.clear_tile()
+        self.cancel_prefetch()
+        self.prefetch_state = None
         self.page_label.clear()
         self.page_indicator.setText("Page 0 of 0")
             
@@ -367,6 +893,7 @@ class PDFPreview(QWidget):
             if self.annotation_mode == "ink":
                 # Draw line on pixmap
                 painter = QPainter(self.current_pixmap)
+                painter.scale(self.rendered_zoom, self.rendered_zoom)
                 painter.setPen(QPen(self.annotation_color, self.annotation_width))
                 painter.drawLine(self.last_point, current_point)
                 painter.end()
@@ -431,8 +958,8 @@ class PDFPreview(QWidget):
         Returns:
             QPoint: Position in page coordinates
         """
-        # Get position relative to page_label
-        label_pos = self.page_label.mapFrom(self, widget_pos)
+        # Get position relative to the page shown in page_label
+        label_pos = QPointF(self.page_label.mapFrom(self, widget_pos)) - self.page_label.page_origin()
         
         # Convert to page coordinates (accounting for zoom)
         page_x = label_pos.x() / self.current_zoom
@@ -0,0 +1,167 @@
+"""
+Incremental text search for miniPDF.
+"""
+import time
+import logging
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from core.extractions import TextExtractor
+from core.text_index import SEARCH_FLAGS
+
+logger = logging.getLogger(__name__)
+
+
+class SearchSession(QObject):
+    """Searches the open document in small time slices on the GUI thread.
+    
+    PyMuPDF holds the GIL while searching, so a search thread would
+    freeze the interface just the same. Instead, pages are searched for
+    at most TIME_SLICE_MS at a time between events, starting from the
+    current page. Hits are reported page by page, and starting a new
+    search cancels the previous one immediately, which makes the session
+    suitable for find-as-you-type.
+    
+    The text index of the document is built lazily: the text of searched
+    pages that are not indexed yet is stored at the end of every slice,
+    so later searches can skip them.
+    """
+    
+    # Emitted for every page with hits
+    result_found = pyqtSignal(int, list)  # page_num, hit rectangles
+    # Emitted after every time slice
+    progress = pyqtSignal(int, int)  # pages searched, pages to search
+    # Emitted when the whole document was searched
+    finished = pyqtSignal(int)  # total number of hits
+    
+    # Longest time spent searching before returning to the event loop (ms)
+    TIME_SLICE_MS = 15
+    
+    def __init__(self, pdf_manager, parent=None):
+        """Initialize search session.
+        
+        Args:
+            pdf_manager: PDFManager of the document to search
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.pdf_manager = pdf_manager
+        self.text_extractor = TextExtractor(pdf_manager)
+        self.search_string = ""
+        self.results = []  # (page_num, hit rectangles) in the order found
+        self.pages_searched = 0
+        self.pages_total = 0
+        self._pages = None  # Generator of the running search
+        self._text_index = None
+        self._unindexed = set()  # Saved pages of the running search missing from the index
+        self._new_texts = {}  # Page num -> text to store in the index
+        
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.search_slice)
+        
+    def start(self, search_string, start_page=0):
+        """Start a new search, cancelling the running one.
+        
+        Args:
+            search_string: Text to search for
+            start_page: Page to start searching at, e.g. the current page
+        """
+        self.cancel()
+        self.search_string = search_string
+        self.results = []
+        doc = self.pdf_manager.doc
+        if not doc or not search_string:
+            return
+            
+        # Building the whole index would block; it is filled while searching
+        text_index = self.pdf_manager.get_text_index(build=False)
+        pages = text_index.candidate_pages(search_string) if text_index else None
+        if pages is None:
+            pages = range(len(doc))
+        self._text_index = text_index if text_index and text_index.available else None
+        if self._text_index:
+            self._unindexed = {text_index.page_sources[page_num]
+                               for page_num in text_index.missing_pages()}
+        self.pages_total = len(pages)
+        self._pages = self.text_extractor.iter_search(
+            doc, search_string, start_page=max(0, start_page), pages=pages)
+        self.search_slice()
+        
+    def cancel(self):
+        """Stop the running search."""
+        self.timer.stop()
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+        self.pages_searched = 0
+        self.pages_total = 0
+        self._text_index = None
+        self._unindexed = set()
+        
+    def is_running(self):
+        """Check whether a search is in progress.
+        
+        Returns:
+            bool: True if the search has not finished yet
+        """
+        return self._pages is not None
+        
+    def search_slice(self):
+        """Search pages until the time slice is used up."""
+        if self._pages is None:
+            return
+            
+        pages = self._pages
+        deadline = time.perf_counter() + self.TIME_SLICE_MS / 1000
+        try:
+            while time.perf_counter() < deadline:
+                page_num, instances = next(pages)
+                self.pages_searched += 1
+                self._collect_text(page_num)
+                if instances:
+                    self._store_texts()
+                    self.results.append((page_num, instances))
+                    self.result_found.emit(page_num, instances)
+                    if self._pages is not pages:
+                        return  # A slot started a new search or cancelled
+        except StopIteration:
+            self._store_texts()
+            self._pages = None
+            self.progress.emit(self.pages_searched, self.pages_total)
+            self.finished.emit(sum(len(instances) for _, instances in self.results))
+            return
+        except Exception as e:
+            # E.g. pages were deleted while searching
+            logger.error(f"Error searching text: {e}")
+            self._new_texts = {}
+            self._pages = None
+            self.finished.emit(sum(len(instances) for _, instances in self.results))
+            return
+            
+        self._store_texts()
+        self.progress.emit(self.pages_searched, self.pages_total)
+        self.timer.start()
+        
+    def _collect_text(self, page_num):
+        """Remember the text of a searched page missing from the text index.
+        
+        Args:
+            page_num: Page that was just searched
+        """
+        source = self._text_index.page_sources[page_num] if self._text_index else None
+        if source is not None and source in self._unindexed:
+            self._unindexed.discard(source)
+            # The search parsed the page already, the TextPage is cached
+            textpage = self.text_extractor.get_textpage(self.pdf_manager.doc[page_num],
+                                                        SEARCH_FLAGS)
+            self._new_texts[page_num] = textpage.extractText()
+            
+    def _store_texts(self):
+        """Store the collected page texts in the text index.
+        
+        Called before returning to the event loop, while the page numbers
+        still match the document.
+        """
+        if self._new_texts and self._text_index:
+            self._text_index.add_texts(self._new_texts)
+        self._new_texts = {}
@@ -2,9 +2,9 @@
 Sidebar implementation for miniPDF.
 """
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
-                             QListWidget, QListWidgetItem, QToolButton,
-                             QLabel, QFrame, QPushButton)
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QEvent
+                             QListView, QFrame, QPushButton)
+from PyQt6.QtCore import (Qt, pyqtSignal, QSize, QEvent, QTimer,
+                          QAbstractListModel, QModelIndex)
 from PyQt6.QtGui import QPixmap, QIcon
 from .utils.icon_utils import IconProvider
 from .utils.settings_utils import (
@@ -15,12 +15,123 @@ from .settings import Settings
 
 settings = Settings()
 
+
+class ThumbnailModel(QAbstractListModel):
+    """List model of page thumbnails that are rendered on demand.
+    
+    Only thumbnails handed to set_icon() are kept; every other row shows
+    a placeholder icon, so the model is cheap regardless of page count.
+    """
+    
+    def __init__(self, parent=None):
+        """Initialize thumbnail model.
+        
+        Args:
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.page_count = 0
+        self.icons = {}  # row -> QIcon or QImage
+        self.placeholder = QIcon()
+        
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of pages."""
+        return 0 if parent.isValid() else self.page_count
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return page label, thumbnail or alignment for a row."""
+        if not index.isValid():
+            return None
+            
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"Sayfa {row + 1}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icons.get(row, self.placeholder)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+        
+    def set_page_count(self, page_count):
+        """Reset the model to the given number of pages.
+        
+        Args:
+            page_count: Number of pages
+        """
+        self.beginResetModel()
+        self.page_count = page_count
+        self.icons = {}
+        self.endResetModel()
+        
+    def set_icon(self, row, icon):
+        """Set the thumbnail of a row.
+        
+        Args:
+            row: Row index
+            icon: Thumbnail QIcon or QImage
+        """
+        if 0 <= row < self.page_count:
+            self.icons[row] = icon
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+            
+    def evict_outside(self, first, last):
+        """Drop thumbnails of rows outside the given range.
+        
+        Args:
+            first: First row to keep
+            last: Last row to keep
+        """
+        for row in [r for r in self.icons if r < first or r > last]:
+            del self.icons[row]
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+            
+    def apply_change(self, change):
+        """Insert, remove or move rows after pages were inserted, removed or moved.
+        
+        Thumbnails move along with their pages, so none of them has to be
+        rendered again.
+        
+        Args:
+            change: Structural DocumentChange
+        """
+        if change.kind == change.INSERTED:
+            for row in change.pages:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.icons = {(r + 1 if r >= row else r): icon for r, icon in self.icons.items()}
+                self.page_count += 1
+                self.endInsertRows()
+        elif change.kind == change.REMOVED:
+            for row in reversed(change.pages):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.icons = {(r - 1 if r > row else r): icon
+                              for r, icon in self.icons.items() if r != row}
+                self.page_count -= 1
+                self.endRemoveRows()
+        elif change.kind == change.MOVED:
+            old_row, new_row = change.pages
+            # Qt expects the destination in front of which the row is placed
+            destination = new_row + 1 if new_row > old_row else new_row
+            self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination)
+            self.icons = {change.map_page(r): icon for r, icon in self.icons.items()}
+            self.endMoveRows()
+
+
 class Sidebar(QWidget):
     """Sidebar widget for displaying page thumbnails and navigation."""
     
     # Signal emitted when page is selected
     page_selected = pyqtSignal(int)
     
+    # Rows around the viewport to render ahead of scrolling
+    PREFETCH_ROWS = 10
+    # Rows around the viewport whose thumbnails are kept in memory
+    KEEP_ROWS = 50
+    
+    # Emitted from render worker threads, delivered on the GUI thread
+    thumbnail_rendered = pyqtSignal(int, object, object)  # page_num, render future, QImage
+    
     def __init__(self, parent=None):
         """Initialize sidebar.
         
@@ -30,6 +141,15 @@ class Sidebar(QWidget):
         super().__init__(parent)
         self.app = parent
         self.settings = Settings()
+        self.pending_thumbnails = {}  # page_num -> render future
+        self.applying_change = False  # True while rows follow a document change
+        self.thumbnail_rendered.connect(self.on_thumbnail_rendered)
+        
+        # Debounce timer for loading thumbnails of visible rows
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(50)
+        self.visible_timer.timeout.connect(self.load_visible_thumbnails)
         
         # Set up layout
         self.layout = QVBoxLayout(self)
@@ -92,19 +212,26 @@ class Sidebar(QWidget):
         self.layout.addWidget(self.create_separator())
         
     def create_page_list(self):
-        """Create page list widget."""
-        # Create list widget for page thumbnails
-        self.page_list = QListWidget()
-        self.page_list.setViewMode(QListWidget.ViewMode.IconMode)
+        """Create page list view."""
+        # Create list view for page thumbnails
+        self.page_model = ThumbnailModel(self)
+        self.page_list = QListView()
+        self.page_list.setModel(self.page_model)
+        self.page_list.setViewMode(QListView.ViewMode.IconMode)
         self.page_list.setIconSize(QSize(120, 160))
-        self.page_list.setResizeMode(QListWidget.ResizeMode.Adjust)
-        self.page_list.setMovement(QListWidget.Movement.Static)
+        self.page_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.page_list.setMovement(QListView.Movement.Static)
+        self.page_list.setUniformItemSizes(True)
         self.page_list.setSpacing(10)
         self.page_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.page_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.page_model.placeholder = self.create_placeholder_icon()
         
         # Connect signals
-        self.page_list.currentRowChanged.connect(self.on_page_selected)
+        self.page_list.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.on_page_selected(current.row()))
+        self.page_list.verticalScrollBar().valueChanged.connect(
+            lambda value: self.visible_timer.start())
         
         # Add to layout
         self.layout.addWidget(self.page_list, 1)  # Give it stretch factor
@@ -165,23 +292,152 @@ class Sidebar(QWidget):
         return separator
         
     def update_pages(self):
-        """Update page thumbnails."""
-        self.page_list.clear()
+        """Update page thumbnails.
+        
+        The list shows a placeholder for every page right away; only the
+        thumbnails of rows in or near the viewport are rendered, in the
+        background.
+        """
+        self.clear()
         
         if not self.app.pdf_manager.doc:
             return
             
-        # Add thumbnails for each page
-        for i in range(self.app.pdf_manager.get_page_count()):
-            # Create thumbnail
-            pixmap = self.app.pdf_manager.get_page_thumbnail(i)
-            if pixmap:
-                # Create item
-                item = QListWidgetItem()
-                item.setIcon(QIcon(pixmap))
-                item.setText(f"Sayfa {i + 1}")
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.page_list.addItem(item)
+        self.page_model.set_page_count(self.app.pdf_manager.get_page_count())
+        self.load_visible_thumbnails()
+        
+    def create_placeholder_icon(self):
+        """Create a blank icon shown until a thumbnail is rendered.
+        
+        Returns:
+            QIcon: Placeholder icon
+        """
+        pixmap = QPixmap(self.page_list.iconSize())
+        pixmap.fill(Qt.GlobalColor.white)
+        return QIcon(pixmap)
+        
+    def page_count(self):
+        """Get the number of rows in the page list.
+        
+        Returns:
+            int: Number of pages
+        """
+        return self.page_model.rowCount()
+        
+    def current_row(self):
+        """Get the selected row.
+        
+        Returns:
+            int: Selected row or -1 if none
+        """
+        return self.page_list.currentIndex().row()
+        
+    def set_current_row(self, row):
+        """Select a row and scroll it into view.
+        
+        Args:
+            row: Row to select
+        """
+        index = self.page_model.index(row)
+        self.page_list.setCurrentIndex(index)
+        self.page_list.scrollTo(index)
+        
+    def visible_rows(self):
+        """Get the range of rows currently visible in the page list.
+        
+        Item positions grow with the row, so the range is found with a
+        binary search instead of checking every row.
+        
+        Returns:
+            tuple: (first, last) visible rows or None if the list is empty
+        """
+        count = self.page_count()
+        if count == 0:
+            return None
+            
+        viewport_height = self.page_list.viewport().height()
+        
+        def first_row_where(predicate):
+            low, high = 0, count
+            while low < high:
+                mid = (low + high) // 2
+                if predicate(self.page_list.visualRect(self.page_model.index(mid))):
+                    high = mid
+                else:
+                    low = mid + 1
+            return low
+            
+        first = min(first_row_where(lambda rect: rect.bottom() >= 0), count - 1)
+        last = max(first_row_where(lambda rect: rect.top() > viewport_height) - 1, first)
+        return first, last
+        
+    def load_visible_thumbnails(self):
+        """Render thumbnails near the viewport and evict distant ones."""
+        rows = self.visible_rows()
+        if rows is None:
+            return
+            
+        first, last = rows
+        count = self.page_count()
+        low = max(0, first - self.PREFETCH_ROWS)
+        high = min(count - 1, last + self.PREFETCH_ROWS)
+        
+        # Cancel renders that are no longer needed
+        for page_num in [p for p in self.pending_thumbnails if p < low or p > high]:
+            self.app.pdf_manager.cancel_render(self.pending_thumbnails.pop(page_num))
+            
+        # Visible rows first, then the rows around them
+        wanted = list(range(first, last + 1))
+        wanted += [r for r in range(low, high + 1) if r < first or r > last]
+        for page_num in wanted:
+            if page_num not in self.page_model.icons and page_num not in self.pending_thumbnails:
+                self.request_thumbnail(page_num)
+                
+        self.page_model.evict_outside(first - self.KEEP_ROWS, last + self.KEEP_ROWS)
+        
+    def request_thumbnail(self, page_num):
+        """Render a page thumbnail in the background.
+        
+        Args:
+            page_num: Page number to render the thumbnail for
+        """
+        self.app.pdf_manager.cancel_render(self.pending_thumbnails.pop(page_num, None))
+        future = self.app.pdf_manager.render_thumbnail_async(page_num)
+        if future is None:
+            return
+            
+        self.pending_thumbnails[page_num] = future
+        future.add_done_callback(
+            lambda f, page_num=page_num: self._emit_thumbnail_rendered(page_num, f))
+        
+    def _emit_thumbnail_rendered(self, page_num, future):
+        """Forward a finished thumbnail render to the GUI thread.
+        
+        Args:
+            page_num: Page number of the thumbnail
+            future: Finished render future
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self.thumbnail_rendered.emit(page_num, future, future.result())
+        except RuntimeError:
+            pass  # Widget was deleted while rendering
+            
+    def on_thumbnail_rendered(self, page_num, future, image):
+        """Show a finished thumbnail render.
+        
+        Args:
+            page_num: Page number of the thumbnail
+            future: Render future the image belongs to
+            image: Rendered QImage
+        """
+        if self.pending_thumbnails.get(page_num) is not future:
+            return  # Outdated render
+            
+        del self.pending_thumbnails[page_num]
+        # QImage olarak saklanır: QPixmap 32 bit/piksele dönüştürür, gri tonlama 8 bit kalır
+        self.page_model.set_icon(page_num, image)
                 
     def update_thumbnail(self, page_num):
         """Update a specific page thumbnail.
@@ -189,15 +445,10 @@ class Sidebar(QWidget):
         Args:
             page_num: Page number to update
         """
-        if not self.app.pdf_manager.doc or page_num < 0 or page_num >= self.page_list.count():
+        if not self.app.pdf_manager.doc or page_num < 0 or page_num >= self.page_count():
             return
             
-        # Get updated thumbnail
-        pixmap = self.app.pdf_manager.get_page_thumbnail(page_num)
-        if pixmap:
-            # Update item
-            item = self.page_list.item(page_num)
-            item.setIcon(QIcon(pixmap))
+        self.request_thumbnail(page_num)
             
     def on_page_selected(self, row):
         """Handle page selection.
@@ -205,7 +456,7 @@ class Sidebar(QWidget):
         Args:
             row: Selected row index
         """
-        if row >= 0:
+        if row >= 0 and not self.applying_change:
             self.page_selected.emit(row)
             
     def go_to_page(self, page_num):
@@ -217,60 +468,87 @@ class Sidebar(QWidget):
         if not self.app.pdf_manager.doc:
             return
             
-        if 0 <= page_num < self.page_list.count():
-            self.page_list.setCurrentRow(page_num)
+        if 0 <= page_num < self.page_count():
+            self.set_current_row(page_num)
             
     def go_to_prev_page(self):
         """Go to the previous page."""
         if not self.app.pdf_manager.doc:
             return
             
-        current = self.page_list.currentRow()
+        current = self.current_row()
         if current > 0:
-            self.page_list.setCurrentRow(current - 1)
+            self.set_current_row(current - 1)
             
     def go_to_next_page(self):
         """Go to the next page."""
         if not self.app.pdf_manager.doc:
             return
             
-        current = self.page_list.currentRow()
-        if current < self.page_list.count() - 1:
-            self.page_list.setCurrentRow(current + 1)
+        current = self.current_row()
+        if current < self.page_count() - 1:
+            self.set_current_row(current + 1)
             
     def go_to_last_page(self):
         """Go to the last page."""
         if not self.app.pdf_manager.doc:
             return
             
-        if self.page_list.count() > 0:
-            self.page_list.setCurrentRow(self.page_list.count() - 1)
+        if self.page_count() > 0:
+            self.set_current_row(self.page_count() - 1)
             
     def move_page_up(self):
         """Move the current page up in the document."""
         if not self.app.pdf_manager.doc:
             return
             
-        current = self.page_list.currentRow()
+        current = self.current_row()
         if current > 0:
-            # Implementation will be added later
-            # For now, just show a message in the status bar
-            self.app.status_bar.showMessage("Move page up functionality not implemented yet")
+            if self.app.pdf_manager.move_page(current, current - 1):
+                self.app.status_bar.showMessage("Page moved up")
             
     def move_page_down(self):
         """Move the current page down in the document."""
         if not self.app.pdf_manager.doc:
             return
             
-        current = self.page_list.currentRow()
-        if current < self.page_list.count() - 1:
-            # Implementation will be added later
-            # For now, just show a message in the status bar
-            self.app.status_bar.showMessage("Move page down functionality not implemented yet")
+        current = self.current_row()
+        if current < self.page_count() - 1:
+            if self.app.pdf_manager.move_page(current, current + 1):
+                self.app.status_bar.showMessage("Page moved down")
+            
+    def on_document_changed(self, change):
+        """Refresh the thumbnails affected by a document change.
+        
+        Args:
+            change: DocumentChange describing the affected pages
+        """
+        if not change.is_structural:
+            # Only thumbnails that are shown or being rendered are refreshed
+            for page_num in change.pages:
+                if page_num in self.page_model.icons or page_num in self.pending_thumbnails:
+                    self.request_thumbnail(page_num)
+            return
+            
+        # Pending renders report their old page number, so restart moved ones
+        for page_num in list(self.pending_thumbnails):
+            if change.map_page(page_num) != page_num:
+                self.app.pdf_manager.cancel_render(self.pending_thumbnails.pop(page_num))
+                
+        # The preview follows the change itself; don't select pages for it
+        self.applying_change = True
+        try:
+            self.page_model.apply_change(change)
+        finally:
+            self.applying_change = False
+        self.visible_timer.start()
             
     def clear(self):
-        """Clear the page list."""
-        self.page_list.clear()
+        """Clear the page list and cancel pending thumbnail renders."""
+        for future in self.pending_thumbnails.values():
+            self.app.pdf_manager.cancel_render(future)
+        self.pending_thumbnails = {}
+        self.page_model.set_page_count(0)
         
     def apply_theme(self):
         """Apply current theme to sidebar elements."""
@@ -310,7 +588,7 @@ class Sidebar(QWidget):
             """)
             
         # Update page list item colors if needed
-        # (Currently handled by QListWidget styling, but could add specific item styling here)
+        # (Currently handled by QListView styling, but could add specific item styling here)
         
     def eventFilter(self, obj, event):
         """Genişlik değişikliklerini izle ve kaydet.
@@ -327,5 +605,7 @@ class Sidebar(QWidget):
             width = self.width()
             if width > 0:
                 save_sidebar_width(width)
+            # Yeni görünen küçük resimleri yükle
+            self.visible_timer.start()
                 
         return super().eventFilter(obj, event)
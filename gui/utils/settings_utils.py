@@ -11,7 +11,7 @@ otomatik olarak yüklenir. Tema değişiklikleri tüm bileşenlere uygulanır.
 import os
 import json
 import logging
-from PyQt6.QtWidgets import QApplication, QPushButton, QWidget, QComboBox, QLabel, QListWidget, QFrame
+from PyQt6.QtWidgets import QApplication, QPushButton, QWidget, QComboBox, QLabel, QListView, QFrame
 from PyQt6.QtCore import QSize
 from qt_material import apply_stylesheet, list_themes
 
@@ -28,7 +28,11 @@ DEFAULT_SETTINGS = {
     'language': 'tr',
     'zoom_level': 100,
     'sidebar_width': 250,
-    'recent_files': []
+    'recent_files': [],
+    'prefetch_ahead': 3,  # Gezinme yönünde önceden işlenecek sayfa sayısı
+    'prefetch_behind': 1,  # Ters yönde önceden işlenecek sayfa sayısı
+    'max_render_megapixels': 16,  # Tek seferde işlenecek en büyük görüntü (megapiksel)
+    'thumbnail_profile': 'thumbnail'  # Küçük resim profili: 'thumbnail' (gri) veya 'thumbnail_color'
 }
 
 
@@ -220,8 +224,8 @@ def apply_styles_to_components(parent_widget):
     for combo in parent_widget.findChildren(QComboBox):
         apply_combo_style(combo)
         
-    # QListWidget'lara stil uygula
-    for list_widget in parent_widget.findChildren(QListWidget):
+    # QListView'lara stil uygula (QListWidget dahil)
+    for list_widget in parent_widget.findChildren(QListView):
         apply_list_widget_style(list_widget)
     
     # QFrame'lere stil uygula (ayırıcılar dahil)
@@ -488,27 +492,27 @@ def apply_combo_style(combo):
     
 
 def apply_list_widget_style(list_widget):
-    """QListWidget'lara stil uygula.
+    """QListView'lara stil uygula.
     
     Args:
-        list_widget: Stil uygulanacak QListWidget
+        list_widget: Stil uygulanacak QListView
     """
-    # QListWidget stilini uygula
+    # QListView stilini uygula
     list_widget.setStyleSheet("""
-        QListWidget {
+        QListView {
             border: 1px solid palette(mid);
             border-radius: 4px;
             background-color: palette(base);
         }
-        QListWidget::item {
+        QListView::item {
             border-radius: 2px;
             padding: 2px;
         }
-        QListWidget::item:selected {
+        QListView::item:selected {
             background-color: palette(highlight);
             color: palette(highlighted-text);
         }
-        QListWidget::item:hover:!selected {
+        QListView::item:hover:!selected {
             background-color: palette(alternate-base);
         }
     """)
@@ -0,0 +1,79 @@
+"""
+Tests for rendering large pages in bands.
+"""
+import io
+import os
+import tempfile
+import unittest
+import pymupdf as fitz
+from PIL import Image, ImageChops, ImageStat
+
+from core.banded_render import (band_clips, iter_bands, needs_banding, render_pil_banded,
+                                render_size, save_image_banded)
+from core.image_conversion import pixmap_to_pil
+
+
+class BandedRenderTests(unittest.TestCase):
+    """Test cases for band-by-band rendering."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.doc = fitz.open()
+        self.page = self.doc.new_page(width=300, height=500)
+        self.page.draw_rect((20, 20, 280, 480), color=(0, 0, 1), fill=(1, 1, 0))
+        self.page.insert_text((40, 250), "Large drawing", fontsize=24)
+        self.max_pixels = 20000
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.doc.close()
+        self.temp_dir.cleanup()
+
+    def full_render(self, zoom):
+        """Render the test page in one piece."""
+        return pixmap_to_pil(self.page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)))
+
+    def assert_similar(self, image, expected):
+        """Assert that two renders only differ by seam antialiasing and compression."""
+        self.assertEqual(image.size, expected.size)
+        diff = ImageStat.Stat(ImageChops.difference(image.convert("RGB"), expected))
+        self.assertLess(max(diff.mean), 2)
+
+    def test_band_clips(self):
+        """Test that bands fit the budget and cover the whole page."""
+        zoom = 1.3
+        self.assertTrue(needs_banding(self.page, zoom, self.max_pixels))
+        self.assertFalse(needs_banding(self.page, zoom))
+
+        width, height = render_size(self.page, zoom)
+        clips = band_clips(self.page, zoom, self.max_pixels)
+        self.assertGreater(len(clips), 1)
+
+        bands = list(iter_bands(self.page, zoom, self.max_pixels))
+        for top, pix in bands:
+            self.assertEqual(pix.width, width)
+            self.assertLessEqual(pix.width * pix.height, self.max_pixels)
+        self.assertEqual(sum(pix.height for _, pix in bands), height)
+        self.assertEqual([top for top, _ in bands][1:],
+                         [top + pix.height for top, pix in bands][:-1])
+
+    def test_save_image_banded(self):
+        """Test that banded PNG and JPEG files match a full render."""
+        zoom = 1.5
+        expected = self.full_render(zoom)
+        self.assert_similar(render_pil_banded(self.page, zoom, self.max_pixels), expected)
+
+        for image_format in ("PNG", "JPEG"):
+            path = os.path.join(self.temp_dir.name, f"page.{image_format.lower()}")
+            save_image_banded(self.page, path, zoom, image_format, self.max_pixels)
+            # Compare with the full render after the same lossy encoding
+            buffer = io.BytesIO()
+            expected.save(buffer, format=image_format)
+            with Image.open(path) as img, Image.open(buffer) as reference:
+                self.assertEqual(img.format, image_format)
+                self.assert_similar(img, reference.convert("RGB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
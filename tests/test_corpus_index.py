@@ -0,0 +1,105 @@
+"""
+Tests for the corpus index of a folder of PDF files.
+"""
+import os
+import tempfile
+import sys
+import unittest
+from unittest import mock
+import pymupdf as fitz
+
+from core.corpus_index import CorpusIndex, default_index_path, find_pdf_files, main
+from core.thumbnail_cache import ThumbnailCache, get_cache_dir
+
+
+class CorpusIndexTests(unittest.TestCase):
+    """Test cases for the CorpusIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "pdfs")
+        os.makedirs(os.path.join(self.root, "sub"))
+        self.write_pdf("a.pdf", ["First report", "Quarterly numbers for the board"])
+        self.write_pdf(os.path.join("sub", "b.pdf"), ["Meeting notes", "Nothing to see"])
+        with open(os.path.join(self.root, "notes.txt"), "w") as f:
+            f.write("Quarterly numbers")
+        self.index = CorpusIndex(os.path.join(self.temp_dir.name, "corpus.sqlite"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def write_pdf(self, name, page_texts):
+        """Create a PDF with one line of text per page."""
+        doc = fitz.open()
+        for text in page_texts:
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(os.path.join(self.root, name))
+        doc.close()
+
+    def test_find_pdf_files(self):
+        """Test that only PDF files are found, in subdirectories too."""
+        files = find_pdf_files(self.root)
+        self.assertEqual([os.path.relpath(path, self.root) for path in files],
+                         ["a.pdf", os.path.join("sub", "b.pdf")])
+
+    def test_build_and_search(self):
+        """Test indexing a directory tree and searching it."""
+        stats = self.index.build(self.root, workers=2)
+        self.assertEqual(stats, {"indexed": 2, "unchanged": 0, "removed": 0, "failed": 0})
+
+        results = self.index.search("quarterly NUMBERS")
+        self.assertEqual(len(results), 1)
+        path, page_num, snippet = results[0]
+        self.assertEqual((os.path.basename(path), page_num), ("a.pdf", 1))
+        self.assertIn("[Quarterly numbers]", snippet)
+        self.assertEqual(self.index.search("ab"), [])
+
+    def test_incremental_rebuild(self):
+        """Test that only changed files are indexed again."""
+        self.index.build(self.root, workers=1)
+        self.assertEqual(self.index.build(self.root, workers=1)["unchanged"], 2)
+
+        self.write_pdf("a.pdf", ["Revised report"])
+        os.remove(os.path.join(self.root, "sub", "b.pdf"))
+        self.write_pdf("c.pdf", ["Broken"])
+        with open(os.path.join(self.root, "c.pdf"), "wb") as f:
+            f.write(b"not a pdf")
+
+        stats = self.index.build(self.root, workers=1)
+        self.assertEqual(stats, {"indexed": 1, "unchanged": 0, "removed": 1, "failed": 1})
+        self.assertEqual(self.index.search("Quarterly"), [])
+        self.assertEqual(self.index.search("Meeting"), [])
+        self.assertEqual(len(self.index.search("Revised")), 1)
+        # Pages of removed and changed files are gone from the FTS table
+        count = self.index.connection.execute("SELECT count(*) FROM page_text").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    @unittest.skipIf(sys.platform in ("darwin", "win32"), "XDG directories only")
+    def test_index_survives_cache_cleanup(self):
+        """Test that the default index is not evicted with the disk cache."""
+        environ = {"XDG_CACHE_HOME": os.path.join(self.temp_dir.name, "cache"),
+                   "XDG_DATA_HOME": os.path.join(self.temp_dir.name, "data")}
+        with mock.patch.dict(os.environ, environ):
+            db_path = default_index_path()
+            self.assertFalse(db_path.startswith(os.path.join(get_cache_dir(), "")))
+            index = CorpusIndex()
+            index.build(self.root, workers=1)
+            index.close()
+            os.utime(db_path, (0, 0))
+
+            ThumbnailCache(max_bytes=1).cleanup()
+
+            self.assertTrue(os.path.exists(db_path))
+
+    def test_command_line(self):
+        """Test building and querying the index from the command line."""
+        db_path = os.path.join(self.temp_dir.name, "cli.sqlite")
+        self.assertEqual(main(["--index", db_path, "build", self.root, "--workers", "1"]), 0)
+        self.assertEqual(main(["--index", db_path, "search", "Meeting"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
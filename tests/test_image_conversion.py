@@ -0,0 +1,60 @@
+"""
+Tests for the pixmap conversion helpers.
+"""
+import gc
+import unittest
+import pymupdf as fitz
+
+from core.image_conversion import pixmap_to_qimage, pixmap_to_pil
+
+
+class ImageConversionTests(unittest.TestCase):
+    """Test cases for pixmap to QImage/PIL conversion."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.doc = fitz.open()
+        self.page = self.doc.new_page(width=100, height=80)
+        self.page.draw_rect((10, 10, 50, 50), color=(1, 0, 0), fill=(1, 0, 0))
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.doc.close()
+    
+    def test_qimage_formats(self):
+        """Test that RGB, RGBA, grayscale and CMYK pixmaps convert correctly."""
+        cases = [
+            ({}, 0xffff0000),
+            ({"alpha": True}, 0xffff0000),
+            ({"colorspace": fitz.csGRAY}, None),
+            ({"colorspace": fitz.csCMYK}, None),
+        ]
+        for options, expected in cases:
+            img = pixmap_to_qimage(self.page.get_pixmap(**options))
+            gc.collect()  # The pixmap must stay alive through the image
+            self.assertEqual((img.width(), img.height()), (100, 80))
+            if not options.get("alpha"):
+                self.assertEqual(img.pixel(80, 70) & 0xffffff, 0xffffff)
+            if expected is not None:
+                self.assertEqual(img.pixel(20, 20), expected)
+    
+    def test_qimage_shares_pixmap_memory(self):
+        """Test that the QImage uses the pixmap buffer without copying."""
+        pix = self.page.get_pixmap()
+        img = pixmap_to_qimage(pix)
+        pix.clear_with(0)
+        self.assertEqual(img.pixel(80, 70), 0xff000000)
+    
+    def test_pil_image(self):
+        """Test conversion to PIL images."""
+        img = pixmap_to_pil(self.page.get_pixmap())
+        self.assertEqual(img.mode, "RGB")
+        self.assertEqual(img.getpixel((20, 20)), (255, 0, 0))
+        
+        img = pixmap_to_pil(self.page.get_pixmap(colorspace=fitz.csGRAY))
+        self.assertEqual(img.mode, "L")
+        self.assertEqual(img.size, (100, 80))
+
+
+if __name__ == "__main__":
+    unittest.main()
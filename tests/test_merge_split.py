@@ -0,0 +1,194 @@
+"""
+Tests for merging and splitting PDF files.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pymupdf as fitz
+
+from core.merge_split import PDFMergeSplit, _split_file_range, split_file_path
+
+
+class MergeTests(unittest.TestCase):
+    """Test cases for merging PDF files."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.merge_split = PDFMergeSplit()
+        self.image = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), False)
+        self.image.set_rect(self.image.irect, (200, 30, 30))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def write_pdf(self, name, page_count):
+        """Create a PDF whose pages show their file name and number."""
+        path = os.path.join(self.temp_dir.name, name)
+        doc = fitz.open()
+        for page_num in range(page_count):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"{name} page {page_num}")
+            page.insert_image(fitz.Rect(72, 100, 104, 132), pixmap=self.image)
+        doc.save(path)
+        doc.close()
+        return path
+
+    def page_texts(self, path):
+        """Get the first line of text of every page of a file."""
+        with fitz.open(path) as doc:
+            return [page.get_text().splitlines()[0] for page in doc]
+
+    def test_streaming_merge(self):
+        """Test merging in chunks, skipping inputs that cannot be read."""
+        broken = os.path.join(self.temp_dir.name, "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"not a pdf")
+        paths = [self.write_pdf("a.pdf", 2), broken, self.write_pdf("b.pdf", 3),
+                 os.path.join(self.temp_dir.name, "missing.pdf"), self.write_pdf("c.pdf", 1)]
+        output_path = os.path.join(self.temp_dir.name, "merged.pdf")
+        progress = []
+
+        merged_count, total_count, errors = self.merge_split.merge_pdfs_streaming(
+            paths, output_path, chunk_pages=2,
+            progress_callback=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual((merged_count, total_count), (3, 5))
+        self.assertEqual([error.split(":")[0] for error in errors], ["broken.pdf", "missing.pdf"])
+        self.assertEqual(progress, [(done, 5) for done in range(1, 6)])
+        self.assertEqual(self.page_texts(output_path),
+                         ["a.pdf page 0", "a.pdf page 1", "b.pdf page 0", "b.pdf page 1",
+                          "b.pdf page 2", "c.pdf page 0"])
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)),
+                         ["a.pdf", "b.pdf", "broken.pdf", "c.pdf", "merged.pdf"])
+
+        # Nothing is written if no input can be merged
+        result = self.merge_split.merge_pdfs_streaming([broken], output_path + "2")
+        self.assertEqual(result[0], 0)
+        self.assertFalse(os.path.exists(output_path + "2"))
+        self.assertFalse(self.merge_split.merge_pdfs([broken], output_path + "2"))
+
+    def test_merge_dedupe(self):
+        """Test that images shared by the inputs are stored once."""
+        paths = [self.write_pdf(f"{name}.pdf", 2) for name in "abc"]
+        output_path = os.path.join(self.temp_dir.name, "merged.pdf")
+        self.assertTrue(self.merge_split.merge_pdfs(paths, output_path, dedupe=True))
+
+        with fitz.open(output_path) as doc:
+            self.assertEqual(len(doc), 6)
+            self.assertEqual(len({image[0] for page in doc for image in page.get_images()}), 1)
+
+
+class SplitTests(unittest.TestCase):
+    """Test cases for splitting PDF files."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.merge_split = PDFMergeSplit()
+        self.pdf_path = os.path.join(self.temp_dir.name, "run.pdf")
+        doc = fitz.open()
+        for page_num in range(25):
+            page = doc.new_page()
+            for line in range(20):
+                page.insert_text((72, 72 + line * 12), f"Page {page_num} line {line}")
+            page.clean_contents()
+        # Sıkıştırılmamış kaynak
+        doc.save(self.pdf_path, expand=255)
+        doc.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_split_manifest(self):
+        """Test that the manifest describes every output file."""
+        output_dir = os.path.join(self.temp_dir.name, "out")
+        progress = []
+        manifest = self.merge_split.split_pdf_manifest(
+            self.pdf_path, output_dir, pages_per_file=10,
+            progress_callback=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual([(entry["start_page"], entry["end_page"]) for entry in manifest],
+                         [(0, 10), (10, 20), (20, 25)])
+        self.assertEqual(progress[-1], (3, 3))
+        for entry in manifest:
+            self.assertIsNone(entry["error"])
+            self.assertEqual(entry["size"], os.path.getsize(entry["path"]))
+            with fitz.open(entry["path"]) as doc:
+                self.assertEqual(len(doc), entry["end_page"] - entry["start_page"])
+                self.assertIn(f"Page {entry['start_page']} line 0", doc[0].get_text())
+        self.assertEqual(os.path.basename(manifest[2]["path"]), "split_run.pdf_003_of_003.pdf")
+
+        self.assertEqual(self.merge_split.split_pdf(self.pdf_path, output_dir, pages_per_file=10),
+                         [entry["path"] for entry in manifest])
+        self.assertEqual(self.merge_split.split_pdf_manifest(self.pdf_path, output_dir, 0), [])
+
+    def test_parallel_split(self):
+        """Test splitting in worker processes with compressed output."""
+        manifest = self.merge_split.split_pdf_manifest(
+            self.pdf_path, os.path.join(self.temp_dir.name, "plain"))
+        compressed = self.merge_split.split_pdf_manifest(
+            self.pdf_path, os.path.join(self.temp_dir.name, "compressed"), compress=True,
+            parallel=True, workers=2)
+
+        self.assertEqual(len(compressed), 25)
+        self.assertEqual([(entry["start_page"], entry["end_page"]) for entry in compressed],
+                         [(page_num, page_num + 1) for page_num in range(25)])
+        self.assertFalse(any(entry["error"] for entry in compressed))
+        self.assertLess(sum(entry["size"] for entry in compressed),
+                        sum(entry["size"] for entry in manifest))
+        with fitz.open(compressed[24]["path"]) as doc:
+            self.assertIn("Page 24 line 19", doc[0].get_text())
+
+    def test_split_failed_files(self):
+        """Test that failed files are reported and the others are kept."""
+        output_dir = os.path.join(self.temp_dir.name, "out")
+        # A non-empty directory in the way of the second output file
+        blocked = split_file_path(output_dir, self.pdf_path, 1, 3)
+        os.makedirs(blocked)
+        open(os.path.join(blocked, "keep"), "w").close()
+        manifest = self.merge_split.split_pdf_manifest(self.pdf_path, output_dir, 10)
+
+        self.assertEqual([entry["error"] is None for entry in manifest], [True, False, True])
+        self.assertEqual(manifest[1]["size"], 0)
+        self.assertTrue(os.path.isfile(manifest[2]["path"]))
+
+        # A chunk whose worker cannot read the source
+        start_file, entries = _split_file_range(self.pdf_path + ".missing", output_dir, 25, 10,
+                                                False, 0, 2)
+        self.assertEqual((start_file, len(entries)), (0, 2))
+        self.assertTrue(all(entry["error"] for entry in entries))
+        self.assertEqual(entries[1]["end_page"], 20)
+
+    def test_parallel_split_failed_chunk(self):
+        """Test that a failed worker keeps the finished files and reports the rest."""
+        output_dir = os.path.join(self.temp_dir.name, "out")
+
+        def fail_in_second_chunk(chunks, workers, function, *args, progress_callback=None,
+                                 chunk_callback=None):
+            start, entries = function(*args, *chunks[0])
+            chunk_callback(start, entries)
+            yield from enumerate(entries, start)
+            # The third chunk finished early and waits for the second one
+            chunk_callback(*function(*args, *chunks[2]))
+            # The second chunk was written but its worker died before reporting
+            function(*args, *chunks[1])
+            raise RuntimeError("worker died")
+
+        with mock.patch("core.merge_split.iter_chunk_results", fail_in_second_chunk):
+            manifest = self.merge_split.split_pdf_manifest(self.pdf_path, output_dir,
+                                                           parallel=True, workers=2)
+
+        self.assertEqual(len(manifest), 25)
+        kept = [entry for entry in manifest if not entry["error"]]
+        self.assertEqual([entry["start_page"] for entry in kept], [0, 1, 2, 6, 7, 8])
+        self.assertEqual(manifest[3]["error"], "worker died")
+        self.assertEqual(sorted(os.listdir(output_dir)),
+                         sorted(os.path.basename(entry["path"]) for entry in kept))
+
+
+if __name__ == "__main__":
+    unittest.main()
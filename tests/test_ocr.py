@@ -0,0 +1,184 @@
+"""
+Tests for the OCR pipeline.
+"""
+import os
+import tempfile
+import unittest
+import pymupdf as fitz
+
+from core.extractions import TextExtractor
+from core.ocr import (OCR_CACHE_DIR_NAME, OCR_FONT_NAME, OCRCache, OCREngine, add_text_layer,
+                      has_text_layer, is_ocr_available, page_fingerprint, words_from_tesseract_data)
+from core.pdf_manager import PDFManager
+from core.thumbnail_cache import ThumbnailCache
+
+
+class OCRTests(unittest.TestCase):
+    """Test cases for OCR of scanned pages."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.doc = fitz.open()
+        page = self.doc.new_page(width=595, height=842)
+        page.insert_text((50, 50), "This page has a text layer")
+        
+        # A "scanned" page holding only an image of text
+        text_doc = fitz.open()
+        text_doc.new_page(width=300, height=100).insert_text((20, 50), "Scanned words", fontsize=24)
+        pix = text_doc[0].get_pixmap(dpi=150)
+        self.doc.new_page(width=595, height=842).insert_image(fitz.Rect(50, 50, 350, 150), pixmap=pix)
+        text_doc.close()
+        
+        self.cache = OCRCache(os.path.join(self.temp_dir.name, "ocr"))
+        self.engine = OCREngine(dpi=150, cache=self.cache, max_workers=1)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.doc.close()
+        self.temp_dir.cleanup()
+    
+    def test_text_layer_detection(self):
+        """Test that pages with a text layer are recognized."""
+        self.assertTrue(has_text_layer(self.doc[0]))
+        self.assertFalse(has_text_layer(self.doc[1]))
+    
+    def test_page_fingerprint(self):
+        """Test that fingerprints depend on page content and OCR settings."""
+        fingerprint = page_fingerprint(self.doc[1], 150)
+        self.assertEqual(fingerprint, page_fingerprint(self.doc[1], 150))
+        self.assertNotEqual(fingerprint, page_fingerprint(self.doc[1], 300))
+        self.assertNotEqual(fingerprint, page_fingerprint(self.doc[0], 150))
+        self.doc[1].set_rotation(90)
+        rotated = page_fingerprint(self.doc[1], 150)
+        self.assertNotEqual(fingerprint, rotated)
+        self.doc[1].set_cropbox(fitz.Rect(0, 0, 400, 400))
+        self.assertNotEqual(rotated, page_fingerprint(self.doc[1], 150))
+    
+    def test_cached_results(self):
+        """Test that cached results and text pages need no Tesseract run."""
+        words = [(50.0, 50.0, 150.0, 80.0, "Scanned", 1, 0, 1, 96.0)]
+        self.cache.write(page_fingerprint(self.doc[1], 150), "Scanned", words)
+        
+        results = self.engine.recognize_pages(self.doc)
+        self.assertTrue(results[0]["skipped"])
+        self.assertIn("text layer", results[0]["text"])
+        self.assertTrue(results[1]["cached"])
+        self.assertEqual(results[1]["words"], words)
+    
+    def test_cache_cleanup(self):
+        """Test that the least recently used results are evicted first."""
+        words = [(50.0, 50.0, 150.0, 80.0, "Scanned", 1, 0, 1, 96.0)]
+        for num in range(3):
+            self.cache.write(f"{num:02d}" * 20, "Scanned", words)
+            os.utime(self.cache.entry_path(f"{num:02d}" * 20), (num, num))
+        self.cache.read("00" * 20)  # Used recently
+        self.cache.max_bytes = 2 * os.path.getsize(self.cache.entry_path("00" * 20))
+        
+        self.assertEqual(self.cache.cleanup(), 1)
+        self.assertIsNotNone(self.cache.read("00" * 20))
+        self.assertIsNone(self.cache.read("01" * 20))
+        self.assertIsNotNone(self.cache.read("02" * 20))
+        
+        # Caching can be turned off
+        self.assertIsNone(OCREngine(cache=False).cache)
+        self.assertIsInstance(OCREngine().cache, OCRCache)
+    
+    def test_words_from_tesseract_data(self):
+        """Test conversion of Tesseract boxes to page coordinates."""
+        data = {
+            "text": ["", "Hello", "world", "next"],
+            "conf": ["-1", "95.5", "90", "88"],
+            "block_num": [1, 1, 1, 1],
+            "par_num": [1, 1, 1, 1],
+            "line_num": [0, 1, 1, 2],
+            "word_num": [0, 1, 2, 1],
+            "left": [0, 100, 300, 100],
+            "top": [0, 200, 200, 300],
+            "width": [0, 150, 100, 80],
+            "height": [0, 40, 40, 40],
+        }
+        words = words_from_tesseract_data(data, fitz.Matrix(0.5, 0.5))
+        self.assertEqual(words[0], (50.0, 100.0, 125.0, 120.0, "Hello", 1, 0, 1, 95.5))
+        self.assertEqual([word[6] for word in words], [0, 0, 1])
+    
+    def test_text_layer(self):
+        """Test that OCR words become invisible, searchable text on rotated pages too."""
+        words = [(60.0, 60.0, 150.0, 80.0, "Scanned", 1, 0, 1, 96.0),
+                 (160.0, 60.0, 230.0, 80.0, "words", 1, 0, 2, 95.0)]
+        page = self.doc[1]
+        before = page.get_pixmap().samples
+        
+        for rotation in (0, 90, 180, 270):
+            doc = fitz.open()
+            doc.insert_pdf(self.doc, from_page=1, to_page=1)
+            doc[0].set_rotation(rotation)
+            self.assertEqual(add_text_layer(doc[0], words), 1)
+            self.assertEqual(doc[0].get_text().strip(), "Scanned words")
+            hits = doc[0].search_for("Scanned words")
+            self.assertTrue(hits)
+            # Hits and words are both in unrotated page coordinates
+            self.assertTrue(hits[0].intersects(fitz.Rect(60, 60, 230, 80)))
+            doc[0].set_rotation(0)
+            self.assertEqual(doc[0].get_pixmap().samples, before)
+            doc.close()
+    
+    def test_apply_text_layers(self):
+        """Test embedding OCR results through the manager and saving them incrementally."""
+        path = os.path.join(self.temp_dir.name, "scan.pdf")
+        self.doc.fullcopy_page(1)  # A second scanned page
+        self.doc.save(path)
+        before = self.doc[1].get_pixmap().samples
+        words = [(60.0, 60.0, 150.0, 80.0, "Scanned", 1, 0, 1, 96.0),
+                 (160.0, 60.0, 230.0, 80.0, "words", 1, 0, 2, 95.0)]
+        # Results cached in the manager's cache directory need no Tesseract run
+        cache_dir = os.path.join(self.temp_dir.name, "cache")
+        OCRCache(os.path.join(cache_dir, OCR_CACHE_DIR_NAME)).write(
+            page_fingerprint(self.doc[1], 150), "Scanned words", words)
+        
+        manager = PDFManager(thumbnail_cache=ThumbnailCache(cache_dir))
+        try:
+            manager.open_pdf(path)
+            changes = []
+            manager.add_change_listener(changes.append)
+            self.assertEqual(manager.add_ocr_text_layer(dpi=150, workers=1), [1, 2])
+            self.assertEqual([(c.kind, c.pages) for c in changes], [("modified", [1, 2])])
+            
+            doc = manager.doc
+            for page_num in (1, 2):
+                # Searchable, invisible text that does not change the rendering
+                self.assertTrue(doc[page_num].search_for("Scanned words"))
+                self.assertEqual({span["type"] for span in doc[page_num].get_texttrace()}, {3})
+                self.assertEqual(doc[page_num].get_pixmap().samples, before)
+            # All pages share one embedded font
+            fonts = {font[0] for page_num in (1, 2) for font in doc.get_page_fonts(page_num)
+                     if font[4] == OCR_FONT_NAME}
+            self.assertEqual(len(fonts), 1)
+            
+            # The pages now have text and are no longer OCRed
+            self.assertTrue(self.engine.recognize_pages(doc, [1])[0]["skipped"])
+            extractor = TextExtractor(manager)
+            self.assertEqual([page for page, _ in extractor.search_text(doc, "Scanned")], [1, 2])
+            self.assertIn("Scanned", extractor.extract_text(doc, "current_page", 1))
+            
+            self.assertTrue(doc.can_save_incrementally())
+            size = os.path.getsize(path)
+            self.assertTrue(manager.save_pdf())
+            self.assertGreater(os.path.getsize(path), size)
+        finally:
+            manager.close()
+        
+        with fitz.open(path) as doc:
+            self.assertTrue(doc[1].search_for("Scanned"))
+            self.assertTrue(doc[2].search_for("Scanned"))
+    
+    @unittest.skipUnless(is_ocr_available(), "Tesseract is not installed")
+    def test_perform_ocr(self):
+        """Test recognizing a scanned page."""
+        result = TextExtractor().perform_ocr(self.doc[1], dpi=150, cache=self.cache)
+        self.assertIn("Scanned", result["text"])
+        self.assertTrue(result["words"])
+
+
+if __name__ == "__main__":
+    unittest.main()
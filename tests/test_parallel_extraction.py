@@ -0,0 +1,191 @@
+"""
+Tests for parallel and streaming text extraction.
+"""
+import io
+import os
+import json
+import tempfile
+import time
+import unittest
+import pymupdf as fitz
+
+from core.extractions import TextExtractor, page_chunks, page_image_path
+from core.parallel import iter_chunk_results, report_progress
+
+
+def _slow_range(start, end):
+    """Return the page numbers of a range slowly, reporting every page."""
+    for _ in range(start, end):
+        time.sleep(0.05)
+        report_progress()
+    return start, list(range(start, end))
+
+
+class ParallelExtractionTests(unittest.TestCase):
+    """Test cases for multi-process text extraction."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_pdf_path = os.path.join(self.temp_dir.name, "test.pdf")
+        doc = fitz.open()
+        for i in range(40):
+            page = doc.new_page(width=595, height=842)
+            page.insert_text((50, 50), f"Test Page {i + 1}")
+        doc.save(self.test_pdf_path)
+        doc.close()
+        self.doc = fitz.open(self.test_pdf_path)
+        self.extractor = TextExtractor()
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.doc.close()
+        self.temp_dir.cleanup()
+    
+    def test_page_chunks(self):
+        """Test splitting page ranges into chunks."""
+        self.assertEqual(page_chunks(0, 10, 1), [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)])
+        self.assertEqual(page_chunks(3, 5, 8), [(3, 4), (4, 5)])
+        chunks = page_chunks(0, 10000, 4)
+        self.assertEqual(chunks[0], (0, 64))
+        self.assertEqual(chunks[-1][1], 10000)
+    
+    def test_parallel_extraction(self):
+        """Test that parallel extraction keeps page order and reports progress."""
+        progress = []
+        texts = self.extractor.extract_text_from_document(
+            self.doc, parallel=True, workers=2,
+            progress_callback=lambda done, total: progress.append((done, total)))
+        
+        self.assertEqual(texts, self.extractor.extract_text_from_document(self.doc))
+        self.assertEqual(progress[-1], (40, 40))
+        self.assertEqual(progress, sorted(progress))
+    
+    def test_progress_within_chunk(self):
+        """Test that progress is reported page by page, not per chunk."""
+        progress = []
+        results = list(iter_chunk_results([(0, 20)], 1, _slow_range,
+                                          progress_callback=lambda *args: progress.append(args)))
+        
+        self.assertEqual([result for _, result in results], list(range(20)))
+        self.assertGreater(len(progress), 2)
+        self.assertLess(progress[0][0], 20)
+        self.assertEqual(progress[-1], (20, 20))
+        self.assertEqual(progress, sorted(progress))
+    
+    def test_parallel_page_range(self):
+        """Test extracting part of a document."""
+        pages = list(self.extractor.iter_text_parallel(self.doc, 10, 20, workers=2))
+        self.assertEqual([page_num for page_num, _ in pages], list(range(10, 20)))
+        self.assertIn("Test Page 11", pages[0][1])
+    
+    def test_unsaved_changes(self):
+        """Test that documents with unsaved changes are extracted in process."""
+        self.doc[0].insert_text((50, 100), "unsaved text")
+        texts = self.extractor.extract_text_from_document(self.doc, parallel=True, workers=2)
+        self.assertIn("unsaved text", texts[0])
+
+    
+    def test_export_text(self):
+        """Test streaming text export to a file."""
+        output_path = os.path.join(self.temp_dir.name, "out.txt")
+        progress = []
+        result = self.extractor.export_text(
+            self.doc, output_path, progress_callback=lambda done, total: progress.append(done))
+        
+        self.assertTrue(result)
+        with open(output_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), self.extractor.extract_text(self.doc))
+        self.assertEqual(progress, list(range(1, 41)))
+        
+        pages = list(self.extractor.iter_text(self.doc, 38))
+        self.assertEqual([page_num for page_num, _ in pages], [38, 39])
+        self.assertTrue(self.extractor.format_page_text(0, "x").startswith("--- Page 1 ---"))
+    
+    def test_export_layout(self):
+        """Test streaming layout export to JSONL, in parallel and compact."""
+        full_path = os.path.join(self.temp_dir.name, "full.jsonl")
+        compact_path = os.path.join(self.temp_dir.name, "compact.jsonl")
+        self.assertTrue(self.extractor.export_layout(self.doc, full_path))
+        self.assertTrue(self.extractor.export_layout(self.doc, compact_path, compact=True,
+                                                     parallel=True, workers=2))
+        
+        with open(full_path, encoding="utf-8") as f:
+            full = [json.loads(line) for line in f]
+        with open(compact_path, encoding="utf-8") as f:
+            compact = [json.loads(line) for line in f]
+        self.assertEqual([record["page"] for record in compact], list(range(40)))
+        self.assertEqual(len(full), 40)
+        
+        span = full[3]["blocks"][0]["lines"][0]["spans"][0]
+        self.assertEqual(span["text"], "Test Page 4")
+        self.assertIn("color", span)
+        compact_span = compact[3]["blocks"][0]["lines"][0]["spans"][0]
+        self.assertEqual(set(compact_span), {"bbox", "text", "font", "size"})
+        self.assertEqual(compact_span["text"], "Test Page 4")
+        self.assertAlmostEqual(compact_span["bbox"][0], span["bbox"][0], places=2)
+        self.assertLess(os.path.getsize(compact_path), os.path.getsize(full_path))
+    
+    def test_save_pages_as_images(self):
+        """Test parallel image export with progress reporting."""
+        output_dir = os.path.join(self.temp_dir.name, "images")
+        progress = []
+        result = self.extractor.save_pages_as_images(
+            self.doc, output_dir, 0, 20, zoom=0.5, image_format="jpg", parallel=True, workers=2,
+            progress_callback=lambda done, total: progress.append((done, total)))
+        
+        self.assertEqual(result, (20, 20, []))
+        self.assertEqual(progress[-1], (20, 20))
+        self.assertEqual(len(os.listdir(output_dir)), 20)
+        with open(page_image_path(output_dir, 19, "jpg"), "rb") as f:
+            self.assertEqual(f.read(2), b"\xff\xd8")
+        
+        # In process, cancelled before the fourth page
+        checks = []
+        result = self.extractor.save_pages_as_images(
+            self.doc, output_dir, zoom=0.5,
+            cancel_callback=lambda: checks.append(None) or len(checks) > 3)
+        self.assertEqual(result[:2], (3, 40))
+        self.assertTrue(os.path.exists(page_image_path(output_dir, 2)))
+        self.assertFalse(os.path.exists(page_image_path(output_dir, 3)))
+        self.assertEqual(self.extractor.save_pages_as_images(self.doc, output_dir, image_format="gif")[0], 0)
+    
+    def test_extract_embedded_images(self):
+        """Test writing embedded images unchanged and without duplicates."""
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48), (200, 30, 30)).save(buffer, "JPEG")
+        jpeg = buffer.getvalue()
+        
+        # The JPEG on pages 0 and 1, a second copy of it on page 2, a raw image on page 1
+        source = fitz.open()
+        source.new_page().insert_image(fitz.Rect(0, 0, 64, 48), stream=jpeg)
+        source.new_page().insert_image(fitz.Rect(0, 0, 64, 48), stream=jpeg)
+        source[1].insert_image(fitz.Rect(100, 100, 116, 116),
+                               pixmap=fitz.Pixmap(fitz.csRGB, 16, 16, bytes(16 * 16 * 3), False))
+        path = os.path.join(self.temp_dir.name, "images.pdf")
+        doc = fitz.open()
+        doc.insert_pdf(source)
+        doc.insert_pdf(source, from_page=0, to_page=0)
+        doc.save(path)
+        doc.close()
+        source.close()
+        
+        output_dir = os.path.join(self.temp_dir.name, "embedded")
+        with fitz.open(path) as doc:
+            for parallel in (False, True):
+                manifest = self.extractor.extract_embedded_images(doc, output_dir,
+                                                                  parallel=parallel, workers=2)
+                self.assertEqual([(entry["ext"], entry["pages"]) for entry in manifest],
+                                 [("jpeg", [0, 1, 2]), ("png", [1])])
+                self.assertEqual(len(manifest[0]["duplicates"]), 1)
+                with open(manifest[0]["path"], "rb") as f:
+                    self.assertEqual(f.read(), jpeg)
+                self.assertEqual(len(os.listdir(output_dir)), 2)
+                for name in os.listdir(output_dir):
+                    os.remove(os.path.join(output_dir, name))
+            
+            self.assertEqual(self.extractor.extract_embedded_images(doc, output_dir, 1, 2)[0]["pages"], [1])
+
+if __name__ == "__main__":
+    unittest.main()
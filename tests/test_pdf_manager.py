@@ -6,7 +6,8 @@ import os
 import tempfile
 import fitz  # PyMuPDF
 
-from core.pdf_manager import PDFManager
+from core.pdf_manager import PDFManager, RenderCache, DocumentChange
+from core.thumbnail_cache import ThumbnailCache, file_fingerprint
 
 class PDFManagerTests(unittest.TestCase):
     """Test cases for PDFManager class."""
@@ -93,6 +94,58 @@ class PDFManagerTests(unittest.TestCase):
         result = self.pdf_manager.delete_page(10)
         self.assertFalse(result)
     
+    def test_delete_pages(self):
+        """Test deleting several pages in place."""
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        self.pdf_manager.rotate_page(2, 90)
+        image = self.pdf_manager.get_page_image(2)
+        
+        result = self.pdf_manager.delete_pages([0, 1])
+        self.assertTrue(result)
+        self.assertEqual(self.pdf_manager.get_page_count(), 1)
+        
+        # Unsaved changes survive and cached renders follow their page
+        self.assertEqual(self.pdf_manager.get_page(0).rotation, 90)
+        self.assertIn("Test Page 3", self.pdf_manager.get_page(0).get_text())
+        self.assertIs(self.pdf_manager.get_page_image(0), image)
+        
+        # Invalid indices and deleting every page are rejected
+        self.assertFalse(self.pdf_manager.delete_pages([5]))
+        self.assertFalse(self.pdf_manager.delete_pages([0]))
+        self.assertFalse(self.pdf_manager.delete_pages([]))
+    
+    def test_document_change_events(self):
+        """Test change events of page insertion, removal, moves and edits."""
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        changes = []
+        self.pdf_manager.add_change_listener(changes.append)
+        image = self.pdf_manager.get_page_image(2)
+        
+        self.assertEqual(self.pdf_manager.add_page(), 3)
+        self.assertTrue(self.pdf_manager.move_page(2, 0))
+        self.assertIs(self.pdf_manager.get_page_image(0), image)
+        self.assertTrue(self.pdf_manager.delete_page(1))
+        self.assertTrue(self.pdf_manager.rotate_page(0, 90))
+        self.assertFalse(self.pdf_manager.move_page(0, 5))
+        
+        self.assertEqual([(c.kind, c.pages) for c in changes], [
+            (DocumentChange.INSERTED, [3]),
+            (DocumentChange.MOVED, [2, 0]),
+            (DocumentChange.REMOVED, [1]),
+            (DocumentChange.MODIFIED, [0]),
+        ])
+        self.assertEqual(changes[1].map_page(0), 1)
+        self.assertIsNone(changes[2].map_page(1))
+        self.assertEqual(changes[2].map_page(2), 1)
+        
+        self.assertIn("Test Page 3", self.pdf_manager.get_page(0).get_text())
+        self.assertIn("Test Page 2", self.pdf_manager.get_page(1).get_text())
+        self.assertTrue(self.pdf_manager.has_changes())
+        
+        # A failing listener does not break the operation
+        self.pdf_manager.add_change_listener(lambda change: 1 / 0)
+        self.assertEqual(self.pdf_manager.add_page(), 3)
+    
     def test_extract_text(self):
         """Test extracting text from a page."""
         self.pdf_manager.open_pdf(self.test_pdf_path)
@@ -142,6 +195,28 @@ class PDFManagerTests(unittest.TestCase):
         self.assertEqual(doc[1].rotation, 90)  # Verify rotation was saved
         doc.close()
     
+    def test_save_pdf_incremental(self):
+        """Test incremental and optimizing save modes."""
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        original_size = os.path.getsize(self.test_pdf_path)
+        
+        # Saving over the original file appends only the changes
+        self.pdf_manager.rotate_page(1, 90)
+        self.assertTrue(self.pdf_manager.save_pdf())
+        with open(self.test_pdf_path, 'rb') as f:
+            data = f.read()
+        self.assertGreater(len(data), original_size)
+        self.assertEqual(data.count(b"%%EOF"), 2)  # Appended revision
+        
+        # Optimize and save rewrites the whole file
+        self.assertTrue(self.pdf_manager.save_pdf(optimize=True))
+        with open(self.test_pdf_path, 'rb') as f:
+            self.assertEqual(f.read().count(b"%%EOF"), 1)
+        
+        doc = fitz.open(self.test_pdf_path)
+        self.assertEqual(doc[1].rotation, 90)
+        doc.close()
+    
     def test_close(self):
         """Test closing a PDF."""
         self.pdf_manager.open_pdf(self.test_pdf_path)
@@ -156,6 +231,131 @@ class PDFManagerTests(unittest.TestCase):
         self.assertIsNone(self.pdf_manager.file_path)
         self.assertFalse(self.pdf_manager.has_changes())
 
+    def test_render_cache(self):
+        """Test that rendered pages are served from the cache."""
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        
+        first = self.pdf_manager.get_page_image(1, zoom=1.5)
+        self.assertIsNotNone(first)
+        second = self.pdf_manager.get_page_image(1, zoom=1.5)
+        self.assertIs(first, second)
+        
+        stats = self.pdf_manager.get_cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+        
+        # Rotating the page must not return the stale render
+        self.pdf_manager.rotate_page(1, 90)
+        rotated = self.pdf_manager.get_page_image(1, zoom=1.5)
+        self.assertEqual(rotated.width(), first.height())
+        
+        # Modifying a page drops its cached renders
+        self.pdf_manager.mark_page_modified(1)
+        self.assertEqual(self.pdf_manager.get_cache_stats()['entries'], 0)
+
+        # Clipped renders are cached separately from the whole page
+        tile = self.pdf_manager.get_page_image(1, zoom=2, clip=(100, 100, 300, 200))
+        self.assertEqual((tile.width(), tile.height()), (400, 200))
+        self.assertEqual(self.pdf_manager.get_page_image(1, zoom=2).width(), round(842 * 2))
+        self.assertEqual(self.pdf_manager.get_cache_stats()['entries'], 2)
+    
+    def test_render_page_async(self):
+        """Test rendering pages in background worker processes."""
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        try:
+            future = self.pdf_manager.render_page_async(1, zoom=0.5)
+            image = future.result(timeout=60)
+            self.assertEqual(image.width(), round(595 * 0.5))
+            
+            # The result is cached, so the next request completes immediately
+            self.assertTrue(self.pdf_manager.render_page_async(1, zoom=0.5).done())
+            
+            # Changed pages are rendered in-process until the next save
+            self.pdf_manager.rotate_page(1, 90)
+            future = self.pdf_manager.render_page_async(1, zoom=0.5)
+            self.assertTrue(future.done())
+            self.assertEqual(future.result().width(), image.height())
+            self.assertIsNone(self.pdf_manager._get_render_source(1))
+            
+            # Unchanged pages are still rendered from the file, at their old index
+            self.pdf_manager.delete_page(0)
+            source, source_page = self.pdf_manager._get_render_source(1)
+            self.assertEqual((source[0], source_page), (self.test_pdf_path, 2))
+            self.assertIsNone(self.pdf_manager._get_render_source(0))
+            unchanged = self.pdf_manager.render_page_async(1, zoom=0.5).result(timeout=60)
+            self.assertEqual(unchanged.size(), image.size())
+            
+            # Invalid pages are rejected
+            self.assertIsNone(self.pdf_manager.render_page_async(10))
+        finally:
+            self.pdf_manager.render_pool.shutdown(wait=True)
+    
+    def test_thumbnail_disk_cache(self):
+        """Test that thumbnails are reused across sessions from the disk cache."""
+        cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.pdf_manager.thumbnail_cache = ThumbnailCache(cache_dir)
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        try:
+            first = self.pdf_manager.render_thumbnail_async(0).result(timeout=60)
+            self.assertTrue(first.isGrayscale())
+            thumbnails = os.path.join(cache_dir, file_fingerprint(self.test_pdf_path), "thumbnails")
+            self.assertEqual(len(os.listdir(thumbnails)), 1)
+            
+            # A new session reads the thumbnail without rendering
+            manager = PDFManager(thumbnail_cache=ThumbnailCache(cache_dir))
+            manager.open_pdf(self.test_pdf_path)
+            future = manager.render_thumbnail_async(0)
+            self.assertTrue(future.done())
+            self.assertEqual(future.result().size(), first.size())
+            manager.close()
+            
+            # Modified documents are not served from the disk cache
+            self.pdf_manager.rotate_page(0, 90)
+            rotated = self.pdf_manager.render_thumbnail_async(0).result(timeout=60)
+            self.assertGreater(rotated.width(), rotated.height())
+            self.assertEqual(len(os.listdir(thumbnails)), 1)
+        finally:
+            self.pdf_manager.render_pool.shutdown(wait=True)
+    
+    def test_thumbnail_cache_cleanup(self):
+        """Test that cleanup removes least recently used entries first."""
+        cache = ThumbnailCache(os.path.join(self.temp_dir.name, "cache"), max_bytes=250)
+        paths = [cache.entry_path("doc", i, 20, 0) for i in range(3)]
+        for i, path in enumerate(paths):
+            cache.write(path, b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+        
+        # Text indexes and OCR results are not evicted, however old they are
+        kept = [os.path.join(cache.document_dir("doc"), "text_index.sqlite"),
+                os.path.join(cache.cache_dir, "ocr", "result.json")]
+        for path in kept:
+            cache.write(path, b"x" * 1000)
+            os.utime(path, (1, 1))
+
+        self.assertEqual(cache.cleanup(), 1)
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertIsNotNone(cache.read(paths[1]))
+        self.assertTrue(all(os.path.exists(path) for path in kept))
+    
+    def test_render_cache_eviction(self):
+        """Test LRU eviction when the byte budget is exceeded."""
+        cache = RenderCache(max_bytes=100)
+        cache.put((0, 100, 0, 0), "a", 40)
+        cache.put((1, 100, 0, 0), "b", 40)
+        self.assertEqual(cache.get((0, 100, 0, 0)), "a")  # Page 0 is now most recent
+        cache.put((2, 100, 0, 0), "c", 40)
+        
+        self.assertIsNone(cache.get((1, 100, 0, 0)))
+        self.assertEqual(cache.get((0, 100, 0, 0)), "a")
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['bytes'], 80)
+        
+        cache.invalidate_page(0)
+        self.assertIsNone(cache.get((0, 100, 0, 0)))
+        self.assertEqual(len(cache), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the named render profiles.
+"""
+import os
+import tempfile
+import unittest
+import pymupdf as fitz
+from PIL import Image
+
+from core.banded_render import save_image_banded
+from core.extractions import TextExtractor, page_image_path
+from core.render_profiles import (GRAY, MONO, RGBA, RenderProfile, get_render_profile)
+
+
+class RenderProfileTests(unittest.TestCase):
+    """Test cases for render profiles."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.doc = fitz.open()
+        for _ in range(2):
+            page = self.doc.new_page(width=144, height=288)
+            page.draw_rect((10, 10, 130, 100), color=(0, 0, 1), fill=(1, 0, 0))
+            page.insert_text((20, 200), "Fax me", fontsize=20)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.doc.close()
+        self.temp_dir.cleanup()
+
+    def test_zoom(self):
+        """Test resolution by DPI, by target size and by the caller's zoom."""
+        page = self.doc[0]
+        self.assertEqual(get_render_profile("fax").get_zoom(page, 3), 200 / 72)
+        self.assertEqual(get_render_profile("thumbnail").get_zoom(page), 160 / 288)
+        self.assertEqual(get_render_profile().get_zoom(page, 1.5), 1.5)
+        self.assertEqual(RenderProfile("box", size=(72, 72)).get_zoom(page), 0.25)
+        with self.assertRaises(ValueError):
+            get_render_profile("sepia")
+        with self.assertRaises(ValueError):
+            RenderProfile("cmyk", "cmyk")
+
+    def test_pixmap_layouts(self):
+        """Test the colorspace of renders and of encoded images."""
+        page = self.doc[0]
+        cases = [("screen", 3, "RGB"), ("thumbnail", 1, "L"), ("fax", 1, "1"),
+                 ("transparent", 4, "RGBA")]
+        for name, n, pil_mode in cases:
+            profile = get_render_profile(name)
+            pix = profile.get_pixmap(page, 0.5)
+            self.assertEqual(pix.n, n)
+            self.assertEqual(profile.to_pil(pix).mode, pil_mode)
+
+        # Grayscale needs a third of the memory of RGB
+        gray = get_render_profile("thumbnail").get_pixmap(page)
+        rgb = RenderProfile("color", size=(120, 160)).get_pixmap(page)
+        self.assertEqual(len(gray.samples) * 3, len(rgb.samples))
+
+        # 1-bit images only contain black and white
+        mono = get_render_profile("fax").to_pil(get_render_profile("fax").get_pixmap(page))
+        self.assertEqual({color for _, color in mono.getcolors()}, {0, 255})
+
+    def test_banded_profiles(self):
+        """Test that banded PNG files are written in the profile's layout."""
+        for mode, pil_mode in ((MONO, "1"), (GRAY, "L"), (RGBA, "RGBA")):
+            profile = RenderProfile(mode, mode)
+            path = os.path.join(self.temp_dir.name, f"{mode}.png")
+            save_image_banded(self.doc[0], path, 2, "PNG", max_pixels=5000, profile=profile)
+            with Image.open(path) as img:
+                self.assertEqual((img.mode, img.size), (pil_mode, (288, 576)))
+                expected = profile.to_pil(profile.get_pixmap(self.doc[0], 2))
+                self.assertEqual(img.getpixel((100, 100)), expected.getpixel((100, 100)))
+
+    def test_export_profiles(self):
+        """Test exporting pages with a profile."""
+        output_dir = os.path.join(self.temp_dir.name, "fax")
+        extractor = TextExtractor()
+        self.assertEqual(extractor.save_pages_as_images(self.doc, output_dir, profile="fax"),
+                         (2, 2, []))
+        with Image.open(page_image_path(output_dir, 1)) as img:
+            self.assertEqual((img.mode, img.size), ("1", (400, 800)))
+
+        img = extractor.extract_page_as_image(self.doc[0], zoom=2, profile="thumbnail")
+        self.assertEqual((img.mode, img.height), ("L", 160))
+
+        result = extractor.save_pages_as_images(self.doc, output_dir, image_format="jpg",
+                                                profile="transparent")
+        self.assertEqual(result[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Tests for the full-text search index.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import pymupdf as fitz
+from PyQt6.QtCore import QCoreApplication
+
+from core.extractions import TextExtractor
+from core.pdf_manager import PDFManager
+from core.thumbnail_cache import ThumbnailCache
+from gui.search import SearchSession
+
+
+class TextIndexTests(unittest.TestCase):
+    """Test cases for TextIndex and indexed search."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_pdf_path = os.path.join(self.temp_dir, "test.pdf")
+        doc = fitz.open()
+        for i in range(5):
+            page = doc.new_page(width=595, height=842)
+            page.insert_text((50, 50), f"Test Page {i + 1}\nshared line of text")
+        doc.save(self.test_pdf_path)
+        doc.close()
+        
+        cache = ThumbnailCache(os.path.join(self.temp_dir, "cache"))
+        self.pdf_manager = PDFManager(thumbnail_cache=cache)
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        self.extractor = TextExtractor()
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.pdf_manager.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def search(self, search_string):
+        """Search the document with the index and check it against a scan."""
+        doc = self.pdf_manager.doc
+        text_index = self.pdf_manager.get_text_index()
+        results = self.extractor.search_text(doc, search_string, text_index=text_index)
+        self.assertEqual(results, self.extractor.search_text(doc, search_string))
+        return [page_num for page_num, _ in results]
+    
+    def test_candidate_pages(self):
+        """Test that the index narrows down the pages to search."""
+        text_index = self.pdf_manager.get_text_index()
+        self.assertTrue(os.path.exists(text_index.db_path))
+        self.assertEqual(text_index.candidate_pages("test page 3"), [2])
+        self.assertEqual(text_index.candidate_pages("line of"), [0, 1, 2, 3, 4])
+        self.assertEqual(text_index.candidate_pages("missing"), [])
+        self.assertIsNone(text_index.candidate_pages("Te"))
+        self.assertEqual(self.search("Page 4 shared"), [3])
+    
+    def test_index_follows_changes(self):
+        """Test searching while pages are edited and after saving."""
+        self.pdf_manager.get_text_index()
+        page = self.pdf_manager.get_page(1)
+        page.insert_text((50, 200), "inserted words")
+        self.pdf_manager.mark_page_modified(1)
+        self.pdf_manager.move_page(1, 4)
+        self.pdf_manager.delete_page(0)
+        
+        self.assertEqual(self.search("inserted words"), [3])
+        self.assertEqual(self.search("Test Page 3"), [0])
+        
+        old_path = self.pdf_manager.text_index.db_path
+        self.assertTrue(self.pdf_manager.save_pdf())
+        text_index = self.pdf_manager.text_index
+        self.assertNotEqual(text_index.db_path, old_path)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(text_index.page_sources, [0, 1, 2, 3])
+        self.assertEqual(text_index.candidate_pages("inserted words"), [3])
+
+    def test_save_as_keeps_original_index(self):
+        """Test that Save As leaves the index of the original file alone."""
+        old_path = self.pdf_manager.get_text_index().db_path
+        page = self.pdf_manager.get_page(0)
+        page.insert_text((50, 200), "copy only")
+        self.pdf_manager.mark_page_modified(0)
+        
+        copy_path = os.path.join(self.temp_dir, "copy.pdf")
+        self.assertTrue(self.pdf_manager.save_pdf(copy_path))
+        self.assertTrue(os.path.exists(old_path))
+        self.assertNotEqual(self.pdf_manager.text_index.db_path, old_path)
+        self.assertEqual(self.pdf_manager.text_index.candidate_pages("copy only"), [0])
+        
+        # The original file is opened with its complete index
+        self.pdf_manager.close()
+        self.pdf_manager.open_pdf(self.test_pdf_path)
+        self.assertEqual(self.pdf_manager.text_index.missing_pages(), [])
+        self.assertEqual(self.pdf_manager.text_index.candidate_pages("copy only"), [])
+
+    def test_persisted_index_is_attached(self):
+        """Test that opening a file uses the index built in an earlier session."""
+        self.pdf_manager.get_text_index()
+        self.pdf_manager.close()
+        self.assertTrue(self.pdf_manager.open_pdf(self.test_pdf_path))
+        text_index = self.pdf_manager.text_index
+        self.assertIsNotNone(text_index)
+        self.assertEqual(text_index.missing_pages(), [])
+        self.assertEqual(text_index.candidate_pages("Test Page 2"), [1])
+
+    def test_search_session_builds_index(self):
+        """Test that searching fills the index with the searched pages."""
+        app = QCoreApplication.instance() or QCoreApplication([])
+        session = SearchSession(self.pdf_manager)
+
+        def run(search_string, start_page=0):
+            session.start(search_string, start_page)
+            while session.is_running():
+                app.processEvents()
+            return [page_num for page_num, _ in session.results]
+
+        self.assertEqual(run("Test Page 2", 3), [1])
+        self.assertEqual(session.pages_total, 5)
+        text_index = self.pdf_manager.text_index
+        self.assertEqual(text_index.missing_pages(), [])
+
+        # Only the candidate pages are searched now
+        self.assertEqual(run("Test Page 4"), [3])
+        self.assertEqual(session.pages_total, 1)
+        self.assertEqual(session.pages_searched, 1)
+
+    def test_iter_search_pages(self):
+        """Test searching pages the caller already looked up."""
+        pages = list(self.extractor.iter_search(self.pdf_manager.doc, "shared line",
+                                                start_page=2, pages=[0, 3]))
+        self.assertEqual([page_num for page_num, _ in pages], [3, 0])
+
+    
+    def test_iter_search_wraps_around(self):
+        """Test page by page search starting from a given page."""
+        doc = self.pdf_manager.doc
+        pages = list(self.extractor.iter_search(doc, "shared line", start_page=3))
+        self.assertEqual([page_num for page_num, _ in pages], [3, 4, 0, 1, 2])
+        self.assertTrue(all(instances for _, instances in pages))
+        
+        text_index = self.pdf_manager.get_text_index()
+        pages = list(self.extractor.iter_search(doc, "Test Page 2", start_page=3,
+                                                text_index=text_index))
+        self.assertEqual([page_num for page_num, _ in pages], [1])
+    
+    def test_textpage_cache(self):
+        """Test that extraction and search share cached text pages."""
+        extractor = TextExtractor(self.pdf_manager)
+        doc = self.pdf_manager.doc
+        textpage = self.pdf_manager.get_textpage(1)
+        self.assertIs(extractor.get_textpage(doc[1]), textpage)
+        self.assertEqual(extractor.extract_text_from_page(doc[1]), doc[1].get_text())
+        
+        results = extractor.search_text(doc, "shared line")
+        self.assertEqual(results, self.extractor.search_text(doc, "shared line"))
+        hits = self.pdf_manager.textpage_cache.hits
+        extractor.search_text(doc, "Test Page")
+        self.assertEqual(self.pdf_manager.textpage_cache.hits, hits + 5)
+        
+        # Modified pages are parsed again
+        doc[1].insert_text((50, 300), "new text")
+        self.pdf_manager.mark_page_modified(1)
+        self.assertIsNot(self.pdf_manager.get_textpage(1), textpage)
+        self.assertIn("new text", extractor.extract_text_from_page(doc[1]))
+
+if __name__ == "__main__":
+    unittest.main()